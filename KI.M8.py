@@ -16,18 +16,32 @@
 # Datum: 06.11.2025
 ###########################################################################################
 
+# Startzeit-Bericht (--startup-report[=datei.json]) vor allen übrigen Imports aktivieren
+import startup_report
+_report, _report_file = startup_report.requested()
+if _report:
+    startup_report.enable(_report_file)
+
 import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel, scrolledtext
 import threading
-import requests
-from bs4 import BeautifulSoup
-from ddgs import DDGS
 import time
 import random
 import sqlite3
-# NEU: Import der stabileren Übersetzer-Bibliothek
-from deep_translator import GoogleTranslator
-from thefuzz import process, fuzz
+import unicodedata
+import json
+import math
+import re
+from contextlib import closing
+# Gemeinsame Übersetzungs-Provider mit SpT9 (translation.py)
+from translation import default_chain
+# Paralleler Seitenabruf, je Host nacheinander (fetch_scheduler.py)
+from fetch_scheduler import FetchScheduler
+# requests, bs4, ddgs und thefuzz werden erst bei Bedarf importiert (schnellerer Start),
+# nach dem Öffnen des Fensters lädt preload_modules() sie im Hintergrund vor.
+LAZY_MODULES = ("requests", "bs4", "ddgs", "thefuzz.process", "thefuzz.fuzz")
+
+startup_report.mark("Imports")
 
 # --- GLOBALE KONSTANTEN UND LISTEN ---
 DB_NAME = "wissens_ki_cache.db"
@@ -37,6 +51,45 @@ MAX_LINES = 50
 SIMILARITY_CUTOFF = 50
 MIN_TEXT_LENGTH = 150
 TRANSLATION_BLOCK_SIZE = 4500
+# Seitenabruf: bis zu FETCH_WORKERS Hosts gleichzeitig, je Host eine Anfrage und dazwischen
+# mindestens FETCH_MIN_INTERVAL Sekunden (+ zufällig bis FETCH_JITTER)
+FETCH_WORKERS = 8
+FETCH_MIN_INTERVAL = 2.0
+FETCH_JITTER = 1.5
+# HTTP: eine gemeinsame Session (Keep-Alive) mit Verbindungs-Pools für bis zu HTTP_POOL_HOSTS Hosts
+# und je Host HTTP_POOL_SIZE Verbindungen. Jede Online-Suche hat SEARCH_TIME_BUDGET Sekunden,
+# ein einzelner Abruf höchstens HTTP_TIMEOUT (bzw. die Restzeit der Suche).
+HTTP_POOL_HOSTS = 64
+HTTP_POOL_SIZE = 2
+HTTP_TIMEOUT = 20
+SEARCH_TIME_BUDGET = 120
+# Cache zuerst: Ergebnisse zu derselben (normalisierten) Anfrage, die jünger als
+# CACHE_MAX_AGE_DAYS sind, werden ohne Online-Suche angezeigt ("Neu suchen" erzwingt die Suche)
+CACHE_MAX_AGE_DAYS = 30
+CACHE_HINT_PREFIX = "[Aus dem Cache"
+# Ähnlichkeitssuche über den Wortindex: Wörter wie thefuzz (Buchstaben/Ziffern), je Suchwort bis zu
+# SIMILAR_WORD_VARIANTS ähnliche Wörter (Tippfehler, fuzz.ratio >= SIMILAR_WORD_CUTOFF), seltene Wörter
+# zuerst, höchstens SIMILAR_MAX_POSTINGS Indexeinträge lesen, die besten SIMILAR_CANDIDATES exakt vergleichen
+QUERY_WORD_PATTERN = re.compile(r"[^\W_]+")
+SIMILAR_WORD_VARIANTS = 3
+SIMILAR_WORD_CUTOFF = 75
+# Ohne Trigramm-Tabelle (SQLite < 3.34): höchstens so viele Wörter mit gleichem Anfang vergleichen
+SIMILAR_PREFIX_SCAN = 500
+SIMILAR_LENGTH_WINDOW = 2
+SIMILAR_MAX_POSTINGS = 5000
+SIMILAR_CANDIDATES = 200
+# Volltextsuche im Verlauf (FTS5, bm25): Anfrage zählt SEARCH_QUERY_WEIGHT-fach gegenüber dem Ergebnistext,
+# Treffer werden in Ausschnitten (SEARCH_SNIPPET_TOKENS Wörter) zwischen den Markierungen hervorgehoben.
+# Bei sehr häufigen Wörtern werden nur die neuesten SEARCH_RANK_WINDOW Treffer nach bm25 sortiert.
+SEARCH_LIMIT = 50
+SEARCH_RANK_WINDOW = 10000
+SEARCH_QUERY_WEIGHT = 5.0
+SEARCH_SNIPPET_TOKENS = 16
+SEARCH_DELAY_MS = 250
+MARK_START = "\x02"
+MARK_END = "\x03"
+# Für längere Texte zuerst die Online-Dienste, das Offline-Wörterbuch nur als Rückfall
+TRANSLATION_CHAIN = default_chain(('deep_translator', 'googletrans', 'offline'))
 
 # Liste der Domains, die bekanntermaßen unstrukturierten Text liefern (Blacklist)
 UNRELIABLE_DOMAINS = [
@@ -80,36 +133,197 @@ PROXY_POOL = [
 
 # --- HILFSFUNKTIONEN ---
 
+def normalize_query(anfrage):
+    """Schlüssel für den Cache: Unicode-NFC, Groß-/Kleinschreibung und Leerraum egal."""
+    return " ".join(unicodedata.normalize('NFC', anfrage).casefold().split())
+
+def create_word_trigrams(conn):
+    """Migrationsschritt: Trigramm-Tabelle, die Wörter des Wortindex trotz Tippfehlern findet
+    (FTS5 trigram, SQLite >= 3.34). Fehlt das, bleibt sie weg und _similar_words vergleicht
+    stattdessen Wörter mit gleichem Anfang."""
+    conn.execute("SAVEPOINT trigramme")
+    try:
+        conn.execute("""CREATE VIRTUAL TABLE anfragen_woerter_trigramme USING fts5(
+                wort, content='anfragen_woerter', content_rowid='id', tokenize='trigram'
+            )""")
+        conn.execute("""CREATE TRIGGER anfragen_woerter_ai AFTER INSERT ON anfragen_woerter BEGIN
+                INSERT INTO anfragen_woerter_trigramme (rowid, wort) VALUES (new.id, new.wort);
+            END""")
+        conn.execute("""CREATE TRIGGER anfragen_woerter_ad AFTER DELETE ON anfragen_woerter BEGIN
+                INSERT INTO anfragen_woerter_trigramme (anfragen_woerter_trigramme, rowid, wort)
+                    VALUES ('delete', old.id, old.wort);
+            END""")
+        conn.execute("INSERT INTO anfragen_woerter_trigramme (anfragen_woerter_trigramme) VALUES ('rebuild')")
+    except sqlite3.OperationalError as e:
+        conn.execute("ROLLBACK TO trigramme")
+        print(f"Hinweis: Keine Trigramm-Suche für Tippfehler verfügbar ({e}).")
+    conn.execute("RELEASE trigramme")
+
+def create_fulltext_index(conn):
+    """Migrationsschritt: Volltextindex über Anfrage und Ergebnistext (FTS5 mit anfragen_cache
+    als Inhaltstabelle). Ohne FTS5 bleibt er weg und search_cache sucht ohne Index."""
+    conn.execute("SAVEPOINT volltext")
+    try:
+        conn.execute("""CREATE VIRTUAL TABLE anfragen_volltext USING fts5(
+                anfrage, ergebnis_text, content='anfragen_cache', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )""")
+        conn.execute("""CREATE TRIGGER anfragen_cache_volltext_ai AFTER INSERT ON anfragen_cache BEGIN
+                INSERT INTO anfragen_volltext (rowid, anfrage, ergebnis_text)
+                    VALUES (new.id, new.anfrage, new.ergebnis_text);
+            END""")
+        conn.execute("""CREATE TRIGGER anfragen_cache_volltext_ad AFTER DELETE ON anfragen_cache BEGIN
+                INSERT INTO anfragen_volltext (anfragen_volltext, rowid, anfrage, ergebnis_text)
+                    VALUES ('delete', old.id, old.anfrage, old.ergebnis_text);
+            END""")
+        conn.execute("""CREATE TRIGGER anfragen_cache_volltext_au AFTER UPDATE OF anfrage, ergebnis_text
+                ON anfragen_cache BEGIN
+                INSERT INTO anfragen_volltext (anfragen_volltext, rowid, anfrage, ergebnis_text)
+                    VALUES ('delete', old.id, old.anfrage, old.ergebnis_text);
+                INSERT INTO anfragen_volltext (rowid, anfrage, ergebnis_text)
+                    VALUES (new.id, new.anfrage, new.ergebnis_text);
+            END""")
+        conn.execute("INSERT INTO anfragen_volltext (anfragen_volltext) VALUES ('rebuild')")
+    except sqlite3.OperationalError as e:
+        conn.execute("ROLLBACK TO volltext")
+        print(f"Hinweis: Kein Volltextindex verfügbar ({e}).")
+    conn.execute("RELEASE volltext")
+
+def has_table(conn, name):
+    """True, wenn die Datenbank die (optionale) Tabelle name hat."""
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+# Schema-Migrationen (Version = Position in der Liste, über PRAGMA user_version; nur anhängen!)
+#  Ein Eintrag ist eine SQL-Anweisung oder eine Funktion, die die Verbindung erhält.
+DB_MIGRATIONS = [
+    # 1: Grundschema (bestehende Datenbanken haben user_version 0)
+    ("""CREATE TABLE IF NOT EXISTS anfragen_cache (
+            id INTEGER PRIMARY KEY,
+            anfrage TEXT NOT NULL,
+            quelle_typ TEXT NOT NULL,
+            ergebnis_text TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )""",),
+    # 2: Normalisierte Anfrage für den Cache-Zugriff vor der Online-Suche
+    ("ALTER TABLE anfragen_cache ADD COLUMN anfrage_norm TEXT",
+     "UPDATE anfragen_cache SET anfrage_norm = normalize_query(anfrage)",
+     "CREATE INDEX IF NOT EXISTS idx_anfragen_norm ON anfragen_cache (anfrage_norm, timestamp)"),
+    # 3: Wortindex für die Ähnlichkeitssuche. anfragen_begriffe hält je normalisierter Anfrage eine
+    #    Zeile, anfragen_wortindex verweist je Wort (nach Wortanzahl der Anfrage sortiert) auf sie.
+    #    Neue Anfragen trägt save_to_db ein; die Lösch-Trigger kommen ohne Python-Funktionen aus,
+    #    damit auch andere Programme (z.B. die sqlite3-Kommandozeile) anfragen_cache ändern können.
+    ("""CREATE TABLE IF NOT EXISTS anfragen_begriffe (
+            id INTEGER PRIMARY KEY,
+            anfrage_norm TEXT NOT NULL UNIQUE,
+            anfrage TEXT NOT NULL,
+            laenge INTEGER NOT NULL
+        )""",
+     """CREATE TABLE IF NOT EXISTS anfragen_woerter (
+            id INTEGER PRIMARY KEY,
+            wort TEXT NOT NULL UNIQUE,
+            anzahl INTEGER NOT NULL DEFAULT 0
+        )""",
+     """CREATE TABLE IF NOT EXISTS anfragen_wortindex (
+            wort_id INTEGER NOT NULL,
+            laenge INTEGER NOT NULL,
+            begriff_id INTEGER NOT NULL,
+            PRIMARY KEY (wort_id, laenge, begriff_id)
+        ) WITHOUT ROWID""",
+     "CREATE INDEX IF NOT EXISTS idx_wortindex_begriff ON anfragen_wortindex (begriff_id)",
+     """INSERT INTO anfragen_begriffe (anfrage_norm, anfrage, laenge)
+            SELECT anfrage_norm, anfrage, json_array_length(query_words(anfrage_norm))
+            FROM anfragen_cache WHERE anfrage_norm IS NOT NULL ORDER BY id
+            ON CONFLICT (anfrage_norm) DO UPDATE SET anfrage = excluded.anfrage""",
+     """INSERT INTO anfragen_woerter (wort, anzahl)
+            SELECT j.value, count(*) FROM anfragen_begriffe b, json_each(query_words(b.anfrage_norm)) j
+            GROUP BY j.value""",
+     """INSERT INTO anfragen_wortindex (wort_id, laenge, begriff_id)
+            SELECT w.id, b.laenge, b.id FROM anfragen_begriffe b, json_each(query_words(b.anfrage_norm)) j
+            JOIN anfragen_woerter w ON w.wort = j.value""",
+     create_word_trigrams,
+     """CREATE TRIGGER IF NOT EXISTS anfragen_begriffe_ad AFTER DELETE ON anfragen_begriffe BEGIN
+            UPDATE anfragen_woerter SET anzahl = anzahl - 1
+                WHERE id IN (SELECT wort_id FROM anfragen_wortindex WHERE begriff_id = old.id);
+            DELETE FROM anfragen_woerter WHERE anzahl <= 0
+                AND id IN (SELECT wort_id FROM anfragen_wortindex WHERE begriff_id = old.id);
+            DELETE FROM anfragen_wortindex WHERE begriff_id = old.id;
+        END""",
+     """CREATE TRIGGER IF NOT EXISTS anfragen_cache_begriffe_ad AFTER DELETE ON anfragen_cache BEGIN
+            DELETE FROM anfragen_begriffe WHERE anfrage_norm = old.anfrage_norm
+                AND NOT EXISTS (SELECT 1 FROM anfragen_cache WHERE anfrage_norm = old.anfrage_norm);
+        END"""),
+    # 4: Volltextindex über Anfrage und Ergebnistext (optional, siehe create_fulltext_index)
+    (create_fulltext_index,),
+]
+
+def split_query_words(anfrage_norm):
+    """Verschiedene Wörter einer normalisierten Anfrage (wie thefuzz sie vergleicht)."""
+    return list(dict.fromkeys(QUERY_WORD_PATTERN.findall(anfrage_norm or "")))
+
+def query_words(anfrage_norm):
+    """split_query_words als JSON-Liste (SQL-Funktion für die Migrationen)."""
+    return json.dumps(split_query_words(anfrage_norm), ensure_ascii=False)
+
+def connect_db():
+    """Öffnet die Cache-Datenbank (normalize_query und query_words sind auch in SQL verfügbar)."""
+    conn = sqlite3.connect(DB_NAME)
+    conn.create_function('normalize_query', 1, normalize_query, deterministic=True)
+    conn.create_function('query_words', 1, query_words, deterministic=True)
+    return conn
+
 def initialize_db():
-    """Erstellt die SQLite-Datenbank."""
+    """Erstellt die SQLite-Datenbank bzw. bringt das Schema auf den neuesten Stand."""
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS anfragen_cache (
-                id INTEGER PRIMARY KEY,
-                anfrage TEXT NOT NULL,
-                quelle_typ TEXT NOT NULL,
-                ergebnis_text TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        conn.commit()
-        conn.close()
+        conn = connect_db()
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for new_version, statements in enumerate(DB_MIGRATIONS[version:], start=version + 1):
+                try:
+                    conn.execute("BEGIN")
+                    for statement in statements:
+                        if callable(statement):
+                            statement(conn)
+                        else:
+                            conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {new_version}")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+        finally:
+            conn.close()
         return True
     except Exception as e:
         print(f"Fehler beim Initialisieren der Datenbank: {e}")
         return False
 
+def _index_query(conn, anfrage, anfrage_norm):
+    """Trägt eine Anfrage in den Wortindex (Migration 3) ein, in der Transaktion des Aufrufers."""
+    row = conn.execute("SELECT id FROM anfragen_begriffe WHERE anfrage_norm = ?", (anfrage_norm,)).fetchone()
+    if row:
+        conn.execute("UPDATE anfragen_begriffe SET anfrage = ? WHERE id = ?", (anfrage, row[0]))
+        return
+    words = split_query_words(anfrage_norm)
+    begriff_id = conn.execute("INSERT INTO anfragen_begriffe (anfrage_norm, anfrage, laenge) VALUES (?, ?, ?)",
+                              (anfrage_norm, anfrage, len(words))).lastrowid
+    for wort in words:
+        conn.execute("INSERT INTO anfragen_woerter (wort, anzahl) VALUES (?, 1) "
+                     "ON CONFLICT (wort) DO UPDATE SET anzahl = anzahl + 1", (wort,))
+        conn.execute("INSERT INTO anfragen_wortindex (wort_id, laenge, begriff_id) "
+                     "SELECT id, ?, ? FROM anfragen_woerter WHERE wort = ?", (len(words), begriff_id, wort))
+
 def save_to_db(anfrage, quelle_typ, ergebnis_text):
     """Speichert die Anfrage und das Ergebnis in die Datenbank."""
     try:
-        conn = sqlite3.connect(DB_NAME)
+        conn = connect_db()
         cursor = conn.cursor()
         # Stellen Sie sicher, dass der Text vor dem Speichern auf MAX_CHARS begrenzt wird
         text_to_save = ergebnis_text[:MAX_CHARS]
-        cursor.execute("INSERT INTO anfragen_cache (anfrage, quelle_typ, ergebnis_text) VALUES (?, ?, ?)",
-                       (anfrage, quelle_typ, text_to_save))
+        anfrage_norm = normalize_query(anfrage)
+        cursor.execute("INSERT INTO anfragen_cache (anfrage, anfrage_norm, quelle_typ, ergebnis_text) "
+                       "VALUES (?, ?, ?, ?)",
+                       (anfrage, anfrage_norm, quelle_typ, text_to_save))
+        _index_query(conn, anfrage, anfrage_norm)
         conn.commit()
         conn.close()
         return True
@@ -117,6 +331,23 @@ def save_to_db(anfrage, quelle_typ, ergebnis_text):
         print(f"Fehler beim Speichern in die Datenbank: {e}")
         return False
 
+def get_cached_result(anfrage, max_age_days=CACHE_MAX_AGE_DAYS):
+    """Neuestes gespeichertes Ergebnis zur selben Anfrage, falls jünger als max_age_days.
+    Gibt (ergebnis_text, quelle_typ, timestamp) oder None zurück."""
+    try:
+        conn = connect_db()
+        try:
+            return conn.execute(
+                "SELECT ergebnis_text, quelle_typ, timestamp FROM anfragen_cache "
+                "WHERE anfrage_norm = ? AND timestamp >= datetime('now', ?) "
+                "ORDER BY timestamp DESC, id DESC LIMIT 1",
+                (normalize_query(anfrage), f"-{max_age_days} days")).fetchone()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Fehler beim Lesen des Caches: {e}")
+        return None
+
 def load_all_cache_data():
     """Lädt alle Daten aus dem Cache."""
     try:
@@ -131,19 +362,172 @@ def load_all_cache_data():
         print(f"Fehler beim Laden der Cache-Daten: {e}")
         return []
 
+def build_search_query(suchtext, prefix=True):
+    """Suchtext -> FTS5-Ausdruck: alle Wörter müssen vorkommen, das letzte auch als Wortanfang.
+    prefix=False liefert die Wörter ODER-verknüpft ohne Wortanfang (für die Hervorhebung:
+    die Erweiterung eines Wortanfangs wäre für jeden einzelnen Treffer erneut teuer)."""
+    terms = ['"%s"' % word for word in QUERY_WORD_PATTERN.findall(normalize_query(suchtext))]
+    if not prefix:
+        return " OR ".join(terms)
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+def _search_cache_scan(conn, suchtext, limit):
+    """search_cache ohne Volltextindex: alle Wörter als Teiltext, neueste zuerst, Textanfang als Ausschnitt."""
+    words = QUERY_WORD_PATTERN.findall(normalize_query(suchtext))
+    condition = " AND ".join(["(anfrage_norm LIKE ? OR normalize_query(ergebnis_text) LIKE ?)"] * len(words))
+    return conn.execute(
+        "SELECT id, anfrage, quelle_typ, timestamp, substr(ergebnis_text, 1, 200) FROM anfragen_cache "
+        f"WHERE {condition} ORDER BY id DESC LIMIT ?",
+        [f"%{word}%" for word in words for _ in range(2)] + [limit]).fetchall()
+
+def search_cache(suchtext, limit=SEARCH_LIMIT):
+    """Volltextsuche in Anfragen und Ergebnissen, nach bm25 sortiert.
+    Gibt [(id, anfrage, quelle_typ, timestamp, ausschnitt)] zurück; Treffer im Ausschnitt
+    stehen zwischen MARK_START und MARK_END."""
+    match = build_search_query(suchtext)
+    if not match:
+        return []
+    try:
+        conn = connect_db()
+        try:
+            if not has_table(conn, 'anfragen_volltext'):
+                return _search_cache_scan(conn, suchtext, limit)
+            # Erst nur die Rangfolge (schnell), Ausschnitte dann nur für die angezeigten Treffer
+            ids = [row[0] for row in conn.execute(
+                "SELECT rowid FROM (SELECT rowid, bm25(anfragen_volltext, ?, 1.0) AS score "
+                "FROM anfragen_volltext WHERE anfragen_volltext MATCH ? ORDER BY rowid DESC LIMIT ?) "
+                "ORDER BY score LIMIT ?",
+                (SEARCH_QUERY_WEIGHT, match, SEARCH_RANK_WINDOW, limit))]
+            if not ids:
+                return []
+            placeholders = ",".join("?" * len(ids))
+            snippets = dict(conn.execute(
+                "SELECT rowid, snippet(anfragen_volltext, 1, ?, ?, '…', ?) FROM anfragen_volltext "
+                f"WHERE anfragen_volltext MATCH ? AND rowid IN ({placeholders})",
+                (MARK_START, MARK_END, SEARCH_SNIPPET_TOKENS, build_search_query(suchtext, prefix=False), *ids)))
+            rows = {}
+            for db_id, anfrage, quelle_typ, timestamp, anfang in conn.execute(
+                    "SELECT id, anfrage, quelle_typ, timestamp, substr(ergebnis_text, 1, 200) "
+                    f"FROM anfragen_cache WHERE id IN ({placeholders})", ids):
+                # Nur über den Wortanfang gefunden: Textanfang statt Ausschnitt
+                rows[db_id] = (db_id, anfrage, quelle_typ, timestamp, snippets.get(db_id) or anfang)
+            return [rows[db_id] for db_id in ids if db_id in rows]
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Fehler bei der Volltextsuche: {e}")
+        return []
+
+def get_highlighted_result(db_id, suchtext):
+    """Vollständiger Ergebnistext mit markierten Treffern (oder None, wenn nichts passt)."""
+    match = build_search_query(suchtext, prefix=False)
+    if not match:
+        return None
+    try:
+        conn = connect_db()
+        try:
+            if not has_table(conn, 'anfragen_volltext'):
+                return None
+            row = conn.execute(
+                "SELECT highlight(anfragen_volltext, 1, ?, ?) FROM anfragen_volltext "
+                "WHERE anfragen_volltext MATCH ? AND rowid = ?",
+                (MARK_START, MARK_END, match, db_id)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Fehler beim Hervorheben der Treffer: {e}")
+        return None
+
+def preload_modules():
+    """Importiert die schweren Module im Hintergrund vor (läuft in einem Daemon-Thread)."""
+    import importlib
+    for name in LAZY_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Warnung: Modul '{name}' konnte nicht geladen werden: {e}")
+    startup_report.mark("Module im Hintergrund geladen")
+
+
+def _similar_words(conn, wort, fuzz, trigrams=True):
+    """[(wort_id, anzahl, gewicht)] zu einem Suchwort: exakter Treffer oder ähnliche Wörter."""
+    row = conn.execute("SELECT id, anzahl FROM anfragen_woerter WHERE wort = ?", (wort,)).fetchone()
+    if row:
+        return [(row[0], row[1], 1.0)]
+    if len(wort) < 3:
+        return []
+    if trigrams:
+        # Trigramme des Worts (ODER-verknüpft), bm25 bevorzugt Wörter mit vielen gemeinsamen Trigrammen
+        match = " OR ".join('"%s"' % t.replace('"', '""') for t in {wort[i:i + 3] for i in range(len(wort) - 2)})
+        rows = conn.execute(
+            "SELECT w.id, w.wort, w.anzahl FROM anfragen_woerter_trigramme t "
+            "JOIN anfragen_woerter w ON w.id = t.rowid "
+            "WHERE anfragen_woerter_trigramme MATCH ? ORDER BY t.rank LIMIT ?",
+            (match, 4 * SIMILAR_WORD_VARIANTS)).fetchall()
+    else:
+        # Ohne Trigramm-Tabelle: nur Tippfehler ab dem dritten Buchstaben (Bereich im UNIQUE-Index)
+        rows = conn.execute(
+            "SELECT id, wort, anzahl FROM anfragen_woerter WHERE wort >= ? AND wort < ? LIMIT ?",
+            (wort[:2], wort[:2] + "\U0010ffff", SIMILAR_PREFIX_SCAN)).fetchall()
+    scored = sorted(((fuzz.ratio(wort, other), word_id, anzahl) for word_id, other, anzahl in rows), reverse=True)
+    return [(word_id, anzahl, score / 100) for score, word_id, anzahl in scored[:SIMILAR_WORD_VARIANTS]
+            if score >= SIMILAR_WORD_CUTOFF]
+
+def _similar_candidates(conn, anfrage, fuzz):
+    """Vorauswahl über den Wortindex: bis zu SIMILAR_CANDIDATES Anfragen mit den meisten
+    (seltenen) gemeinsamen Wörtern, bevorzugt mit ähnlicher Wortanzahl."""
+    words = split_query_words(normalize_query(anfrage))
+    if not words:
+        return []
+    trigrams = has_table(conn, 'anfragen_woerter_trigramme')
+    terms = {}
+    for wort in words:
+        for word_id, anzahl, weight in _similar_words(conn, wort, fuzz, trigrams):
+            if weight > terms.get(word_id, (0, 0))[1]:
+                terms[word_id] = (anzahl, weight)
+    total = conn.execute("SELECT max(id) FROM anfragen_begriffe").fetchone()[0] or 1
+    votes = {}
+    budget = SIMILAR_MAX_POSTINGS
+    for word_id, (anzahl, weight) in sorted(terms.items(), key=lambda item: item[1][0]):
+        idf = weight * math.log(1 + total / max(anzahl, 1))
+        rows = conn.execute(
+            "SELECT begriff_id FROM anfragen_wortindex WHERE wort_id = ? AND laenge BETWEEN ? AND ? LIMIT ?",
+            (word_id, len(words) - SIMILAR_LENGTH_WINDOW, len(words) + SIMILAR_LENGTH_WINDOW, budget)).fetchall()
+        for (begriff_id,) in rows:
+            votes[begriff_id] = votes.get(begriff_id, 0) + idf
+        budget -= len(rows)
+        if budget <= 0:
+            break
+    best = sorted(votes, key=votes.get, reverse=True)[:SIMILAR_CANDIDATES]
+    if not best:
+        return []
+    placeholders = ",".join("?" * len(best))
+    return [row[0] for row in conn.execute(
+        f"SELECT anfrage FROM anfragen_begriffe WHERE id IN ({placeholders})", best)]
+
 def get_similar_cached_queries(anfrage):
-    """Sucht im Cache nach Anfragen, die der aktuellen Anfrage ähnlich sind."""
+    """Sucht im Cache nach Anfragen, die der aktuellen Anfrage ähnlich sind.
+    Der Wortindex (Migration 3) wählt Kandidaten vor, nur diese vergleicht thefuzz exakt."""
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT anfrage FROM anfragen_cache ORDER BY timestamp DESC")
-        cached_queries = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        from thefuzz import process, fuzz
+        conn = connect_db()
+        try:
+            try:
+                cached_queries = _similar_candidates(conn, anfrage, fuzz)
+            except sqlite3.OperationalError as e:
+                # Wortindex nicht lesbar: alle Anfragen vergleichen
+                print(f"Warnung: Wortindex nicht verfügbar ({e}), vergleiche alle Anfragen.")
+                cached_queries = list({row[0] for row in conn.execute("SELECT anfrage FROM anfragen_cache")})
+        finally:
+            conn.close()
 
         if not cached_queries: return []
         # Verwendet thefuzz zur Ähnlichkeitsprüfung
         matches = process.extractBests(
-            anfrage, list(set(cached_queries)), scorer=fuzz.token_set_ratio,
+            anfrage, cached_queries, scorer=fuzz.token_set_ratio,
             score_cutoff=SIMILARITY_CUTOFF, limit=5
         )
         return [f"{query} (Ähnlichkeit: {score}%)" for query, score in matches]
@@ -153,12 +537,12 @@ def get_similar_cached_queries(anfrage):
 
 def translate_to_german(text):
     """
-    Übersetzt den gegebenen Text ins Deutsche mithilfe von deep_translator.
+    Übersetzt den gegebenen Text ins Deutsche über die gemeinsame Provider-Kette
+    (deep_translator, googletrans, Offline-Wörterbuch – siehe translation.py).
     """
     if not text:
         return ""
 
-    translator = GoogleTranslator(source='auto', target='de')
     text_blocks = []
     current_block = ""
 
@@ -180,7 +564,9 @@ def translate_to_german(text):
 
     for i, block in enumerate(text_blocks):
         try:
-            translation = translator.translate(block)
+            translation, provider = TRANSLATION_CHAIN.resolve(block, 'auto', 'de')
+            if translation is None:
+                raise LookupError("kein Provider lieferte eine Übersetzung")
             translated_text.append(translation)
             if len(text_blocks) > 1:
                 time.sleep(random.uniform(0.5, 1.5))
@@ -251,12 +637,43 @@ def summarize_multiple_sources(sources_data, anfrage):
 
 ## 🔍 BACKEND-LOGIK (Web-Suche und Scraping)
 
-def get_text_from_url(url, current_proxy=None):
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Gemeinsame requests.Session für alle Seitenabrufe (wird beim ersten Abruf angelegt).
+    Verbindungen (TCP+TLS) bleiben je Host offen und werden wiederverwendet, auch über
+    Wiederholungen und mehrere Suchen hinweg; die Pools sind thread-sicher (FetchScheduler)."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            from http.cookiejar import DefaultCookiePolicy
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.request import ACCEPT_ENCODING
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            # gzip/deflate, br (und zstd) nur, wenn urllib3 sie entpacken kann (Pakete brotli/zstandard)
+            session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+            # Keine Cookies über Abrufe hinweg mitnehmen (wie bisher mit einzelnen requests.get)
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            _http_session = session
+        return _http_session
+
+def get_text_from_url(url, current_proxy=None, deadline=None):
     """
     Holt den reinen Text von einer URL, mit robuster Fallback-Logik.
+    deadline (time.monotonic()) begrenzt den Abruf auf die Restzeit der Suche.
     """
 
-    time.sleep(random.uniform(1.5, 3.5))
+    import requests
+    from bs4 import BeautifulSoup
+
+    timeout = HTTP_TIMEOUT if deadline is None else min(HTTP_TIMEOUT, deadline - time.monotonic())
+    if timeout <= 0:
+        return f"[Übersprungen: Zeitbudget der Suche ({SEARCH_TIME_BUDGET}s) erschöpft]", False
 
     INVALID_CONTENT_PHRASES = [
         "bitte klicken sie hier", "nicht automatisch weitergeleitet",
@@ -281,7 +698,7 @@ def get_text_from_url(url, current_proxy=None):
 
         proxies = {"http": current_proxy, "https": current_proxy} if current_proxy else None
 
-        response = requests.get(url, headers=headers, timeout=20, proxies=proxies)
+        response = get_http_session().get(url, headers=headers, timeout=timeout, proxies=proxies)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -318,12 +735,27 @@ def get_text_from_url(url, current_proxy=None):
         error_msg = f"[Fehler beim Laden von {url}: {type(e).__name__}]"
         return error_msg, False
 
+# Wartezeiten zwischen Abrufen übernimmt der Scheduler (je Host statt vor jedem Abruf)
+PAGE_FETCHER = FetchScheduler(get_text_from_url, FETCH_WORKERS, FETCH_MIN_INTERVAL, FETCH_JITTER)
 
-def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
+
+def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag, force_refresh=False):
     """
     Führt eine Suche durch mit 1x DDGS und den anschließenden Quellenvergleich.
+    Ein frisches Ergebnis zur selben Anfrage kommt sofort aus dem Cache (außer bei force_refresh).
     """
-
+    if not force_refresh:
+        cached = get_cached_result(anfrage)
+        if cached:
+            ergebnis_text, cached_typ, timestamp = cached
+            print(f"INFO: Anfrage aus dem Cache beantwortet ({timestamp} UTC, {cached_typ}).")
+            return (f"{CACHE_HINT_PREFIX} vom {timestamp} UTC – 'Neu suchen' (Ctrl+R) erzwingt eine "
+                    f"Online-Suche]\n\n{ergebnis_text}")
+
+    from ddgs import DDGS
+
+    # Zeitbudget der ganzen Online-Suche (DDGS-Versuche, Seitenabrufe, Whitelist)
+    deadline = time.monotonic() + SEARCH_TIME_BUDGET
     quelle_typ = "Allgemeine Suche"
     domain_ausschlusse = " ".join([f"-site:{d}" for d in UNRELIABLE_DOMAINS if d not in ('youtube.com')])
     suchanfrage_effektiv = f"{anfrage} language:de {domain_ausschlusse}"
@@ -340,7 +772,7 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
     # 1. DDGS SUCH-STRATEGIEN (MAX_RETRIES)
     for retry_count in range(MAX_RETRIES):
         if stop_search_flag.is_set():
-            return "Suche durch den Benutzer abgebrochen.", "Abbruch"
+            return "Suche durch den Benutzer abgebrochen."
 
         effective_proxy_pool = [p for p in PROXY_POOL if p is not None]
         if effective_proxy_pool and random.random() < 0.75:
@@ -348,19 +780,24 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
         else:
             current_proxy = None
 
-        zufaellige_pause = random.uniform(5, 10)
+        restzeit = deadline - time.monotonic()
+        if restzeit <= 0:
+            error_log_full.append(f"Suchdienst {dienst_name_current}: Zeitbudget der Suche ({SEARCH_TIME_BUDGET}s) erschöpft.")
+            break
+        zufaellige_pause = min(random.uniform(5, 10), restzeit)
         print(f"INFO: {dienst_name_current} Versuch ({retry_count + 1}). Warte {zufaellige_pause:.2f}s mit Proxy: {current_proxy if current_proxy else 'Kein Proxy'}")
         time.sleep(zufaellige_pause)
 
         try:
-            with DDGS(timeout=20, proxy=current_proxy) as ddgs:
+            ddgs_timeout = max(1, int(min(HTTP_TIMEOUT, deadline - time.monotonic())))
+            with DDGS(timeout=ddgs_timeout, proxy=current_proxy) as ddgs:
                 results = list(ddgs.text(suchanfrage_effektiv, max_results=8))
 
             if not results: continue
             error_log_retry = []
+            jobs = []
 
             for i, result in enumerate(results):
-                if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen.", "Abbruch"
                 first_url = result.get('href')
                 first_title = result.get('title', '').lower()
 
@@ -369,15 +806,19 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
                     continue
 
                 print(f"INFO: Versuche, Quelle #{i+1} zu laden: {first_url}")
-                inhalt, success = get_text_from_url(first_url, current_proxy)
-
-                if success:
-                    successful_result = result
-                    successful_content = inhalt
-                    dienst_name = dienst_name_current
-                    break
-                else:
-                    error_log_retry.append(f"Quelle #{i+1} ({first_url}): {inhalt}")
+                jobs.append((i, first_url, current_proxy, deadline))
+
+            # Quellen verschiedener Hosts parallel laden, die zuerst erfolgreich geladene gewinnt
+            with closing(PAGE_FETCHER.fetch_all(jobs, stop_search_flag)) as fetches:
+                for i, (inhalt, success) in fetches:
+                    if success:
+                        successful_result = results[i]
+                        successful_content = inhalt
+                        dienst_name = dienst_name_current
+                        break
+                    else:
+                        error_log_retry.append(f"Quelle #{i+1} ({results[i].get('href')}): {inhalt}")
+            if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen."
 
             error_log_full.extend(error_log_retry)
             if successful_result and successful_content: break
@@ -392,10 +833,9 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
         print("INFO: DDGS-Suche fehlgeschlagen. Starte Whitelist-Fallback mit Quellenvergleich.")
         suchstring_query = anfrage.replace(" ", "+")
         effective_proxy_pool = [p for p in PROXY_POOL if p is not None]
+        jobs = []
 
-        for base_url in RELIABLE_URL_WHITELIST:
-            if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen.", "Abbruch"
-
+        for index, base_url in enumerate(RELIABLE_URL_WHITELIST):
             current_proxy = random.choice(effective_proxy_pool) if effective_proxy_pool and random.random() < 0.75 else None
 
             # URL-Erstellung (unverändert)
@@ -414,21 +854,28 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
             else:
                 final_url = f"{base_url}suche?q={suchstring_query}"
 
-            print(f"INFO: Versuche, Whitelist-Quelle zu laden: {final_url}")
-            time.sleep(random.uniform(1.0, 2.5))
-            inhalt, success = get_text_from_url(final_url, current_proxy)
+            jobs.append((index, final_url, current_proxy, deadline))
 
-            if success:
-                whitelist_results.append({
-                    'title': f"Whitelist: {base_url.split('/')[2]}",
-                    'href': final_url,
-                    'text_original': inhalt
-                })
+        # Alle Whitelist-Hosts parallel laden; Ergebnisse danach wieder in Whitelist-Reihenfolge
+        print(f"INFO: Lade {len(jobs)} Whitelist-Quellen (bis zu {FETCH_WORKERS} gleichzeitig).")
+        geladen = {}
+        with closing(PAGE_FETCHER.fetch_all(jobs, stop_search_flag)) as fetches:
+            for index, (inhalt, success) in fetches:
+                final_url = jobs[index][1]
+                print(f"INFO: Whitelist-Quelle {'geladen' if success else 'fehlgeschlagen'}: {final_url}")
+                if success:
+                    geladen[index] = {
+                        'title': f"Whitelist: {final_url.split('/')[2]}",
+                        'href': final_url,
+                        'text_original': inhalt
+                    }
+        if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen."
+        whitelist_results = [geladen[index] for index in sorted(geladen)]
 
         if whitelist_results:
             dienst_name = "Whitelist-Quellenvergleich"
             for item in whitelist_results:
-                if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen.", "Abbruch"
+                if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen."
                 item['text'] = translate_to_german(item['text_original'])
 
             combined_content, source_info = summarize_multiple_sources(whitelist_results, anfrage)
@@ -511,37 +958,58 @@ class VerlaufAnzeigeFenster:
         main_frame = ttk.Frame(self.top, padding="10")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        # Volltextsuche (sucht beim Tippen, Enter sofort, Escape zeigt wieder alles)
+        such_frame = ttk.Frame(main_frame)
+        such_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        such_frame.columnconfigure(1, weight=1)
+        ttk.Label(such_frame, text="Volltextsuche:").grid(row=0, column=0, sticky=tk.W, padx=(0, 5))
+        self.such_var = tk.StringVar()
+        self.such_entry = ttk.Entry(such_frame, textvariable=self.such_var, font=('Arial', 11))
+        self.such_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
+        self.such_entry.bind('<KeyRelease>', self.plane_suche)
+        self.such_entry.bind('<Return>', self.suche)
+        self.such_entry.bind('<Escape>', self.zeige_alle)
+        ttk.Button(such_frame, text="Alle anzeigen", command=self.zeige_alle).grid(row=0, column=2, padx=(5, 0))
+        self.status_label = ttk.Label(such_frame, text="")
+        self.status_label.grid(row=0, column=3, padx=(10, 0))
+        self._suche_job = None
+        self.suchtext = ""
 
         # Treeview zur Anzeige der Cache-Daten
-        self.tree = ttk.Treeview(main_frame, columns=('ID', 'Anfrage', 'Typ', 'Zeitstempel'), show='headings')
-        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 20))
+        self.tree = ttk.Treeview(main_frame, columns=('ID', 'Anfrage', 'Typ', 'Zeitstempel', 'Ausschnitt'), show='headings')
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 20))
 
         # Konfiguration der Spalten
         self.tree.heading('ID', text='ID', anchor=tk.CENTER)
         self.tree.heading('Anfrage', text='Anfrage', anchor=tk.W)
         self.tree.heading('Typ', text='Quelle Typ', anchor=tk.W)
         self.tree.heading('Zeitstempel', text='Zeitstempel', anchor=tk.W)
+        self.tree.heading('Ausschnitt', text='Fundstelle', anchor=tk.W)
 
         self.tree.column('ID', width=50, stretch=tk.NO, anchor=tk.CENTER)
-        self.tree.column('Anfrage', width=450)
-        self.tree.column('Typ', width=150)
-        self.tree.column('Zeitstempel', width=200)
+        self.tree.column('Anfrage', width=300)
+        self.tree.column('Typ', width=120)
+        self.tree.column('Zeitstempel', width=150)
+        self.tree.column('Ausschnitt', width=500)
 
         # Scrollbar
         vsb = ttk.Scrollbar(main_frame, orient="vertical", command=self.tree.yview)
-        vsb.grid(row=0, column=1, sticky='ns')
+        vsb.grid(row=1, column=1, sticky='ns')
         self.tree.configure(yscrollcommand=vsb.set)
 
-        # Detailbereich (Textfeld für das vollständige Ergebnis)
-        ttk.Label(main_frame, text="Vollständiges Ergebnis:", font=('Arial', 11, 'bold')).grid(row=1, column=0, sticky=tk.W, pady=(10, 5))
+        # Detailbereich (Textfeld für das vollständige Ergebnis, Suchtreffer hervorgehoben)
+        ttk.Label(main_frame, text="Vollständiges Ergebnis:", font=('Arial', 11, 'bold')).grid(row=2, column=0, sticky=tk.W, pady=(10, 5))
         self.detail_text = scrolledtext.ScrolledText(main_frame, wrap=tk.WORD, height=15, font=('Arial', 10), state='disabled')
-        self.detail_text.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E))
+        self.detail_text.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E))
+        self.detail_text.tag_config('treffer', background='#fff176', font=('Arial', 10, 'bold'))
 
         # Event-Bindung für Klick auf Treeview
         self.tree.bind('<<TreeviewSelect>>', self.zeige_details)
 
         self.lade_daten()
+        self.such_entry.focus_set()
 
     def lade_daten(self):
         """Lädt Daten aus der DB und fügt sie in die Treeview ein."""
@@ -553,20 +1021,71 @@ class VerlaufAnzeigeFenster:
 
         for row in data:
             # Fügt nur ID, Anfrage, Typ und Zeitstempel in die Treeview ein
-            self.tree.insert('', tk.END, iid=row[0], values=(row[0], row[1], row[2], row[3]))
+            self.tree.insert('', tk.END, iid=row[0], values=(row[0], row[1], row[2], row[3], ""))
+        self.status_label.config(text=f"{len(data)} Einträge")
+
+    def plane_suche(self, event=None):
+        """Startet die Suche kurz nach der letzten Eingabe (nicht bei jedem Tastendruck)."""
+        if event is not None and event.keysym in ('Return', 'Escape'):
+            return
+        if self._suche_job is not None:
+            self.top.after_cancel(self._suche_job)
+        self._suche_job = self.top.after(SEARCH_DELAY_MS, self.suche)
+
+    def suche(self, event=None):
+        """Zeigt die Treffer der Volltextsuche (bm25-Rangfolge) mit Fundstelle an."""
+        if self._suche_job is not None:
+            self.top.after_cancel(self._suche_job)
+            self._suche_job = None
+        suchtext = self.such_var.get().strip()
+        if not build_search_query(suchtext):
+            if self.suchtext:
+                self.suchtext = ""
+                self.lade_daten()
+            return
+        self.suchtext = suchtext
+        start = time.perf_counter()
+        treffer = search_cache(suchtext)
+        dauer_ms = (time.perf_counter() - start) * 1000
+
+        for i in self.tree.get_children():
+            self.tree.delete(i)
+        for db_id, anfrage, quelle_typ, timestamp, ausschnitt in treffer:
+            # In der Liste werden Treffer mit »...« markiert, im Detailbereich farbig
+            ausschnitt = " ".join(ausschnitt.replace(MARK_START, "»").replace(MARK_END, "«").split())
+            self.tree.insert('', tk.END, iid=db_id, values=(db_id, anfrage, quelle_typ, timestamp, ausschnitt))
+        self.status_label.config(text=f"{len(treffer)} Treffer ({dauer_ms:.0f} ms)")
+
+    def zeige_alle(self, event=None):
+        """Beendet die Suche und zeigt wieder den ganzen Verlauf."""
+        if self._suche_job is not None:
+            self.top.after_cancel(self._suche_job)
+            self._suche_job = None
+        self.such_var.set("")
+        self.suchtext = ""
+        self.lade_daten()
 
     def zeige_details(self, event):
         """Zeigt den vollständigen Text des ausgewählten Eintrags im Detailbereich an."""
         selected_item = self.tree.focus()
         if not selected_item: return
 
-        # Holt die ID (die iid ist die Datenbank-ID)
-        db_id = int(self.tree.item(selected_item, 'iid'))
-        full_text = self.cache_data.get(db_id, "Fehler: Ergebnis konnte nicht aus dem Cache abgerufen werden.")
+        # Die iid ist die Datenbank-ID
+        db_id = int(selected_item)
+        full_text = None
+        if self.suchtext:
+            full_text = get_highlighted_result(db_id, self.suchtext)
+        if full_text is None:
+            full_text = self.cache_data.get(db_id, "Fehler: Ergebnis konnte nicht aus dem Cache abgerufen werden.")
 
         self.detail_text.config(state='normal')
         self.detail_text.delete(1.0, tk.END)
-        self.detail_text.insert(tk.END, full_text)
+        # Text zwischen MARK_START und MARK_END als Treffer hervorheben
+        for i, teil in enumerate(full_text.replace(MARK_END, MARK_START).split(MARK_START)):
+            self.detail_text.insert(tk.END, teil, ('treffer',) if i % 2 else ())
+        erster_treffer = self.detail_text.tag_nextrange('treffer', 1.0)
+        if erster_treffer:
+            self.detail_text.see(erster_treffer[0])
         self.detail_text.config(state='disabled')
 
 
@@ -660,7 +1179,8 @@ class WissensKI_GUI:
         button_frame.columnconfigure(0, weight=1)
         button_frame.columnconfigure(1, weight=1)
         button_frame.columnconfigure(2, weight=1)
-        button_frame.columnconfigure(3, weight=1) # Platz für 4 Buttons
+        button_frame.columnconfigure(3, weight=1)
+        button_frame.columnconfigure(4, weight=1) # Platz für 5 Buttons
 
         self.suchen_button = ttk.Button(button_frame, text="Suchen (Ctrl+S)", command=self.starte_suche_thread, style='TButton')
         self.suchen_button.grid(row=0, column=0, padx=5, sticky=(tk.W, tk.E))
@@ -682,6 +1202,15 @@ class WissensKI_GUI:
         self.speichern_button.grid(row=0, column=3, padx=5, sticky=(tk.W, tk.E))
         Tooltip(self.speichern_button, "Speichert das aktuell angezeigte Ergebnis manuell in der Datenbank.")
 
+        # Cache umgehen: Suche auch dann online ausführen, wenn ein frisches Ergebnis gespeichert ist
+        self.neu_suchen_button = ttk.Button(button_frame, text="Neu suchen (Ctrl+R)",
+                                            command=lambda: self.starte_suche_thread(force_refresh=True),
+                                            style='TButton')
+        self.neu_suchen_button.grid(row=0, column=4, padx=5, sticky=(tk.W, tk.E))
+        master.bind('<Control-r>', lambda event: self.starte_suche_thread(force_refresh=True))
+        Tooltip(self.neu_suchen_button, f"Ignoriert gespeicherte Ergebnisse (jünger als {CACHE_MAX_AGE_DAYS} Tage) "
+                                        "und sucht erneut online.")
+
 
         # 3. Ausgabe-Bereich
         ttk.Label(main_frame, text="KI-Erkenntnis:", font=('Arial', 14, 'bold')).grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(15, 5))
@@ -726,8 +1255,8 @@ class WissensKI_GUI:
             messagebox.showinfo("Status", "Derzeit läuft keine Suche.")
 
 
-    def starte_suche_thread(self, event=None):
-        """Startet die Websuche in einem separaten Thread."""
+    def starte_suche_thread(self, event=None, force_refresh=False):
+        """Startet die Websuche in einem separaten Thread (force_refresh: Cache nicht verwenden)."""
         anfrage = self.anfrage_entry.get()
         if not anfrage or self.search_running:
             return
@@ -738,6 +1267,7 @@ class WissensKI_GUI:
 
         # GUI-Elemente aktualisieren
         self.suchen_button.config(state='disabled')
+        self.neu_suchen_button.config(state='disabled')
         self.speichern_button.config(state='disabled')
         self.verlauf_button.config(state='disabled')
         self.abbrechen_button.config(state='normal')
@@ -747,11 +1277,13 @@ class WissensKI_GUI:
         self.ausgabe_text.insert(tk.END, f"Suche, analysiere, **übersetze** und speichere... (2 DDGS-Versuche, dann **robuster Whitelist-Vergleich** mit verbesserter Anti-Detection-Logik. Max. {MAX_CHARS} Zeichen).")
         self.ausgabe_text.config(state='disabled')
 
-        threading.Thread(target=self.fuehre_suche_aus, args=(anfrage, "Allgemeine Suche", self.stop_search_flag,), daemon=True).start()
+        threading.Thread(target=self.fuehre_suche_aus,
+                         args=(anfrage, "Allgemeine Suche", self.stop_search_flag, force_refresh),
+                         daemon=True).start()
 
-    def fuehre_suche_aus(self, anfrage, quelle, stop_search_flag):
+    def fuehre_suche_aus(self, anfrage, quelle, stop_search_flag, force_refresh=False):
         """Ruft die Backend-Logik auf."""
-        ergebnis = ki_wissensabruf_und_vergleich(anfrage, quelle, stop_search_flag)
+        ergebnis = ki_wissensabruf_und_vergleich(anfrage, quelle, stop_search_flag, force_refresh)
         self.master.after(0, self.aktualisiere_ausgabe, ergebnis, anfrage)
 
     def aktualisiere_ausgabe(self, ergebnis, anfrage):
@@ -766,10 +1298,13 @@ class WissensKI_GUI:
 
         # GUI-Elemente zurücksetzen
         self.suchen_button.config(state='normal')
+        self.neu_suchen_button.config(state='normal')
         self.abbrechen_button.config(state='disabled')
         self.verlauf_button.config(state='normal')
 
-        if not ergebnis.startswith("Keine Online-Dokumente") and not ergebnis.startswith("Suche wurde"):
+        # Ergebnisse aus dem Cache sind bereits gespeichert
+        if (not ergebnis.startswith("Keine Online-Dokumente") and not ergebnis.startswith("Suche wurde")
+                and not ergebnis.startswith("Suche durch den Benutzer") and not ergebnis.startswith(CACHE_HINT_PREFIX)):
             self.speichern_button.config(state='normal')
         else:
             self.speichern_button.config(state='disabled')
@@ -779,5 +1314,14 @@ class WissensKI_GUI:
 
 if __name__ == "__main__":
     root = tk.Tk()
+    startup_report.mark("Tk-Root")
     app = WissensKI_GUI(root)
+    startup_report.mark("Hauptfenster aufgebaut")
+    threading.Thread(target=preload_modules, name="preload", daemon=True).start()
+
+    def _first_paint():
+        startup_report.mark("Fenster sichtbar")
+        startup_report.report("Startzeit-Bericht KI.M8")
+    if startup_report.enabled():
+        root.after_idle(_first_paint)
     root.mainloop()
\ No newline at end of file
@@ -21,8 +21,9 @@
 #
 # 1. Tkinter (Standard in den meisten Python-Distributionen)
 # 2. SQLite3 (Standard in Python)
-# 3. Googletrans (Optional für Online-Übersetzung)
+# 3. Googletrans und/oder deep-translator (Optional für Online-Übersetzung)
 # 4. pyttsx3 (Optional für TTS)
+# Ohne Netzwerk: Offline-Wörterbücher in ./woerterbuecher (siehe offline_dict.py)
 #
 # Installation für Online-Übersetzung:
 # pip install googletrans==4.0.0rc1
@@ -35,102 +36,144 @@
 ##########
 ########
 ############
+import sys
+# Startzeit-Bericht (--startup-report[=datei.json]) vor allen übrigen Imports aktivieren
+import startup_report
+_report, _report_file = startup_report.requested()
+if _report:
+    startup_report.enable(_report_file)
+
 import tkinter as tk
-from tkinter import ttk, messagebox
-import random
+from tkinter import ttk, messagebox, filedialog
 import sqlite3
 import os
 import threading
-import sys
-# import time # Wird nicht direkt benötigt, da tk.after verwendet wird
+import time
+import bisect
+from vocab_db import VocabRepository, PairIndex, LANGUAGES, LANG_CODES
+from review_scheduler import ReviewScheduler, QUALITY_CORRECT, QUALITY_WRONG
+# googletrans/deep_translator und pyttsx3 werden erst bei der ersten Nutzung
+# im jeweiligen Worker-Thread importiert, vocab_import erst beim Import.
+from translation import TranslationWorkerPool, FallbackChain, TranslationCache, default_chain
+
+from tts_service import TTSService, AudioCache, TTS_AVAILABLE
+# Laufzeit-Messung (--perf bzw. F12 im Programm); ausgeschaltet ohne Overhead
+import perf_monitor
+# Optionaler Export der Messwerte in eine Datei (--metrics[=datei])
+import metrics_sink
+startup_report.mark("Imports")
 
 ##################
-#--- WICHTIG: NEUE TTS IMPORTZEILE
-try:
-    import pyttsx3
-    # Engine wird nur noch im Thread initialisiert.
-    TTS_ENGINE = None
-    REAL_TTS_ENABLED = True
-except ImportError:
-    # KORREKTUR: String auf eine Zeile gebracht
-    print("Warnung: pyttsx3 ist nicht installiert. Echte TTS ist deaktiviert. Bitte 'pip install pyttsx3' ausführen.")
-    REAL_TTS_ENABLED = False
-except Exception as e:
-    # Fängt Fehler bei der Initialisierung ab (z.B. fehlende Audio-Treiber)
-    print(f"Warnung: Fehler beim Importieren von pyttsx3: {e}. Echte TTS ist deaktiviert.")
-    REAL_TTS_ENABLED = False
-#--- GOOGLETRANS IMPORT
-try:
-    from googletrans import Translator
-    translator = Translator()
-    ONLINE_TRANSLATION_ENABLED = True
-except ImportError:
-    # KORREKTUR: String auf eine Zeile gebracht
-    print("Warnung: Die 'googletrans' Bibliothek wurde nicht gefunden. Online-Übersetzung ist deaktiviert.")
-    ONLINE_TRANSLATION_ENABLED = False
-except Exception as e:
-    print(f"Warnung: Konnte den Online-Translator nicht initialisieren: {e}. Online-Übersetzung ist deaktiviert.")
-    ONLINE_TRANSLATION_ENABLED = False
+#--- TTS: ein langlebiger Dienst (tts_service.py) statt pyttsx3.init() pro Klick
+REAL_TTS_ENABLED = TTS_AVAILABLE
+# Anzahl der nächsten fälligen Karten, deren Aussprache vorab gerendert wird
+PREWARM_CARDS = 5
 #--- 1. GLOBALE KONSTANTEN UND DATENBANK-SETUP
 DB_NAME = "vokabeln.db"
-# Sprachenliste für Comboboxen
-LANGUAGES = ["Deutsch", "Englisch", "Französisch", "Italienisch", "Spanisch"]
-# Map für Googletrans Codes
-LANG_CODES = {
-    "Englisch": "en", "Deutsch": "de", "Italienisch": "it",
-    "Spanisch": "es", "Französisch": "fr"
-}
+# Gemeinsames Repository (eine langlebige Verbindung pro Thread statt connect-per-call)
+repo = VocabRepository(DB_NAME)
+#--- ÜBERSETZUNGSDIENSTE (Offline-Wörterbuch, googletrans, deep_translator)
+# Reihenfolge über PROVIDER_ORDER in translation.py bzw. SPT_TRANSLATION_PROVIDERS
+# Ergebnisse und Fehlschläge der Dienste werden in translation_cache gemerkt (TTL + Sperrzeit)
+translation_chain = default_chain(cache=TranslationCache(repo))
+ONLINE_TRANSLATION_ENABLED = translation_chain.available()
+if not ONLINE_TRANSLATION_ENABLED:
+    print("Warnung: Kein Übersetzungsdienst verfügbar (googletrans/deep_translator fehlen, kein Offline-Wörterbuch). "
+          "Übersetzung ist deaktiviert.")
+# In-Memory-Index der Vokabeln je Sprachpaar (wird einmalig beim Start in run_startup aufgebaut)
+word_index = PairIndex()
+# Wiederholungsplan (SM-2, Fälligkeits-Heap je Sprachpaar)
+scheduler = ReviewScheduler(word_index)
+# Sprachenliste (LANGUAGES) und Googletrans-Codes (LANG_CODES) kommen aus vocab_db
+
+# Tabelle für Vokabeln (Wort, Quellsprache, Zielsprache, Übersetzung)
+# Initialdaten werden nur eingefügt, falls die Datenbank leer ist
+INITIAL_DATA = [
+    ("apple", "Englisch", "Deutsch", "Apfel"),
+    ("house", "Englisch", "Deutsch", "Haus"),
+    ("water", "Englisch", "Deutsch", "Wasser"),
+    ("to walk", "Englisch", "Deutsch", "gehen"),
+    ("beautiful", "Englisch", "Deutsch", "schön"),
+    ("dog", "Englisch", "Deutsch", "Hund"),
+    ("cat", "Englisch", "Deutsch", "Katze"),
+    ("apple", "Englisch", "Italienisch", "mela"),
+    ("house", "Englisch", "Spanisch", "casa"),
+    ("to walk", "Englisch", "Französisch", "marcher"),
+    ("Apfel", "Deutsch", "Englisch", "apple"),
+    ("Käse", "Deutsch", "Englisch", "cheese"),
+    ("schlafen", "Deutsch", "Englisch", "to sleep"),
+    ("Garten", "Deutsch", "Französisch", "jardin"),
+    ("caminare", "Italienisch", "Deutsch", "gehen"),
+    ("le chat", "Französisch", "Englisch", "the cat"),
+]
+# Sprachpaar beim Start (sein Fälligkeits-Heap wird schon während des Splash aufgebaut)
+DEFAULT_SOURCE_LANG = "Englisch"
+DEFAULT_TARGET_LANG = "Deutsch"
+
+#--- STARTVORGANG (läuft im Hintergrund, während der Splash Screen sichtbar ist)
+def _warm_up_tts():
+    # Nur das Modul laden – die Engine selbst entsteht im TTS-Worker (thread-gebunden)
+    if REAL_TTS_ENABLED:
+        import pyttsx3  # noqa: F401
+
+STARTUP_STEPS = [
+    ("Datenbank öffnen und migrieren", lambda: repo.initialize(INITIAL_DATA)),
+    ("Vokabel-Index aufbauen", lambda: word_index.build(repo.fetch_index_rows())),
+    ("Lernstand laden", lambda: scheduler.load(repo.fetch_progress())),
+    ("Übersetzer vorbereiten", lambda: translation_chain.warm_up()),
+    ("Sprachausgabe vorbereiten", _warm_up_tts),
+    ("Vokabeln vorladen", lambda: scheduler.preload(DEFAULT_SOURCE_LANG, DEFAULT_TARGET_LANG)),
+]
+startup_done = False
+
+def run_startup(progress=None):
+    """Führt alle Startschritte aus. progress(index, anzahl, name) wird vor jedem Schritt aufgerufen."""
+    global startup_done
+    for i, (name, step) in enumerate(STARTUP_STEPS):
+        if progress:
+            progress(i, len(STARTUP_STEPS), name)
+        start = time.perf_counter()
+        step()
+        startup_report.mark(name)
+        if perf_monitor.enabled():
+            perf_monitor.record(f"Start {name}", time.perf_counter() - start)
+    startup_done = True
 
 def initialize_db():
-    """Erstellt die SQLite-Datenbank und die Vokabeltabelle."""
+    """Erstellt die SQLite-Datenbank und lädt Index und Lernstand (falls der Splash das nicht schon erledigt hat)."""
+    if startup_done:
+        return True
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        # Tabelle für Vokabeln (Wort, Quellsprache, Zielsprache, Übersetzung)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS vocabulary (
-                id INTEGER PRIMARY KEY,
-                source_word TEXT NOT NULL,
-                source_lang TEXT NOT NULL,
-                target_lang TEXT NOT NULL,
-                target_word TEXT NOT NULL,
-                source TEXT NOT NULL,
-                UNIQUE (source_word, source_lang, target_lang)
-            )
-        """)
-        conn.commit()
-        # Initialdaten einfügen, falls die Datenbank leer ist
-        if not cursor.execute("SELECT 1 FROM vocabulary LIMIT 1").fetchone():
-            initial_data = [
-                ("apple", "Englisch", "Deutsch", "Apfel"),
-                ("house", "Englisch", "Deutsch", "Haus"),
-                ("water", "Englisch", "Deutsch", "Wasser"),
-                ("to walk", "Englisch", "Deutsch", "gehen"),
-                ("beautiful", "Englisch", "Deutsch", "schön"),
-                ("dog", "Englisch", "Deutsch", "Hund"),
-                ("cat", "Englisch", "Deutsch", "Katze"),
-                ("apple", "Englisch", "Italienisch", "mela"),
-                ("house", "Englisch", "Spanisch", "casa"),
-                ("to walk", "Englisch", "Französisch", "marcher"),
-                ("Apfel", "Deutsch", "Englisch", "apple"),
-                ("Käse", "Deutsch", "Englisch", "cheese"),
-                ("schlafen", "Deutsch", "Englisch", "to sleep"),
-                ("Garten", "Deutsch", "Französisch", "jardin"),
-                ("caminare", "Italienisch", "Deutsch", "gehen"),
-                ("le chat", "Französisch", "Englisch", "the cat"),
-            ]
-            for word, src_lang, trg_lang, trg_word in initial_data:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO vocabulary (source_word, source_lang, target_lang,
-                    target_word, source)
-                    VALUES (?, ?, ?, ?, 'DB')
-                """, (word.lower(), src_lang, trg_lang, trg_word.lower()))
-            conn.commit()
-        conn.close()
+        run_startup()
         return True
     except Exception as e:
         messagebox.showerror("Datenbankfehler", f"Konnte die SQLite-Datenbank nicht initialisieren: {e}")
         return False
+
+def register_vocab(vocab_id, src_lang, word, trg_lang, trg_word):
+    """Nimmt eine neue oder geänderte Vokabel in Index und Wiederholungsplan auf."""
+    word_index.add(vocab_id, src_lang, word, trg_lang, trg_word)
+    scheduler.add(vocab_id, src_lang, trg_lang)
+
+def unregister_vocab(vocab_id):
+    """Entfernt eine gelöschte Vokabel aus Index und Wiederholungsplan."""
+    word_index.remove(vocab_id)
+    scheduler.remove(vocab_id)
+
+def use_database(db_name):
+    """Bindet Repository, Übersetzungs-Cache, Index und Wiederholungsplan an eine andere Datenbank
+    (vor run_startup, z.B. im Benchmark). Die Datenbank im Arbeitsverzeichnis wird nicht geöffnet."""
+    global repo, word_index, scheduler, startup_done
+    repo = VocabRepository(db_name)
+    translation_chain.cache = TranslationCache(repo)
+    word_index = PairIndex()
+    scheduler = ReviewScheduler(word_index)
+    startup_done = False
+
+def reload_vocab_state(index_rows, progress_rows):
+    """Baut Index und Wiederholungsplan nach einem Massen-Import neu auf (GUI-Thread)."""
+    word_index.build(index_rows)
+    scheduler.load(progress_rows)
 #--- 2. HILFSKLASSE (Tooltip)
 class Tooltip:
     """Erstellt einen Tooltip für ein Tkinter-Widget.
@@ -174,10 +217,88 @@ class Tooltip:
         if self.tw:
             self.tw.destroy()
             self.tw = None
+#--- HILFSKLASSE: Laufzeit-Anzeige (F12)
+class PerfOverlay:
+    """Fenster mit p50/p95/p99 je Messpunkt (perf_monitor), aktualisiert sich jede Sekunde."""
+    REFRESH_MS = 1000
+    COLUMNS = ("Messpunkt", "Anzahl", "Ø ms", "p50 ms", "p95 ms", "p99 ms", "max ms")
+
+    def __init__(self, master):
+        self.window = tk.Toplevel(master)
+        self.window.title("Laufzeit-Messung")
+        self.window.attributes('-topmost', True)
+        self.window.geometry("820x360")
+        self.tree = ttk.Treeview(self.window, columns=self.COLUMNS, show='headings')
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=300 if col == "Messpunkt" else 80,
+                             anchor=tk.W if col == "Messpunkt" else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
+        self.measure_button = ttk.Button(button_frame, command=self.toggle_measuring)
+        self.measure_button.pack(side=tk.LEFT, padx=5)
+        self.profile_button = ttk.Button(button_frame, command=self.toggle_profiler)
+        self.profile_button.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Zurücksetzen", command=perf_monitor.reset).pack(side=tk.LEFT, padx=5)
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+        self.window.bind('<F12>', lambda e: self.close())
+        self.window.bind('<Escape>', lambda e: self.close())
+        self.refresh()
+
+    def exists(self):
+        return self.window.winfo_exists()
+
+    def close(self):
+        self.window.destroy()
+
+    def toggle_measuring(self):
+        if perf_monitor.enabled():
+            perf_monitor.disable()
+        else:
+            perf_monitor.enable()
+        self.refresh(schedule=False)
+
+    def toggle_profiler(self):
+        if perf_monitor.profiling():
+            path = perf_monitor.stop_profile()
+            self.status_label.config(text=f"Profil gespeichert: {path}")
+        else:
+            perf_monitor.start_profile()
+            self.status_label.config(text="cProfile läuft (GUI-Thread) ...")
+        self.refresh(schedule=False)
+
+    def refresh(self, schedule=True):
+        if not self.exists():
+            return
+        self.measure_button.config(text="Messung aus" if perf_monitor.enabled() else "Messung ein")
+        self.profile_button.config(text="Profiler stoppen (Shift+F12)" if perf_monitor.profiling()
+                                   else "Profiler starten (Shift+F12)")
+        self.tree.delete(*self.tree.get_children())
+        rows = perf_monitor.snapshot()
+        if not rows and not perf_monitor.enabled():
+            self.tree.insert("", tk.END, values=("Messung ist aus – 'Messung ein' klicken oder mit --perf starten",))
+        for name, count, mean, p50, p95, p99, maximum in rows:
+            self.tree.insert("", tk.END, values=(name, count, f"{mean:.2f}", f"{p50:.2f}", f"{p95:.2f}",
+                                                 f"{p99:.2f}", f"{maximum:.2f}"))
+        if schedule:
+            self.window.after(self.REFRESH_MS, self.refresh)
 #--- NEUE KLASSE: Vokabel-Manager ---
 class VocabManager:
+    # Anzahl der Zeilen, die pro Seite (beim Scrollen) nachgeladen werden
+    PAGE_SIZE = 500
+    # Nachladen, sobald das sichtbare Ende diesen Anteil der Liste erreicht
+    PREFETCH_THRESHOLD = 0.9
+
     def __init__(self, master):
         self.master = master
+        # Zustand der Keyset-Pagination: sortierte Schlüssel der geladenen Zeilen
+        # (source_lang, source_word, target_lang) in Treeview-Reihenfolge und ID -> Schlüssel
+        self.loaded_keys = []
+        self.key_of = {}
+        self.all_loaded = False
+        self.page_pending = False
         self.master.geometry("900x600")
         self.master.title("Vokabel-Manager")
         #--- Frames
@@ -207,10 +328,10 @@ class VocabManager:
         self.tree.column('target_lang', width=100, anchor =tk.W)
         self.tree.heading('target_word', text='Wort (Ziel)')
         self.tree.column('target_word', width =200, anchor =tk.W)
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Scrollbar (lädt beim Scrollen weitere Seiten nach)
+        self.scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscroll=self.on_tree_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.tree.bind('<<TreeviewSelect>>', self.on_vocab_select)
         #--- Bearbeitungsfelder ---
@@ -267,14 +388,22 @@ class VocabManager:
                                         command=self.delete_selected_vocab)
         self.delete_button.pack(side=tk.LEFT, padx=5)
 
-        self.refresh_button = ttk.Button(button_frame, text="Aktualisieren", command=self.load_vocab)
+        self.refresh_button = ttk.Button(button_frame, text="Aktualisieren", command=lambda: self.load_vocab())
         self.refresh_button.pack(side=tk.LEFT, padx=5)
 
+        # NEU: Massen-Import (CSV/TSV/JSON-Lines/Anki)
+        self.import_button = ttk.Button(button_frame, text="Importieren...", command=self.import_vocab)
+        self.import_button.pack(side=tk.LEFT, padx=5)
+
         self.clear_button = ttk.Button(button_frame, text="Felder leeren", command=self.clear_fields)
         self.clear_button.pack(side=tk.LEFT, padx=15) # Etwas Abstand
 
         self.close_button = ttk.Button(button_frame, text="Schließen", command=self.master.destroy)
         self.close_button.pack(side=tk.RIGHT, padx=5)
+
+        # Anzeige: geladene / gesamte Vokabeln
+        self.count_label = ttk.Label(button_frame, text="")
+        self.count_label.pack(side=tk.RIGHT, padx=15)
         # Initiale Daten laden und Hotkeys
         self.load_vocab()
         self.bind_hotkeys()
@@ -284,21 +413,120 @@ class VocabManager:
         self.master.bind('<Delete>', self.delete_selected_vocab)
 
     def load_vocab(self):
-        #Treeview leeren
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        """Lädt die Liste neu – zunächst nur die erste Seite, der Rest folgt beim Scrollen."""
+        #Treeview leeren (ein einziger Aufruf statt Zeile für Zeile)
+        self.tree.delete(*self.tree.get_children())
+        self.loaded_keys = []
+        self.key_of = {}
+        self.all_loaded = False
         # Felder leeren
         self.clear_fields()
+        self.load_next_page()
+
+    def load_next_page(self):
+        """Lädt die nächste Seite per Keyset-Pagination und hängt sie an."""
+        self.page_pending = False
+        if self.all_loaded:
+            return
         try:
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, source_lang, source_word, target_lang, target_word FROM vocabulary ORDER BY source_lang, source_word")
-            for row in cursor.fetchall():
-                self.tree.insert("", tk.END, values=row)
-            conn.close()
+            after_key = self.loaded_keys[-1] if self.loaded_keys else None
+            rows = repo.fetch_page(after_key, self.PAGE_SIZE)
+            for row in rows:
+                self.tree.insert("", tk.END, iid=str(row[0]), values=row)
+                self.loaded_keys.append((row[1], row[2], row[3]))
+                self.key_of[row[0]] = self.loaded_keys[-1]
+            self.all_loaded = len(rows) < self.PAGE_SIZE
+            self.update_count_label()
         except Exception as e:
             messagebox.showerror("DB Fehler", f"Konnte Vokabeln nicht laden: {e}", parent=self.master)
 
+    def on_tree_scroll(self, first, last):
+        """Aktualisiert die Scrollbar und lädt nahe dem Listenende die nächste Seite."""
+        self.scrollbar.set(first, last)
+        if not self.all_loaded and not self.page_pending and float(last) >= self.PREFETCH_THRESHOLD:
+            self.page_pending = True
+            self.master.after_idle(self.load_next_page)
+
+    def update_count_label(self):
+        """Zeigt an, wie viele der Vokabeln bereits geladen sind."""
+        try:
+            total = repo.count()
+        except Exception:
+            total = "?"
+        self.count_label.config(text=f"{len(self.loaded_keys)} von {total} Vokabeln geladen")
+
+    #--- Inkrementelle Aktualisierung (statt komplettem Neuladen)
+    def _insert_row(self, row):
+        """Fügt eine Zeile an der sortierten Position ein, sofern sie im geladenen Bereich liegt."""
+        key = (row[1], row[2], row[3])
+        pos = bisect.bisect_left(self.loaded_keys, key)
+        # Liegt der Schlüssel hinter der letzten geladenen Seite, kommt er beim Scrollen
+        if pos == len(self.loaded_keys) and not self.all_loaded:
+            return
+        self.tree.insert("", pos, iid=str(row[0]), values=row)
+        self.loaded_keys.insert(pos, key)
+        self.key_of[row[0]] = key
+
+    def _remove_row(self, vocab_id):
+        """Entfernt eine Zeile aus Treeview und Schlüssel-Liste."""
+        key = self.key_of.pop(int(vocab_id), None)
+        if key is None:
+            return
+        del self.loaded_keys[bisect.bisect_left(self.loaded_keys, key)]
+        self.tree.delete(str(vocab_id))
+
+    def import_vocab(self):
+        """Importiert eine Vokabeldatei in einem Hintergrund-Thread (die GUI bleibt bedienbar)."""
+        path = filedialog.askopenfilename(
+            parent=self.master, title="Vokabeln importieren",
+            filetypes=[("Vokabeldateien", "*.csv *.tsv *.txt *.jsonl *.apkg *.colpkg *.sptc"), ("Alle Dateien", "*.*")])
+        if not path:
+            return
+        # Die gewählten Sprachen dienen als Standard für Dateien ohne Sprachangabe (z.B. Anki-Decks)
+        default_src = self.src_lang_var.get() or None
+        default_trg = self.trg_lang_var.get() or None
+        self.import_button.config(state=tk.DISABLED)
+        # Rückmeldungen über das Hauptfenster, da der Manager vorher geschlossen werden kann
+        root = self.master.nametowidget('.')
+        threading.Thread(target=self._import_thread, args=(root, path, default_src, default_trg),
+                         daemon=True).start()
+
+    def _import_thread(self, root, path, default_src, default_trg):
+        """Führt den Import aus (Worker-Thread mit eigener DB-Verbindung)."""
+        def progress(result):
+            text = f"Import: {result.read} Zeilen gelesen, {result.inserted} neu ..."
+            root.after(0, lambda: self._set_status(text))
+        try:
+            import vocab_import
+            result = vocab_import.import_file(repo, path, default_src, default_trg, progress=progress)
+            # Daten für den Index im Worker lesen, den Aufbau übernimmt der GUI-Thread
+            index_rows = repo.fetch_index_rows()
+            progress_rows = repo.fetch_progress()
+            root.after(0, lambda: self._import_done(path, result, index_rows, progress_rows))
+        except Exception as e:
+            root.after(0, lambda error=e: self._import_failed(path, error))
+        finally:
+            repo.release()
+
+    def _set_status(self, text):
+        if self.master.winfo_exists():
+            self.count_label.config(text=text)
+
+    def _import_done(self, path, result, index_rows, progress_rows):
+        reload_vocab_state(index_rows, progress_rows)
+        if not self.master.winfo_exists():
+            return
+        self.import_button.config(state=tk.NORMAL)
+        self.load_vocab()
+        messagebox.showinfo("Import abgeschlossen", f"{os.path.basename(path)}:\n{result}", parent=self.master)
+
+    def _import_failed(self, path, error):
+        if not self.master.winfo_exists():
+            return
+        self.import_button.config(state=tk.NORMAL)
+        self.update_count_label()
+        messagebox.showerror("Import fehlgeschlagen", f"{os.path.basename(path)}: {error}", parent=self.master)
+
     def on_vocab_select(self, event=None):
         try:
             selected_item = self.tree.focus()
@@ -336,21 +564,14 @@ class VocabManager:
             return
 
         try:
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-
             # Source wird auf 'Manuell' gesetzt
-            cursor.execute("""
-                INSERT INTO vocabulary (source_word, source_lang, target_lang, target_word, source)
-                VALUES (?, ?, ?, ?, 'Manuell')
-            """, (src_word, src_lang, trg_lang, trg_word))
-
-            conn.commit()
-            conn.close()
+            vocab_id = repo.add(src_word, src_lang, trg_lang, trg_word, 'Manuell')
+            register_vocab(vocab_id, src_lang, src_word, trg_lang, trg_word)
             messagebox.showinfo("Erfolgreich", f"Vokabel '{src_word}' erfolgreich hinzugefügt.",
                                 parent=self.master)
             self.clear_fields() # Felder leeren und ID zurücksetzen
-            self.load_vocab() # Liste neu laden
+            self._insert_row((vocab_id, src_lang, src_word, trg_lang, trg_word)) # Nur die neue Zeile einfügen
+            self.update_count_label()
         except sqlite3.IntegrityError:
             messagebox.showwarning("Duplikat", "Dieses Vokabelpaar (Wort, Quellsprache, Zielsprache) existiert bereits.", parent=self.master)
         except Exception as e:
@@ -373,27 +594,14 @@ class VocabManager:
             return
 
         try:
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE vocabulary SET
-                source_lang =?,
-                source_word =?,
-                target_lang =?,
-                target_word =?
-                WHERE id =?
-            """, (
-                src_lang,
-                src_word,
-                trg_lang,
-                trg_word,
-                vocab_id
-            ))
-            conn.commit()
-            conn.close()
+            repo.update(vocab_id, src_lang, src_word, trg_lang, trg_word)
+            register_vocab(int(vocab_id), src_lang, src_word, trg_lang, trg_word)
             messagebox.showinfo("Gespeichert", "Änderung erfolgreich gespeichert.",
                                 parent=self.master)
-            self.load_vocab()
+            # Nur die geänderte Zeile neu einsortieren
+            self._remove_row(vocab_id)
+            self._insert_row((int(vocab_id), src_lang, src_word, trg_lang, trg_word))
+            self.clear_fields()
         except Exception as e:
             messagebox.showerror("DB Fehler", f"Fehler beim Speichern: {e}", parent=self.master)
 
@@ -408,12 +616,11 @@ class VocabManager:
         if not messagebox.askyesno ("Bestätigen", f"Möchten Sie die Vokabel '{vocab_word}' (ID: {vocab_id}) wirklich löschen?", parent=self.master):
             return
         try:
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM vocabulary WHERE id=?", (vocab_id,))
-            conn.commit()
-            conn.close()
-            self.load_vocab() # Liste neu laden
+            repo.delete(vocab_id)
+            unregister_vocab(vocab_id)
+            self._remove_row(vocab_id) # Nur die gelöschte Zeile entfernen
+            self.clear_fields()
+            self.update_count_label()
         except Exception as e:
             messagebox.showerror("DB Fehler", f"Fehler beim Löschen: {e}", parent=self.master)
 #--- 3. HAUPTKLASSE (Vokabeltrainer)
@@ -429,10 +636,20 @@ class VocabularyTrainer:
             master.quit()
             return
         # Zustand
-        self.current_source_lang = "Englisch"
-        self.current_target_lang = "Deutsch"
+        self.current_source_lang = DEFAULT_SOURCE_LANG
+        self.current_target_lang = DEFAULT_TARGET_LANG
         self.current_word = None
         self.current_solution = ""
+        # ID der aktuellen Karte und ob sie bereits bewertet wurde (Spaced Repetition)
+        self.current_id = None
+        self.current_answered = False
+        # Online-Abfragen laufen im Hintergrund, Ergebnisse kommen über master.after zurück
+        self.translation_pool = TranslationWorkerPool(self.lookup_online,
+                                                      lambda fn: self.master.after(0, fn))
+        # Ein TTS-Worker mit einer Engine für die gesamte Laufzeit, Aussprachen im Audio-Cache
+        self.tts_service = TTSService(lambda fn: self.master.after(0, fn), cache=AudioCache())
+        if REAL_TTS_ENABLED:
+            self.tts_service.warm_up()
         # UI Setup
         self.create_widgets()
 
@@ -453,46 +670,25 @@ class VocabularyTrainer:
         # Hotkey für Beenden/Fullscreen umschalten
         self.master.bind('<Control-Key-q>', lambda e: self.on_closing())
         self.master.bind('<F11>', self.toggle_fullscreen)
+        # Laufzeit-Messung anzeigen / cProfile ein- und ausschalten
+        self.perf_overlay = None
+        self.master.bind('<F12>', self.toggle_perf_overlay)
+        self.master.bind('<Shift-F12>', self.toggle_profiler)
         # Behandelt das Schließen des Fensters
         self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.answer_entry.focus()
 
     # --- 4. TTS LOGIK (Als korrekte Instanzmethoden) ---
-    def _tts_thread(self, solution, lang_code):
-        """
-        Interne Methode, die in einem separaten Thread ausgeführt wird.
-        Die Engine wird *innerhalb des Threads initialisiert und gestoppt.
-        """
-        engine = None
-        try:
-            # Engine nur HIER initialisieren
-            engine = pyttsx3.init()
-            engine.setProperty('rate', 150)
-            #1. Stimmen-Setup
-            voices = engine.getProperty('voices')
-            if lang_code:
-                for voice in voices:
-                    # Sucht nach dem Sprachcode in der ID/Namens-Zeichenkette
-                    if lang_code in voice.id.lower() or lang_code in voice.name.lower():
-                        engine.setProperty('voice', voice.id)
-                        break
-            # 2. TTS ausführen (blockiert nur diesen Thread)
-            engine.say(solution)
-            engine.runAndWait()
-        except Exception as e:
-            # Fehler im Thread abfangen und auf der GUI anzeigen
-            self.master.after(0,
-                              lambda: messagebox.showerror("TTS Fehler", f"Konnte das Wort nicht aussprechen: {e}"))
-            print(f"Fehler im TTS-Thread: {e}")
-        finally:
-            #3. Engine sofort stoppen/beenden (wichtig für die Freigabe der Ressourcen)
-            if engine:
-                engine.stop()
-            #4. Button im Haupt-GUI-Thread wieder aktivieren
-            self.master.after(0, lambda: self.tts_button.config(state=tk.NORMAL))
+    def _tts_done(self, job, error):
+        """Completion-Callback des TTSService (läuft im GUI-Thread)."""
+        if error is not None:
+            messagebox.showerror("TTS Fehler", f"Konnte das Wort nicht aussprechen: {error}")
+        # Button nur freigeben, wenn der Auftrag noch zur angezeigten Karte gehört
+        if not job.cancelled and job.text == self.current_solution.capitalize():
+            self.tts_button.config(state=tk.NORMAL)
 
     def speak_solution(self):
-        """Gibt die Lösung in einem separaten Thread aus."""
+        """Gibt die Lösung über den TTS-Dienst (eigener Worker-Thread) aus."""
         if not self.current_solution:
             return
         if not REAL_TTS_ENABLED:
@@ -503,10 +699,8 @@ class VocabularyTrainer:
         self.tts_button.config(state=tk.DISABLED)
         # Bestimme den Sprachcode. **Wichtig:** Wir wollen die Zielsprache sprechen.
         lang_code = LANG_CODES.get(self.current_target_lang)
-        # Starte die Sprachausgabe in einem separaten Thread. `self` wird automatisch übergeben.
-        tts_thread = threading.Thread(target=self._tts_thread, args=(self.current_solution.capitalize(), lang_code))
-        tts_thread.daemon = True # Wichtig: Thread beenden, wenn Hauptprogramm beendet
-        tts_thread.start()
+        # Neuer Auftrag bricht eine evtl. noch laufende ältere Ausgabe ab
+        self.tts_service.speak(self.current_solution.capitalize(), lang_code, self._tts_done)
 
     def toggle_fullscreen(self, event=None):
         """Schaltet den Fullscreen-Modus um."""
@@ -520,8 +714,37 @@ class VocabularyTrainer:
             # auf False
             # damit der Fullscreen-Toggle funktioniert.
             self.master.overrideredirect(False)
+    def toggle_perf_overlay(self, event=None):
+        """Öffnet bzw. schließt die Laufzeit-Anzeige (F12)."""
+        if self.perf_overlay and self.perf_overlay.exists():
+            self.perf_overlay.close()
+            self.perf_overlay = None
+        else:
+            self.perf_overlay = PerfOverlay(self.master)
+
+    def toggle_profiler(self, event=None):
+        """Startet bzw. stoppt cProfile (Shift+F12); beim Stoppen wird eine .prof-Datei geschrieben."""
+        if perf_monitor.profiling():
+            perf_monitor.stop_profile()
+        else:
+            perf_monitor.start_profile()
+            print("cProfile gestartet (Shift+F12 stoppt und speichert das Profil).")
     def on_closing(self):
         """Beendet die Anwendung sauber."""
+        # Übersetzungs-Worker beenden und alle DB-Verbindungen (GUI- und Worker-Threads) schließen
+        if hasattr(self, 'translation_pool'):
+            self.translation_pool.shutdown()
+        if hasattr(self, 'tts_service'):
+            self.tts_service.shutdown()
+        print(translation_chain.report())
+        if perf_monitor.profiling():
+            perf_monitor.stop_profile()
+        if perf_monitor.snapshot():
+            print(perf_monitor.report())
+        if metrics:
+            metrics.close()
+        translation_chain.close()
+        repo.close()
         self.master.destroy()
         sys.exit()
     # NEUE METHODE: Vokabel-Manager öffnen
@@ -620,9 +843,12 @@ class VocabularyTrainer:
         input_manual_frame.columnconfigure(0, weight=1)
         self.manual_entry = ttk.Entry(input_manual_frame, font=('Arial', 12))
         self.manual_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
-        self.manual_entry.bind('<Return>', self.find_manual_translation)
+        # Gemessene Methoden über lambda aufrufen: so greift ein zur Laufzeit eingeschalteter
+        # perf_monitor-Wrapper (gebundene Methoden würden beim Aufbau festgehalten)
+        self.manual_entry.bind('<Return>', lambda e: self.find_manual_translation(e))
+        self.manual_entry.bind('<Escape>', self.cancel_manual_lookups)
         self.manual_button = ttk.Button(input_manual_frame, text="Übersetzung finden (Enter)",
-                                        command=self.find_manual_translation,
+                                        command=lambda: self.find_manual_translation(),
 
                                         style='Manual.TButton')
         self.manual_button.grid(row=0, column=1)
@@ -646,9 +872,9 @@ class VocabularyTrainer:
                                                                                          column=0, sticky=tk.W, padx=5, pady=(0, 3))
         self.answer_entry = ttk.Entry(input_button_frame, font=('Arial', 14))
         self.answer_entry.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
-        self.answer_entry.bind('<Return>', self.check_answer)
+        self.answer_entry.bind('<Return>', lambda e: self.check_answer(e))
         self.check_button = ttk.Button(input_button_frame, text="Prüfen (Enter)",
-                                       command=self.check_answer, style='Accent.TButton')
+                                       command=lambda: self.check_answer(), style='Accent.TButton')
         self.check_button.grid(row=1, column=1, padx=(0, 5))
         #NEU: TTS Button
         self.tts_button = ttk.Button(input_button_frame, text="Vorlesen",
@@ -657,59 +883,37 @@ class VocabularyTrainer:
         self.result_label = ttk.Label(task_frame, text="", font=('Arial', 12, 'bold'))
         self.result_label.grid(row=2, column=0, columnspan=2, pady=(10, 5))
         self.next_button = ttk.Button(task_frame, text="Nächstes Wort (Space)",
-                                      command=self.next_word, style='Accent.TButton')
+                                      command=lambda: self.next_word(), style='Accent.TButton')
         self.next_button.grid(row=3, column=0, columnspan=2, pady=(10, 5), sticky=(tk.W, tk.E),
                               padx=5)
 
     #--- 5. LOGIK-METHODEN (Datenbank- und Online-Translator-Nutzung) ---
-    def check_db_and_get_translation(self, word, src_lang, trg_lang):
-        """Prüft die DB und nutzt bei Fehlen den Online-Translator."""
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        #1.
-        # Datenbank-Abfrage
-        cursor.execute("""
-            SELECT target_word FROM vocabulary
-            WHERE source_lang = ? AND source_word = ? AND target_lang = ?
-            
-        """, (src_lang, word, trg_lang))
-        result = cursor.fetchone()
-        if result:
-            conn.close()
-            return result[0], "DB"
-        # 2. Online-Übersetzung, falls nicht in DB
-        if ONLINE_TRANSLATION_ENABLED:
-            try:
-                if src_lang not in LANG_CODES or trg_lang not in LANG_CODES:
-                    conn.close()
-                    return None, "Sprachcode fehlt"
-
-                trans = translator.translate(word, src=LANG_CODES[src_lang], dest=LANG_CODES[trg_lang])
-
-                # Manchmal liefert Googletrans Listen zurück, nimm den Text.
-                online_translation = trans.text.strip().lower()
-
-                # Speichere die Online-Übersetzung in der Datenbank
-                cursor.execute("""
-                    INSERT OR IGNORE INTO vocabulary (source_word, source_lang, target_lang,
-                    target_word, source)
-                    VALUES (?, ?, ?, ?, ?)
-                    
-                
-                """, (word, src_lang, trg_lang, online_translation, 'Online'))
-                conn.commit()
-                conn.close()
-                return online_translation, "Online"
+    def lookup_online(self, word, src_lang, trg_lang):
+        """Übersetzt über die Provider-Kette und speichert das Ergebnis in der DB.
 
-            except Exception as e:
-                conn.close()
+        Läuft auch in den Worker-Threads des TranslationWorkerPool. Gibt
+        (Übersetzung, Quelle, neue ID oder None) zurück; Index und
+        Wiederholungsplan aktualisiert der Aufrufer im GUI-Thread.
+        """
+        if not ONLINE_TRANSLATION_ENABLED:
+            return None, "Deaktiviert", None
+        try:
+            if src_lang not in LANG_CODES or trg_lang not in LANG_CODES:
+                return None, "Sprachcode fehlt", None
+
+            translation, provider = translation_chain.resolve(word, LANG_CODES[src_lang], LANG_CODES[trg_lang])
+            if translation is None:
+                return None, "Nicht gefunden", None
+            online_translation = translation.strip().lower()
 
-                # Fehlermeldung im Console-Output und als Source-Typ zurückgeben
-                print(f"Online-Übersetzungsfehler: {e}")
-                return None, f"Fehler: {e}"
+            # Speichere die Übersetzung in der Datenbank (source = 'Online' bzw. 'Wörterbuch')
+            new_id = repo.insert_ignore(word, src_lang, trg_lang, online_translation, provider.source)
+            return online_translation, f"{provider.source}, {provider.name}", new_id
 
-        conn.close()
-        return None, "Deaktiviert"
+        except Exception as e:
+            # Fehlermeldung im Console-Output und als Source-Typ zurückgeben
+            print(f"Online-Übersetzungsfehler: {e}")
+            return None, f"Fehler: {e}", None
 
     def set_language_pair(self, source_lang, target_lang):
         """Setzt das aktuelle Sprachpaar und startet eine neue Runde."""
@@ -725,35 +929,30 @@ class VocabularyTrainer:
         self.selection_label.config(text=f"Aktuelles Paar: {self.current_source_lang} -> {self.current_target_lang}")
 
     def fetch_all_words_for_pair(self):
-        """Holt alle verfügbaren Vokabelpaare aus der Datenbank für das aktuelle Paar."""
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
+        """Holt alle verfügbaren Vokabelpaare für das aktuelle Paar (aus dem In-Memory-Index)."""
         src = self.current_source_lang
         trg = self.current_target_lang
-
-        query = """
-            SELECT source_word, target_word FROM vocabulary
-            WHERE source_lang = ? AND target_lang = ?
-            
-        """
-
-
-        possible_words = cursor.execute(query, (src, trg)).fetchall()
-
-        conn.close()
-        return possible_words
+        return word_index.words_for_pair(src, trg)
 
     def next_word(self):
-        """Wählt ein zufälliges Wort basierend auf dem aktuellen Sprachpaar."""
-        possible_words = self.fetch_all_words_for_pair()
+        """Wählt die am frühesten fällige Karte des aktuellen Sprachpaars (Spaced Repetition)."""
+        # Unbeantwortet übersprungene Karte kurz nach hinten verschieben
+        if self.current_id is not None and not self.current_answered:
+            scheduler.postpone(self.current_id)
+        # O(log n)-Entnahme aus dem Fälligkeits-Heap statt Tabellen-Scan
+        vocab_id = scheduler.next_card(self.current_source_lang, self.current_target_lang)
+        entry = word_index.get(vocab_id) if vocab_id is not None else None
+        self.current_id = vocab_id if entry else None
+        self.current_answered = False
 
         # Setzt die Buttons zurück in den normalen Akzentstil
         self.next_button.config(style='Accent.TButton')
         self.check_button.config(style='Accent.TButton')
 
         self.tts_button.config(state=tk.DISABLED) # TTS Button deaktivieren, bis die Antwort geprüft ist
+        self.tts_service.cancel() # Noch laufende Ausgabe der vorherigen Karte abbrechen
 
-        if not possible_words:
+        if not entry:
             self.word_label.config(text=f"Keine Vokabeln für {self.current_source_lang} -> {self.current_target_lang} gefunden.")
             self.result_label.config(text="Versuchen Sie, manuell ein Wort zu suchen. Es wird dann gespeichert!", foreground='black')
             self.current_word = None
@@ -761,12 +960,27 @@ class VocabularyTrainer:
             self.answer_entry.delete(0, tk.END)
             return
 
-        self.current_word, self.current_solution = random.choice(possible_words)
+        self.current_word, self.current_solution = entry[1], entry[3]
 
         self.word_label.config(text=f"Wort ({self.current_source_lang}): **{self.current_word.capitalize()}**")
         self.result_label.config(text="", foreground='black')
         self.answer_entry.delete(0, tk.END)
         self.answer_entry.focus()
+        self.prewarm_audio()
+
+    def prewarm_audio(self):
+        """Lässt die Aussprache der aktuellen und der nächsten PREWARM_CARDS Karten vorab rendern."""
+        if not REAL_TTS_ENABLED:
+            return
+        lang_code = LANG_CODES.get(self.current_target_lang)
+        ids = [self.current_id] + scheduler.upcoming(self.current_source_lang, self.current_target_lang,
+                                                     PREWARM_CARDS)
+        items = []
+        for vocab_id in ids:
+            entry = word_index.get(vocab_id) if vocab_id is not None else None
+            if entry:
+                items.append((entry[3].capitalize(), lang_code))
+        self.tts_service.prewarm(items)
 
     def check_answer(self, event=None):
         """Überprüft die eingegebene Übersetzung (Übungsteil)."""
@@ -777,7 +991,9 @@ class VocabularyTrainer:
         clean_solution = self.current_solution.lower()
 
         # Überprüfung: Case-insensitive und Whitespace-tolerant
-        if user_answer == clean_solution:
+        correct = user_answer == clean_solution
+        self.record_answer(correct)
+        if correct:
             self.result_label.config(text=f"✅Richtig! Lösung: {self.current_solution.capitalize()}",
                                      foreground='green')
             self.tts_button.config(state=tk.NORMAL) # TTS aktivieren
@@ -796,6 +1012,21 @@ class VocabularyTrainer:
             self.check_button.config(style='Manual.TButton')
             self.next_button.config(style='Accent.TButton')
 
+    def record_answer(self, correct):
+        """Protokolliert die Antwort und plant die Karte neu ein (nur die erste Antwort wird bewertet)."""
+        if self.current_id is None:
+            return
+        now = time.time()
+        try:
+            if self.current_answered:
+                repo.log_answer(self.current_id, now, correct, QUALITY_CORRECT if correct else QUALITY_WRONG)
+            else:
+                state, quality = scheduler.answer(self.current_id, correct, now)
+                repo.record_review(self.current_id, state, now, correct, quality)
+                self.current_answered = True
+        except Exception as e:
+            print(f"Warnung: Lernstand konnte nicht gespeichert werden: {e}")
+
     def find_manual_translation(self, event=None):
         """Sucht die Übersetzung und nutzt Online-Translator, wenn nötig."""
         query_word = self.manual_entry.get().strip().lower()
@@ -810,28 +1041,67 @@ class VocabularyTrainer:
         src = self.current_source_lang
         trg = self.current_target_lang
 
-        # Ruft die Logik auf, die DB und Online-Translator prüft
-        translation, source_type = self.check_db_and_get_translation(query_word, src, trg)
+        # 1. Lokale DB (schnell, direkt im GUI-Thread)
+        translation = repo.get_translation(query_word, src, trg)
+        perf_monitor.count("Übersetzung DB Treffer" if translation else "Übersetzung DB Fehlschlag")
+        if translation:
+            self.show_manual_result(query_word, src, trg, translation, "DB")
+            # Nach erfolgreicher manueller Suche, gleich zur nächsten Übung gehen
+            self.next_word()
+        elif not ONLINE_TRANSLATION_ENABLED:
+            self.show_manual_result(query_word, src, trg, None, "Deaktiviert")
+        # 2. Online-Abfrage im Hintergrund – die Übung kann währenddessen weiterlaufen
+        elif self.translation_pool.submit(query_word, src, trg, self.on_online_translation) is None:
+            self.manual_result_label.config(
+                text="❌Zu viele offene Online-Abfragen. Bitte kurz warten.", foreground='red')
+        else:
+            self.manual_result_label.config(
+                text=f"⏳'{query_word.capitalize()}' wird gesucht ... "
+                     f"({self.translation_pool.pending()} offen, Esc bricht ab)",
+                foreground='#6b7280')
+
+        self.manual_entry.delete(0, tk.END)
+        self.manual_entry.focus()
 
+    def on_online_translation(self, request, result):
+        """Callback des TranslationWorkerPool (läuft im GUI-Thread, auch für abgebrochene Anfragen)."""
+        translation, source_type, new_id = result
+        perf_monitor.count("Übersetzung online Treffer" if translation else "Übersetzung online Fehlschlag")
+        # lookup_online hat die Vokabel bereits gespeichert: Index und Plan immer nachziehen
+        if new_id:
+            register_vocab(new_id, request.src_lang, request.word, request.trg_lang, translation)
+        if request.cancelled:
+            return
+        self.show_manual_result(request.word, request.src_lang, request.trg_lang, translation, source_type)
+        # Gab es für das aktuelle Paar noch keine Vokabeln, gleich die neue abfragen
+        if (new_id and self.current_word is None
+                and (request.src_lang, request.trg_lang) == (self.current_source_lang, self.current_target_lang)):
+            self.next_word()
+
+    def cancel_manual_lookups(self, event=None):
+        """Bricht alle laufenden Online-Abfragen ab (Esc im Suchfeld)."""
+        if self.translation_pool.pending():
+            self.translation_pool.cancel_all()
+            self.manual_result_label.config(text="Online-Abfragen abgebrochen.", foreground='black')
+
+    def show_manual_result(self, query_word, src, trg, translation, source_type):
+        """Zeigt das Ergebnis einer manuellen Abfrage an."""
+        pending = self.translation_pool.pending()
+        pending_info = f"  (⏳ {pending} weitere offen)" if pending else ""
         if translation and translation != query_word: # Vermeide Anzeige, wenn Wort sich selbst übersetzt (Fehler)
             source_info = f" (Quelle: {source_type})"
             self.manual_result_label.config(
-                text=f"✅{query_word.capitalize()} ({src}) = **{translation.capitalize()}** ({trg}){source_info}",
+                text=f"✅{query_word.capitalize()} ({src}) = **{translation.capitalize()}** ({trg}){source_info}{pending_info}",
                 foreground='#005a9c'
             )
-            # Nach erfolgreicher manueller Suche, gleich zur nächsten Übung gehen
-            self.next_word()
         else:
             if "Fehler:" in source_type:
                 error_msg = f"❌Online-Übersetzungsfehler: {source_type}"
             elif source_type == "Deaktiviert":
-                error_msg = f"❌Übersetzung nicht gefunden. Online-Übersetzung ist deaktiviert (googletrans fehlt oder Fehler)."
+                error_msg = f"❌Übersetzung nicht gefunden. Kein Übersetzungsdienst verfügbar (googletrans/deep_translator fehlen, kein Offline-Wörterbuch)."
             else:
                 error_msg = f"❌Übersetzung für '{query_word.capitalize()}' nicht gefunden oder das Wort wurde bereits übersetzt."
-            self.manual_result_label.config(text=error_msg, foreground='red')
-
-        self.manual_entry.delete(0, tk.END)
-        self.manual_entry.focus()
+            self.manual_result_label.config(text=error_msg + pending_info, foreground='red')
 
     # --- SPLASH SCREEN FUNKTIONEN (KORRIGIERT UND MIT ROBUSTEM FEHLERFANG) ---
 
@@ -851,6 +1121,10 @@ class VocabularyTrainer:
             # 3. Hauptanwendung initialisieren
             global app
             app = VocabularyTrainer(root)
+            startup_report.mark("Hauptfenster aufgebaut")
+            if startup_report.enabled():
+                root.after_idle(lambda: (startup_report.mark("Erstes Wort sichtbar"),
+                                         startup_report.report("Startzeit-Bericht SpT9")))
 
         except Exception as e:
             # WICHTIG: Sollte ein Fehler auftreten, zeigen wir ihn an und beenden dann
@@ -863,7 +1137,7 @@ class VocabularyTrainer:
 
     @staticmethod
     def show_splash_screen(root):
-        """Zeigt den Startbildschirm für 4 Sekunden im Full-Screen an (manuell)."""
+        """Zeigt den Startbildschirm im Full-Screen an, bis der Startvorgang (run_startup) fertig ist."""
 
         # 1. Hauptfenster ausblenden
         root.withdraw()
@@ -902,20 +1176,68 @@ class VocabularyTrainer:
         # Zentriere das Label innerhalb des Full-Screen-Frames
         label.grid(row=0, column=0, padx=50, pady=50, sticky='nsew')
 
-        # 5. 4 Sekunden warten und dann zum Hauptfenster wechseln
-        root.after(4000, lambda: VocabularyTrainer.transition_to_main_app(root, splash))
+        # 5. Fortschritt des Startvorgangs
+        style.configure('Splash.Status.TLabel', font=("Helvetica", 14),
+                        background="#374151", foreground="#D1D5DB")
+        progress_bar = ttk.Progressbar(splash_frame, mode='determinate', maximum=len(STARTUP_STEPS), length=400)
+        progress_bar.grid(row=1, column=0, pady=(0, 10))
+        status_label = ttk.Label(splash_frame, text="Starte ...", style='Splash.Status.TLabel')
+        status_label.grid(row=2, column=0, pady=(0, 80))
+
+        def show_progress(index, total, name):
+            if splash.winfo_exists():
+                progress_bar.config(value=index)
+                status_label.config(text=f"{name} ... ({index + 1}/{total})")
+
+        def startup_failed(error):
+            messagebox.showerror("Datenbankfehler", f"Konnte die SQLite-Datenbank nicht initialisieren: {error}")
+            root.destroy()
+            sys.exit(1)
+
+        def startup_thread():
+            try:
+                run_startup(lambda i, n, name: root.after(0, lambda: show_progress(i, n, name)))
+            except Exception as e:
+                print(f"Fehler beim Start: {e}")
+                root.after(0, lambda error=e: startup_failed(error))
+                return
+            finally:
+                # Die Verbindung dieses Threads wird danach nicht mehr gebraucht
+                repo.release()
+            # 6. Sobald alles geladen ist, zum Hauptfenster wechseln
+            root.after(0, lambda: VocabularyTrainer.transition_to_main_app(root, splash))
+
+        # Erst starten, wenn der Splash gezeichnet ist
+        root.after_idle(lambda: threading.Thread(target=startup_thread, name="startup", daemon=True).start())
+
+#--- LAUFZEIT-MESSPUNKTE (werden erst mit perf_monitor.enable() ersetzt)
+perf_monitor.register(VocabRepository, ('get_translation', 'fetch_pair', 'fetch_index_rows', 'fetch_all',
+                                        'fetch_page', 'count', 'fetch_progress', 'insert_ignore', 'insert_many',
+                                        'add', 'update', 'delete', 'log_answer', 'record_review'), "DB")
+perf_monitor.register(FallbackChain, ('_call',), "Übersetzung", name=lambda args: f"Übersetzung {args[1].name}")
+perf_monitor.register(TTSService, ('_run',), "TTS",
+                      name=lambda args: "TTS vorrendern" if args[1].prewarm else "TTS sprechen")
+perf_monitor.register(VocabularyTrainer, ('next_word', 'check_answer', 'find_manual_translation',
+                                          'show_manual_result'), "Trainer")
+perf_monitor.register(VocabManager, ('load_vocab', 'load_next_page'), "Manager")
+# Export (Klassenraum-Vergleich) setzt die Messung voraus und schaltet sie mit ein
+metrics = None
+_metrics_path = metrics_sink.requested()
+if _metrics_path:
+    metrics = metrics_sink.MetricsSink(_metrics_path)
+    perf_monitor.set_sink(metrics)
+if perf_monitor.requested() or metrics:
+    perf_monitor.enable()
 
 # --- 6. ANWENDUNG STARTEN ---
 if __name__ == "__main__":
     # Das Hauptfenster MUSS zuerst erstellt werden
     root = tk.Tk()
-
-    # Sicherstellen, dass die globale TTS_ENGINE (falls sie existiert) auf None gesetzt ist.
-    if 'TTS_ENGINE' in globals():
-        TTS_ENGINE = None
+    startup_report.mark("Tk-Root")
 
     # Starte den Splash Screen (der das Hauptfenster temporär ausblendet)
     VocabularyTrainer.show_splash_screen(root)
+    startup_report.mark("Splash aufgebaut")
 
     # Starte die Haupt-Event-Schleife
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,369 @@
+# Benchmark für den Vokabeltrainer (SpT9) – ohne Bildschirm (headless)
+#===
+#
+# Misst Startzeit und Reaktionszeiten der Trainer-Logik auf Decks
+# verschiedener Größe (Standard: 1k/10k/100k/1M Vokabeln). Die Tk-Widgets
+# werden durch einfache Attrappen ersetzt, die Methoden selbst (next_word,
+# check_answer, find_manual_translation, VocabManager.load_vocab) laufen
+# unverändert gegen eine echte SQLite-Datenbank. Der Übersetzer ist ein
+# Stub mit fester Antwort (kein Netzwerk).
+#
+# Gemessen wird:
+#  - cold_start_import       python-Prozess bis "import SpT9" fertig
+#  - cold_start_ready        python-Prozess bis run_startup() fertig (DB, Index, Heap)
+#  - next_word               nächste fällige Karte anzeigen
+#  - check_answer            Antwort prüfen und Lernstand speichern
+#  - manual_lookup_db        manuelle Suche, Treffer in der DB
+#  - manual_lookup_online    manuelle Suche über den Worker-Pool (Stub-Übersetzer)
+#  - manager_load_vocab      Vokabel-Manager: erste Seite laden
+#  - manager_next_page       Vokabel-Manager: nächste Seite beim Scrollen
+#
+# Ergebnis als JSON (ein Objekt pro Messung mit Median/p95/Mittelwert in ms),
+# damit Läufe über die Zeit verglichen werden können:
+# python benchmark_trainer.py --sizes 1000 10000 --output bench.json
+# python benchmark_trainer.py --compare bench.json
+#
+# AUTOR: Rainer Liegard
+##########
+import argparse
+import json
+import os
+import platform
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+# Wiederholungen pro Messung (Kaltstart: eigene, kleinere Zahl)
+DEFAULT_REPEAT = 200
+COLD_START_REPEAT = 3
+DECK_LANGS = ("Englisch", "Deutsch")
+DECK_BATCH = 50000
+
+
+#--- Widget-Attrappen
+class FakeWidget:
+    """Ersetzt Label/Entry/Button/Treeview: merkt sich Text und Konfiguration."""
+    def __init__(self):
+        self.text = ""
+        self.options = {}
+        self.items = {}
+
+    def config(self, **kwargs):
+        self.options.update(kwargs)
+    configure = config
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    # Entry
+    def get(self):
+        return self.text
+
+    def delete(self, *args):
+        if args and args[0] == 0:
+            self.text = ""
+        else:
+            for iid in args:
+                self.items.pop(iid, None)
+
+    def insert(self, index, value=None, iid=None, values=None, **kwargs):
+        if values is not None:
+            self.items[iid] = values
+            return iid
+        self.text += value or ""
+
+    def focus(self):
+        pass
+
+    # Treeview
+    def get_children(self, item=""):
+        return list(self.items)
+
+    def selection(self):
+        return ()
+
+    def selection_remove(self, *args):
+        pass
+
+    def set(self, *args):
+        pass
+
+
+class FakeVar:
+    def __init__(self, value=""):
+        self.value = value
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class FakeMaster:
+    """Sammelt after()-Aufrufe, die der Benchmark gezielt ausführt."""
+    def __init__(self):
+        self.pending = queue.Queue()
+
+    def after(self, ms, fn=None, *args):
+        self.pending.put(fn)
+
+    def after_idle(self, fn, *args):
+        self.pending.put(fn)
+
+    def run_next(self, timeout=5):
+        self.pending.get(timeout=timeout)()
+
+
+def make_trainer(SpT9, master):
+    """VocabularyTrainer ohne Tk-Fenster (Widgets = Attrappen)."""
+    trainer = object.__new__(SpT9.VocabularyTrainer)
+    trainer.master = master
+    for name in ('word_label', 'result_label', 'answer_entry', 'next_button', 'check_button',
+                 'tts_button', 'manual_entry', 'manual_result_label', 'selection_label'):
+        setattr(trainer, name, FakeWidget())
+    trainer.current_source_lang, trainer.current_target_lang = DECK_LANGS
+    trainer.current_word = None
+    trainer.current_solution = ""
+    trainer.current_id = None
+    trainer.current_answered = False
+    trainer.translation_pool = SpT9.TranslationWorkerPool(trainer.lookup_online, master.pending.put)
+    trainer.tts_service = SpT9.TTSService(master.pending.put)
+    return trainer
+
+
+def make_manager(SpT9, master):
+    """VocabManager ohne Tk-Fenster."""
+    manager = object.__new__(SpT9.VocabManager)
+    manager.master = master
+    manager.loaded_keys = []
+    manager.key_of = {}
+    manager.all_loaded = False
+    manager.page_pending = False
+    manager.tree = FakeWidget()
+    manager.count_label = FakeWidget()
+    manager.scrollbar = FakeWidget()
+    for name in ('id_var', 'src_lang_var', 'src_word_var', 'trg_lang_var', 'trg_word_var'):
+        setattr(manager, name, FakeVar())
+    return manager
+
+
+#--- Testdaten
+def build_deck(path, size):
+    """Erzeugt eine vokabeln.db mit size Vokabeln (Englisch -> Deutsch)."""
+    from vocab_db import VocabRepository
+    repo = VocabRepository(path)
+    try:
+        repo.initialize()
+        src, trg = DECK_LANGS
+        for start in range(0, size, DECK_BATCH):
+            repo.insert_many([(f"word{i:07d}", src, trg, f"wort{i:07d}")
+                              for i in range(start, min(size, start + DECK_BATCH))], 'Benchmark')
+    finally:
+        repo.close()
+
+
+#--- Messung
+def summarize(name, size, samples):
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        'benchmark': name,
+        'size': size,
+        'n': n,
+        'mean_ms': round(sum(samples) / n * 1000, 4),
+        'p50_ms': round(samples[n // 2] * 1000, 4),
+        'p95_ms': round(samples[min(n - 1, int(n * 0.95))] * 1000, 4),
+        'min_ms': round(samples[0] * 1000, 4),
+        'max_ms': round(samples[-1] * 1000, 4),
+    }
+
+
+def timed(fn, repeat, setup=None):
+    samples = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+COLD_START_CODE = """
+import sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, {here!r})
+import SpT9
+imported = time.perf_counter()
+SpT9.run_startup()
+ready = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'ready': ready - start}}))
+"""
+
+
+def bench_cold_start(deck_dir, size, repeat):
+    """Startet pro Durchlauf einen neuen Python-Prozess im Deck-Verzeichnis."""
+    imports, ready = [], []
+    code = COLD_START_CODE.format(here=HERE)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd=deck_dir, capture_output=True,
+                             text=True, check=True).stdout
+        total = time.perf_counter() - start
+        inner = json.loads(out.strip().splitlines()[-1])
+        # Prozessstart (Interpreter) + gemessene Zeit im Prozess
+        overhead = total - inner['ready']
+        imports.append(overhead + inner['import'])
+        ready.append(total)
+    return [summarize('cold_start_import', size, imports), summarize('cold_start_ready', size, ready)]
+
+
+def bench_interaction(SpT9, size, repeat):
+    from translation import FallbackChain, TranslationProvider
+
+    class StubProvider(TranslationProvider):
+        name = "stub"
+
+        def translate(self, text, src_code, trg_code):
+            return f"stub-{text}"
+
+    SpT9.translation_chain = FallbackChain([StubProvider()])
+    SpT9.ONLINE_TRANSLATION_ENABLED = True
+    master = FakeMaster()
+    trainer = make_trainer(SpT9, master)
+    results = []
+
+    results.append(summarize('next_word', size, timed(trainer.next_word, repeat)))
+
+    def prepare_answer(i):
+        trainer.next_word()
+        trainer.answer_entry.text = trainer.current_solution if i % 2 else "falsch"
+    results.append(summarize('check_answer', size, timed(trainer.check_answer, repeat, prepare_answer)))
+
+    def prepare_db_lookup(i):
+        trainer.manual_entry.text = f"word{(i * 7919) % size:07d}"
+    results.append(summarize('manual_lookup_db', size,
+                             timed(trainer.find_manual_translation, repeat, prepare_db_lookup)))
+
+    # Online-Suche: Einreihen, Übersetzung im Worker, Ergebnis zurück in den "GUI-Thread"
+    counter = iter(range(10 ** 9))
+
+    def online_lookup():
+        trainer.manual_entry.text = f"neu{next(counter)}-{time.time_ns()}"
+        trainer.find_manual_translation()
+        master.run_next()
+    results.append(summarize('manual_lookup_online', size, timed(online_lookup, repeat)))
+    trainer.translation_pool.shutdown()
+    return results
+
+
+def bench_manager(SpT9, size, repeat):
+    manager = make_manager(SpT9, FakeMaster())
+    results = [summarize('manager_load_vocab', size, timed(manager.load_vocab, max(10, repeat // 10)))]
+
+    def next_page():
+        if manager.all_loaded:
+            manager.load_vocab()
+        manager.load_next_page()
+    results.append(summarize('manager_next_page', size, timed(next_page, max(10, repeat // 10))))
+    return results
+
+
+def run(sizes, repeat=DEFAULT_REPEAT, cold_repeat=COLD_START_REPEAT, keep_dir=None, progress=print):
+    """Führt alle Messungen aus und gibt das Ergebnis-Dict zurück."""
+    sys.path.insert(0, HERE)
+    work_dir = keep_dir or tempfile.mkdtemp(prefix="spt_bench_")
+    results = []
+    try:
+        for size in sizes:
+            deck_dir = os.path.join(work_dir, f"deck_{size}")
+            db_path = os.path.join(deck_dir, "vokabeln.db")
+            if not os.path.exists(db_path):
+                os.makedirs(deck_dir, exist_ok=True)
+                progress(f"Erzeuge Deck mit {size} Vokabeln ...")
+                build_deck(db_path, size)
+            progress(f"[{size}] Kaltstart ...")
+            results += bench_cold_start(deck_dir, size, cold_repeat)
+
+            # Trainer-Logik im selben Prozess gegen eine Kopie des Decks
+            # (der Import selbst öffnet keine Datenbank; use_database bindet auch den Übersetzungs-Cache um)
+            import SpT9
+            run_db = os.path.join(deck_dir, "run.db")
+            shutil.copyfile(db_path, run_db)
+            SpT9.use_database(run_db)
+            SpT9.run_startup()
+            progress(f"[{size}] Interaktion ...")
+            results += bench_interaction(SpT9, size, repeat)
+            progress(f"[{size}] Vokabel-Manager ...")
+            results += bench_manager(SpT9, size, repeat)
+            SpT9.repo.close()
+            os.remove(run_db)
+    finally:
+        if keep_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'commit': _git_commit(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(old, new):
+    """Gibt die Veränderung des Medians je Messung aus."""
+    before = {(r['benchmark'], r['size']): r for r in old['results']}
+    print(f"{'Messung':<24}{'Größe':>9}{'vorher ms':>12}{'jetzt ms':>12}{'Änderung':>10}")
+    for r in new['results']:
+        key = (r['benchmark'], r['size'])
+        if key not in before:
+            continue
+        old_ms, new_ms = before[key]['p50_ms'], r['p50_ms']
+        change = (new_ms - old_ms) / old_ms * 100 if old_ms else 0.0
+        print(f"{r['benchmark']:<24}{r['size']:>9}{old_ms:>12.3f}{new_ms:>12.3f}{change:>+9.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless-Benchmark für den Vokabeltrainer (JSON-Ausgabe).")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="Deckgrößen")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Wiederholungen pro Messung")
+    parser.add_argument('--cold-repeat', type=int, default=COLD_START_REPEAT, help="Wiederholungen Kaltstart")
+    parser.add_argument('--output', help="JSON-Datei für das Ergebnis (Standard: Ausgabe auf stdout)")
+    parser.add_argument('--compare', help="Früheres Ergebnis (JSON), mit dem verglichen wird")
+    parser.add_argument('--keep-decks', help="Verzeichnis, in dem erzeugte Decks für spätere Läufe bleiben")
+    args = parser.parse_args(argv)
+
+    result = run(args.sizes, args.repeat, args.cold_repeat, args.keep_decks,
+                 progress=lambda msg: print(msg, file=sys.stderr))
+    text = json.dumps(result, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Ergebnis gespeichert: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
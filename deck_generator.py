@@ -0,0 +1,212 @@
+# Generator für synthetische Vokabel-Decks (Last- und Regressionstests)
+#===
+#
+# Erzeugt beliebig viele Zeilen für die Tabelle vocabulary, verteilt auf alle
+# Sprachpaare aus LANGUAGES, und schreibt sie über den schnellen Massen-Pfad
+# VocabRepository.bulk_load() in eine (neue) Datenbank.
+#
+# Damit die Daten realistischen Decks ähneln:
+#  - Wortlänge Zipf-verteilt (kurze Wörter häufig, lange selten)
+#  - Sprachpaare Zipf-verteilt (wenige Paare enthalten die meisten Vokabeln)
+#  - Akzente und Sonderzeichen je Sprache (é, ü, ñ, ß, ...) mit einstellbarer Rate
+#  - Einstellbare Duplikat-Rate: bereits erzeugte Wörter desselben Paars werden
+#    erneut (mit anderer Übersetzung) geliefert und vom UNIQUE-Schlüssel verworfen
+#
+# Mit gleichem --seed entsteht immer dasselbe Deck.
+#
+# Beispiel:
+# python deck_generator.py decks/1m.db --rows 1000000 --duplicate-rate 0.05
+# python deck_generator.py decks/en-de.db --rows 100000 --pairs Englisch-Deutsch
+#
+# AUTOR: Rainer Liegard
+##########
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+from vocab_db import VocabRepository, LANGUAGES
+
+# Herkunft der erzeugten Vokabeln (Spalte source)
+GENERATED_SOURCE = "Generiert"
+# Zeilen pro Transaktion beim Schreiben
+WRITE_BATCH = 50000
+# Wortlängen MIN..MAX_WORD_LENGTH, Zipf-verteilt nach Abstand zu PREFERRED_WORD_LENGTH
+MIN_WORD_LENGTH = 2
+MAX_WORD_LENGTH = 24
+PREFERRED_WORD_LENGTH = 5
+# Exponent s der Zipf-Verteilungen (Gewicht des k-ten Rangs = 1 / k^s)
+DEFAULT_ZIPF = 1.1
+DEFAULT_DUPLICATE_RATE = 0.03
+DEFAULT_ACCENT_RATE = 0.08
+# Duplikate werden aus den zuletzt erzeugten Wörtern je Paar gezogen
+DUPLICATE_WINDOW = 4096
+# Versuche je Wortlänge, bevor ein kollidierendes Wort um einen Buchstaben verlängert wird
+UNIQUE_ATTEMPTS = 3
+# Buchstaben, die je Sprache auf einmal gezogen werden
+LETTER_BLOCK = 65536
+
+# Grundalphabet und sprachtypische Sonderzeichen
+BASE_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+ACCENTS = {
+    "Deutsch": "äöüß",
+    "Englisch": "",
+    "Französisch": "éèêëàâçîïôûùœ",
+    "Italienisch": "àèéìíòóù",
+    "Spanisch": "áéíñóúü",
+}
+
+
+def zipf_weights(count, s):
+    """Kumulierte Gewichte 1/k^s für die Ränge 1..count (für random.choices)."""
+    return list(itertools.accumulate(1.0 / k ** s for k in range(1, count + 1)))
+
+
+def all_pairs(languages=LANGUAGES):
+    """Alle geordneten Sprachpaare (Quelle != Ziel)."""
+    return [(src, trg) for src in languages for trg in languages if src != trg]
+
+
+def parse_pairs(text):
+    """'Englisch-Deutsch,Deutsch-Spanisch' -> [(src, trg), ...]"""
+    pairs = []
+    for item in text.split(','):
+        src, _, trg = item.strip().partition('-')
+        if src not in LANGUAGES or trg not in LANGUAGES or src == trg:
+            raise ValueError(f"Ungültiges Sprachpaar: {item!r} (erlaubt: {', '.join(LANGUAGES)})")
+        pairs.append((src, trg))
+    return pairs
+
+
+class DeckGenerator:
+    """Erzeugt (source_word, source_lang, target_lang, target_word)-Zeilen."""
+    def __init__(self, pairs=None, zipf=DEFAULT_ZIPF, duplicate_rate=DEFAULT_DUPLICATE_RATE,
+                 accent_rate=DEFAULT_ACCENT_RATE, seed=None):
+        if not 0 <= duplicate_rate < 1:
+            raise ValueError("duplicate_rate muss zwischen 0 und 1 liegen.")
+        if not 0 <= accent_rate < 1:
+            raise ValueError("accent_rate muss zwischen 0 und 1 liegen.")
+        self.pairs = list(pairs or all_pairs())
+        self.duplicate_rate = duplicate_rate
+        self.rng = random.Random(seed)
+        # Wortlängen nach "Häufigkeitsrang": bevorzugte Länge zuerst, dann abwechselnd kürzer/länger
+        lengths = sorted(range(MIN_WORD_LENGTH, MAX_WORD_LENGTH + 1),
+                         key=lambda n: (abs(n - PREFERRED_WORD_LENGTH), n))
+        self._lengths = lengths
+        self._length_weights = zipf_weights(len(lengths), zipf)
+        # Paare nach Rang (zufällige Reihenfolge, aber reproduzierbar über seed)
+        self.rng.shuffle(self.pairs)
+        self._pair_weights = zipf_weights(len(self.pairs), zipf)
+        self._recent = {pair: [] for pair in self.pairs}
+        self._used = {pair: set() for pair in self.pairs}
+        # Je Sprache ein gewichtetes Alphabet, aus dem Buchstaben blockweise gezogen werden
+        self._alphabets = {}
+        for lang in {lang for pair in self.pairs for lang in pair}:
+            accents = ACCENTS.get(lang, "") if accent_rate else ""
+            base_share = 1.0 - accent_rate if accents else 1.0
+            weights = [base_share / len(BASE_LETTERS)] * len(BASE_LETTERS)
+            weights += [accent_rate / len(accents)] * len(accents) if accents else []
+            self._alphabets[lang] = (BASE_LETTERS + accents, list(itertools.accumulate(weights)))
+        self._letter_buffers = {}
+        self.duplicates = 0
+
+    def _word(self, lang, length):
+        """Zufälliges Wort aus dem Buchstabenvorrat der Sprache (wird blockweise nachgefüllt)."""
+        buffer, position = self._letter_buffers.get(lang, ("", 0))
+        if position + length > len(buffer):
+            alphabet, weights = self._alphabets[lang]
+            buffer = "".join(self.rng.choices(alphabet, cum_weights=weights, k=max(LETTER_BLOCK, length)))
+            position = 0
+        self._letter_buffers[lang] = (buffer, position + length)
+        return buffer[position:position + length]
+
+    def _unique_word(self, src, trg, length):
+        """Neues Quellwort (je Paar eindeutig). Bei Kollision erneut würfeln, notfalls verlängern."""
+        used = self._used[(src, trg)]
+        for attempt in itertools.count():
+            word = self._word(src, length + attempt // UNIQUE_ATTEMPTS)
+            if word not in used:
+                used.add(word)
+                return word
+
+    def rows(self, count):
+        """Liefert count Zeilen (Generator, ohne alles im Speicher zu halten)."""
+        rng = self.rng
+        while count > 0:
+            # Paare und Längen blockweise ziehen (random.choices mit k ist deutlich schneller)
+            block = min(count, LETTER_BLOCK)
+            count -= block
+            pairs = rng.choices(self.pairs, cum_weights=self._pair_weights, k=block)
+            lengths = rng.choices(self._lengths, cum_weights=self._length_weights, k=2 * block)
+            for i, (src, trg) in enumerate(pairs):
+                recent = self._recent[(src, trg)]
+                if recent and rng.random() < self.duplicate_rate:
+                    # Häufige Wörter werden häufiger doppelt importiert: Zipf über die letzten Wörter
+                    index = min(len(recent) - 1, int(rng.paretovariate(1.0)) - 1)
+                    source_word = recent[-1 - index]
+                    self.duplicates += 1
+                else:
+                    source_word = self._unique_word(src, trg, lengths[2 * i])
+                    recent.append(source_word)
+                    if len(recent) > DUPLICATE_WINDOW:
+                        del recent[:len(recent) - DUPLICATE_WINDOW]
+                yield source_word, src, trg, self._word(trg, lengths[2 * i + 1])
+
+
+def generate(db_path, count, generator=None, source=GENERATED_SOURCE, batch=WRITE_BATCH, progress=None):
+    """Schreibt count erzeugte Zeilen nach db_path. Gibt (neu eingefügt, Duplikate, Sekunden) zurück."""
+    generator = generator or DeckGenerator()
+    repo = VocabRepository(db_path)
+    start = time.perf_counter()
+    inserted = 0
+    try:
+        repo.initialize()
+        rows = generator.rows(count)
+        with repo.bulk_load():
+            done = 0
+            while done < count:
+                chunk = list(itertools.islice(rows, batch))
+                inserted += repo.insert_many(chunk, source)
+                done += len(chunk)
+                if progress:
+                    progress(done, count)
+    finally:
+        repo.close()
+    return inserted, generator.duplicates, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetische Vokabel-Decks für Lasttests erzeugen.")
+    parser.add_argument('db', help="Ziel-Datenbank (wird angelegt bzw. ergänzt)")
+    parser.add_argument('--rows', type=int, default=100000, help="Anzahl erzeugter Zeilen (inkl. Duplikate)")
+    parser.add_argument('--pairs', help="Sprachpaare, z.B. Englisch-Deutsch,Deutsch-Spanisch (Standard: alle)")
+    parser.add_argument('--zipf', type=float, default=DEFAULT_ZIPF, help="Exponent der Zipf-Verteilungen")
+    parser.add_argument('--duplicate-rate', type=float, default=DEFAULT_DUPLICATE_RATE,
+                        help="Anteil doppelter Quellwörter (0..1)")
+    parser.add_argument('--accent-rate', type=float, default=DEFAULT_ACCENT_RATE,
+                        help="Anteil akzentuierter Buchstaben (0..1)")
+    parser.add_argument('--seed', type=int, default=1, help="Startwert des Zufallsgenerators")
+    args = parser.parse_args(argv)
+
+    try:
+        pairs = parse_pairs(args.pairs) if args.pairs else None
+        generator = DeckGenerator(pairs, args.zipf, args.duplicate_rate, args.accent_rate, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    directory = os.path.dirname(os.path.abspath(args.db))
+    os.makedirs(directory, exist_ok=True)
+
+    def progress(done, total):
+        print(f"\r{done}/{total} Zeilen", end="", file=sys.stderr, flush=True)
+
+    inserted, duplicates, seconds = generate(args.db, args.rows, generator, progress=progress)
+    print(file=sys.stderr)
+    print(f"{inserted} Vokabeln eingefügt, {duplicates} Duplikate verworfen "
+          f"({seconds:.1f}s, {args.rows / seconds:.0f} Zeilen/s) -> {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# Paralleler Seitenabruf mit Höflichkeitsregeln je Host (für KI.M8)
+#===
+#
+# FetchScheduler lädt die Seiten verschiedener Hosts gleichzeitig (Thread-Pool),
+# hält aber je Host höchstens EINE Anfrage gleichzeitig und zwischen zwei
+# Anfragen an denselben Host mindestens min_interval (+ zufällig bis jitter)
+# Sekunden Abstand – auch über mehrere fetch_all()-Aufrufe hinweg.
+#
+# fetch_all() liefert die Ergebnisse in der Reihenfolge, in der sie fertig
+# werden. Wird das stop_flag (threading.Event) gesetzt oder der Generator
+# vorzeitig geschlossen (break, close()), starten keine weiteren Abrufe mehr;
+# bereits laufende Abrufe werden noch beendet, ihre Ergebnisse verworfen.
+#
+# Beispiel:
+#   scheduler = FetchScheduler(get_text_from_url, max_workers=8, min_interval=2.0)
+#   jobs = [(i, url, proxy) for i, url in enumerate(urls)]   # (Kennung, URL, weitere Argumente)
+#   for i, result in scheduler.fetch_all(jobs, stop_flag):
+#       ...
+#
+# AUTOR: Rainer Liegard
+##########
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+DEFAULT_WORKERS = 8
+# Sekunden zwischen zwei Anfragen an denselben Host (gemessen ab Ende der vorigen)
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_JITTER = 0.0
+# Wie oft wartende Threads auf Abbruch prüfen (Sekunden)
+POLL_INTERVAL = 0.1
+
+
+def host_of(url):
+    """Host (mit Port) einer URL in Kleinbuchstaben, z.B. 'de.wikipedia.org'."""
+    return urlsplit(url).netloc.lower()
+
+
+class _HostSlot:
+    """Zustand eines Hosts: Sperre für 'eine Anfrage gleichzeitig' und frühester nächster Start."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.not_before = 0.0
+
+
+class FetchScheduler:
+    """Ruft fetch(url, *args) für viele URLs parallel auf, je Host nacheinander und mit Mindestabstand."""
+    def __init__(self, fetch, max_workers=DEFAULT_WORKERS, min_interval=DEFAULT_MIN_INTERVAL,
+                 jitter=DEFAULT_JITTER):
+        self.fetch = fetch
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host):
+        with self._lock:
+            slot = self._hosts.get(host)
+            if slot is None:
+                slot = self._hosts[host] = _HostSlot()
+            return slot
+
+    def _run_host(self, host, jobs, results, cancel):
+        """Arbeitet die Aufträge eines Hosts nacheinander ab (läuft im Thread-Pool)."""
+        slot = self._slot(host)
+        for tag, url, *args in jobs:
+            # Ein anderer fetch_all()-Aufruf kann den Host gerade belegen
+            while not slot.lock.acquire(timeout=POLL_INTERVAL):
+                if cancel.is_set():
+                    return
+            try:
+                delay = slot.not_before - time.monotonic()
+                if (delay > 0 and cancel.wait(delay)) or cancel.is_set():
+                    return
+                try:
+                    results.put((tag, self.fetch(url, *args), None))
+                except Exception as e:
+                    results.put((tag, None, e))
+                slot.not_before = time.monotonic() + self.min_interval + random.uniform(0, self.jitter)
+            finally:
+                slot.lock.release()
+
+    def fetch_all(self, jobs, stop_flag=None):
+        """Generator über (Kennung, Ergebnis) in Fertigstellungs-Reihenfolge.
+        jobs: Folge von (Kennung, URL, weitere Argumente für fetch ...).
+        Eine Ausnahme aus fetch wird beim Abholen ihres Ergebnisses ausgelöst."""
+        by_host = {}
+        for job in jobs:
+            by_host.setdefault(host_of(job[1]), []).append(job)
+        if not by_host:
+            return
+        results = queue.Queue()
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(by_host)),
+                                      thread_name_prefix="fetch")
+        for host, host_jobs in by_host.items():
+            executor.submit(self._run_host, host, host_jobs, results, cancel)
+        pending = sum(len(host_jobs) for host_jobs in by_host.values())
+        try:
+            while pending:
+                if stop_flag is not None and stop_flag.is_set():
+                    return
+                try:
+                    tag, result, error = results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                pending -= 1
+                if error is not None:
+                    raise error
+                yield tag, result
+        finally:
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
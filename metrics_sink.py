@@ -0,0 +1,294 @@
+# Metrik-Export für den Vergleich mehrerer Rechner (z.B. Klassenraum)
+#===
+#
+# MetricsSink schreibt die Messwerte von perf_monitor (DB-Abfragen,
+# Übersetzungen, TTS, Tk-Callbacks, Startphasen) sowie Zähler (Treffer/
+# Fehlschläge) in eine lokale Datei – entweder kompakte JSON-Lines (.jsonl)
+# oder eine SQLite-Tabelle (.db/.sqlite). Die Werte werden gepuffert und von
+# einem Hintergrund-Thread stapelweise geschrieben (alle FLUSH_SECONDS oder
+# ab FLUSH_RECORDS Einträgen), die App wartet nie auf die Platte.
+#
+# Aktivierung (opt-in): SpT9.py --metrics[=datei] oder SPT_METRICS=datei
+# Standarddatei: metrics/<rechnername>.jsonl
+#
+# Format (ein Objekt pro Zeile, Zeit in Sekunden seit 1970, Werte in ms):
+#   {"k": "session", "s": "<id>", "ts": ..., "host": ..., "app": ..., "python": ..., "platform": ...}
+#   {"k": "t", "s": "<id>", "ts": ..., "n": "DB fetch_page", "v": 0.83}     Dauer
+#   {"k": "c", "s": "<id>", "ts": ..., "n": "Übersetzung DB Treffer", "v": 1}  Zähler
+# Zähler-Paare "<Bereich> Treffer"/"<Bereich> Fehlschlag" ergeben die Trefferquote.
+#
+# Auswertung der gesammelten Dateien aller Rechner (offline):
+# python metrics_sink.py aggregate metrics/*.jsonl metrics/*.db
+# python metrics_sink.py aggregate metrics/ --by name --json summary.json
+#
+# AUTOR: Rainer Liegard
+##########
+import argparse
+import glob
+import json
+import os
+import platform
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+
+METRICS_FLAG = "--metrics"
+METRICS_ENV = "SPT_METRICS"
+METRICS_DIR = "metrics"
+FLUSH_SECONDS = 5.0
+FLUSH_RECORDS = 500
+# Höchstzahl gepufferter Einträge (falls die Platte hängt, werden ältere verworfen)
+MAX_BUFFERED = 50000
+HIT_SUFFIX = " Treffer"
+MISS_SUFFIX = " Fehlschlag"
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+SQL_CREATE_METRICS = """
+    CREATE TABLE IF NOT EXISTS metrics (
+        ts REAL NOT NULL,
+        session TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        name TEXT NOT NULL,
+        value REAL NOT NULL
+    )
+"""
+SQL_CREATE_SESSIONS = """
+    CREATE TABLE IF NOT EXISTS metric_sessions (
+        session TEXT PRIMARY KEY,
+        ts REAL NOT NULL,
+        host TEXT NOT NULL,
+        app TEXT,
+        python TEXT,
+        platform TEXT
+    )
+"""
+SQL_INSERT_METRIC = "INSERT INTO metrics (ts, session, kind, name, value) VALUES (?, ?, ?, ?, ?)"
+SQL_INSERT_SESSION = """
+    INSERT OR REPLACE INTO metric_sessions (session, ts, host, app, python, platform) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def requested(argv=None):
+    """Prüft --metrics[=datei] bzw. SPT_METRICS. Gibt den Dateipfad oder None zurück (entfernt die Option)."""
+    argv = sys.argv if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == METRICS_FLAG or arg.startswith(METRICS_FLAG + "="):
+            del argv[i]
+            return arg.partition("=")[2] or default_path()
+    env = os.environ.get(METRICS_ENV, "")
+    if env in ("", "0"):
+        return None
+    return default_path() if env == "1" else env
+
+
+def default_path():
+    return os.path.join(METRICS_DIR, f"{socket.gethostname()}.jsonl")
+
+
+def _is_sqlite(path):
+    return path.lower().endswith(SQLITE_EXTENSIONS)
+
+
+class MetricsSink:
+    """Gepufferter Schreiber für Messwerte (thread-sicher, schreibt im eigenen Thread)."""
+    def __init__(self, path, app="SpT9"):
+        self.path = path
+        self.session = uuid.uuid4().hex[:12]
+        self.dropped = 0
+        self._buffer = deque(maxlen=MAX_BUFFERED)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._session_info = {'k': 'session', 's': self.session, 'ts': round(time.time(), 3),
+                              'host': socket.gethostname(), 'app': app,
+                              'python': platform.python_version(), 'platform': platform.platform()}
+        self._thread = threading.Thread(target=self._writer, name="metrics", daemon=True)
+        self._thread.start()
+
+    def _add(self, kind, name, value):
+        with self._lock:
+            # deque(maxlen) verwirft den ältesten Eintrag selbst
+            if len(self._buffer) == MAX_BUFFERED:
+                self.dropped += 1
+            self._buffer.append((time.time(), kind, name, value))
+            if len(self._buffer) >= FLUSH_RECORDS:
+                self._wake.set()
+
+    def timing(self, name, seconds):
+        self._add('t', name, seconds * 1000)
+
+    def count(self, name, n=1):
+        self._add('c', name, n)
+
+    def _take(self):
+        with self._lock:
+            records, self._buffer = self._buffer, deque(maxlen=MAX_BUFFERED)
+        return records
+
+    def _writer(self):
+        # Eigene Verbindung bzw. Datei nur in diesem Thread
+        conn = None
+        try:
+            if _is_sqlite(self.path):
+                conn = sqlite3.connect(self.path)
+                with conn:
+                    conn.execute(SQL_CREATE_METRICS)
+                    conn.execute(SQL_CREATE_SESSIONS)
+                    info = self._session_info
+                    conn.execute(SQL_INSERT_SESSION, (info['s'], info['ts'], info['host'], info['app'],
+                                                      info['python'], info['platform']))
+            else:
+                self._append_lines([json.dumps(self._session_info, ensure_ascii=False, separators=(',', ':'))])
+            while True:
+                self._wake.wait(FLUSH_SECONDS)
+                self._wake.clear()
+                # Erst den Zustand lesen, dann den Puffer leeren: nichts vor close() geht verloren
+                closed = self._closed
+                records = self._take()
+                if records:
+                    self._write(conn, records)
+                if closed:
+                    break
+        except Exception as e:
+            print(f"Warnung: Metriken konnten nicht geschrieben werden ({self.path}): {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _write(self, conn, records):
+        if conn is not None:
+            with conn:
+                conn.executemany(SQL_INSERT_METRIC, [(round(ts, 3), self.session, kind, name, value)
+                                                     for ts, kind, name, value in records])
+        else:
+            self._append_lines([json.dumps({'k': kind, 's': self.session, 'ts': round(ts, 3), 'n': name,
+                                            'v': round(value, 4)}, ensure_ascii=False, separators=(',', ':'))
+                                for ts, kind, name, value in records])
+
+    def _append_lines(self, lines):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+    def close(self, timeout=5):
+        """Schreibt den Rest des Puffers und beendet den Schreib-Thread."""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+
+#--- Auswertung
+def read_records(path):
+    """Liest eine Metrik-Datei (.jsonl oder SQLite). Liefert (Sessions, Einträge).
+    Sessions: {id: info}, Einträge: [(session, kind, name, value)]."""
+    sessions, records = {}, []
+    if _is_sqlite(path):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            for session, ts, host, app, python, plat in conn.execute(
+                    "SELECT session, ts, host, app, python, platform FROM metric_sessions"):
+                sessions[session] = {'host': host, 'ts': ts, 'app': app, 'python': python, 'platform': plat}
+            records = conn.execute("SELECT session, kind, name, value FROM metrics").fetchall()
+        finally:
+            conn.close()
+        return sessions, records
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue  # abgeschnittene Zeile (z.B. Absturz beim Schreiben)
+            if item.get('k') == 'session':
+                sessions[item['s']] = item
+            else:
+                records.append((item['s'], item['k'], item['n'], item['v']))
+    return sessions, records
+
+
+def _percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def aggregate(paths, by='host'):
+    """Fasst Dateien vieler Rechner zusammen. by='host' gruppiert je Rechner, by='name' nur je Messpunkt.
+    Gibt {'timings': [...], 'counters': [...], 'hit_ratios': [...]} zurück."""
+    timings, counters = {}, {}
+    for path in paths:
+        sessions, records = read_records(path)
+        for session, kind, name, value in records:
+            host = sessions.get(session, {}).get('host', '?') if by == 'host' else '*'
+            if kind == 't':
+                timings.setdefault((host, name), []).append(value)
+            elif kind == 'c':
+                counters[(host, name)] = counters.get((host, name), 0) + value
+    result = {'timings': [], 'counters': [], 'hit_ratios': []}
+    for (host, name), values in sorted(timings.items()):
+        values.sort()
+        result['timings'].append({
+            'host': host, 'name': name, 'count': len(values),
+            'mean_ms': round(sum(values) / len(values), 3), 'p50_ms': round(_percentile(values, 50), 3),
+            'p95_ms': round(_percentile(values, 95), 3), 'p99_ms': round(_percentile(values, 99), 3),
+            'max_ms': round(values[-1], 3)})
+    for (host, name), total in sorted(counters.items()):
+        result['counters'].append({'host': host, 'name': name, 'count': total})
+        if name.endswith(HIT_SUFFIX):
+            area = name[:-len(HIT_SUFFIX)]
+            misses = counters.get((host, area + MISS_SUFFIX), 0)
+            result['hit_ratios'].append({'host': host, 'name': area, 'hits': total, 'misses': misses,
+                                         'ratio': round(total / (total + misses), 4)})
+    return result
+
+
+def _expand(paths):
+    """Verzeichnisse durch die enthaltenen Metrik-Dateien ersetzen."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for ext in ('.jsonl',) + SQLITE_EXTENSIONS:
+                files.extend(sorted(glob.glob(os.path.join(path, f"*{ext}"))))
+        else:
+            files.append(path)
+    return files
+
+
+def print_summary(result):
+    print(f"{'Rechner':<18}{'Messpunkt':<42}{'Anzahl':>8}{'Ø':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for row in result['timings']:
+        print(f"{row['host'][:17]:<18}{row['name'][:41]:<42}{row['count']:>8}{row['mean_ms']:>9.2f}"
+              f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}")
+    if result['hit_ratios']:
+        print(f"\n{'Rechner':<18}{'Bereich':<42}{'Treffer':>8}{'Fehlschl.':>10}{'Quote':>8}")
+        for row in result['hit_ratios']:
+            print(f"{row['host'][:17]:<18}{row['name'][:41]:<42}{row['hits']:>8.0f}{row['misses']:>10.0f}"
+                  f"{row['ratio'] * 100:>7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Metrik-Dateien (JSON-Lines/SQLite) mehrerer Rechner auswerten.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_agg = sub.add_parser('aggregate', help="Dateien zusammenfassen (Perzentile je Rechner und Messpunkt)")
+    p_agg.add_argument('paths', nargs='+', help="Metrik-Dateien oder Verzeichnisse")
+    p_agg.add_argument('--by', choices=('host', 'name'), default='host',
+                       help="Gruppierung: je Rechner (Standard) oder nur je Messpunkt")
+    p_agg.add_argument('--json', help="Ergebnis zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+
+    files = _expand(args.paths)
+    if not files:
+        parser.error("Keine Metrik-Dateien gefunden.")
+    result = aggregate(files, args.by)
+    print_summary(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=1, ensure_ascii=False)
+        print(f"\nErgebnis gespeichert: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# Offline-Wörterbuch (memory-mapped) für Rechner ohne Netzwerk
+#===
+#
+# Ein Wörterbuch ist eine Datei pro Sprachrichtung, z.B. woerterbuecher/en-de.sptd.
+# Die Einträge liegen nach Schlüssel (UTF-8-Bytes) sortiert hinter einer
+# Offset-Tabelle. Beim Öffnen wird die Datei nur per mmap eingeblendet – es
+# wird nichts eingelesen oder geparst; eine Abfrage ist eine Binärsuche über
+# die Offset-Tabelle (O(log n), wenige Mikrosekunden). Das Betriebssystem
+# lädt nur die tatsächlich berührten Seiten.
+#
+# Aufbau .sptd:
+#   b"SPTD" + Version (1 Byte) + uint32 Anzahl Einträge n
+#   uint32 Offsets[n + 1] (relativ zum Datenbereich, letzter = Ende)
+#   Datenbereich: je Eintrag Schlüssel + b"\t" + Übersetzung (UTF-8)
+#   Alle Zahlen little-endian. Schlüssel sind klein geschrieben und getrimmt.
+#
+# Erzeugen aus einer TSV-Datei (Wort<TAB>Übersetzung, z.B. aus FreeDict-
+# oder Wiktionary-Dumps konvertiert) oder aus einer Vokabel-Datenbank:
+# python offline_dict.py build en de dict-en-de.tsv
+# python offline_dict.py build en de --from-db vokabeln.db
+# python offline_dict.py lookup en de house
+#
+# AUTOR: Rainer Liegard
+##########
+import argparse
+import csv
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import time
+
+DICT_MAGIC = b"SPTD"
+DICT_VERSION = 1
+DICT_EXT = ".sptd"
+# Standardverzeichnis der Wörterbücher (neben den Skripten)
+DICT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "woerterbuecher")
+_HEADER = struct.Struct('<4sBI')
+_OFFSET = struct.Struct('<I')
+_OFFSET_PAIR = struct.Struct('<II')
+
+
+def normalize_key(text):
+    """Schlüssel wie in der App: getrimmt und klein geschrieben."""
+    return " ".join(text.split()).lower()
+
+
+def dict_path(src_code, trg_code, directory=DICT_DIR):
+    """Pfad des Wörterbuchs für eine Sprachrichtung (z.B. en-de.sptd)."""
+    return os.path.join(directory, f"{src_code}-{trg_code}{DICT_EXT}")
+
+
+class OfflineDictionary:
+    """Ein geöffnetes .sptd-Wörterbuch (nur lesend, per mmap)."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.count = _HEADER.unpack_from(self._mm, 0)
+            if magic != DICT_MAGIC:
+                raise ValueError(f"Keine SPTD-Datei: {path}")
+            if version != DICT_VERSION:
+                raise ValueError(f"Nicht unterstützte SPTD-Version: {version}")
+        except Exception:
+            self._file.close()
+            raise
+        self._table = _HEADER.size
+        self._data = self._table + (self.count + 1) * _OFFSET.size
+        # Offsets direkt als uint32-Sicht auf das mmap (ohne struct pro Zugriff);
+        # auf big-endian-Rechnern per struct.unpack_from
+        self._offsets = None
+        if sys.byteorder == 'little':
+            self._offsets = memoryview(self._mm)[self._table:self._data].cast('I')
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, i):
+        if self._offsets is not None:
+            return self._data + self._offsets[i], self._data + self._offsets[i + 1]
+        start, end = _OFFSET_PAIR.unpack_from(self._mm, self._table + i * _OFFSET.size)
+        return self._data + start, self._data + end
+
+    def lookup(self, text):
+        """Gibt die Übersetzung zurück oder None (Binärsuche auf dem mmap)."""
+        key = normalize_key(text).encode('utf-8')
+        mm = self._mm
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = self._entry(mid)
+            tab = mm.find(b"\t", start, end)
+            entry_key = mm[start:tab]
+            if entry_key < key:
+                lo = mid + 1
+            elif entry_key > key:
+                hi = mid
+            else:
+                return mm[tab + 1:end].decode('utf-8')
+        return None
+
+    def close(self):
+        if self._offsets is not None:
+            self._offsets.release()
+            self._offsets = None
+        self._mm.close()
+        self._file.close()
+
+
+def build(entries, out_path):
+    """Schreibt ein .sptd-Wörterbuch aus (Wort, Übersetzung)-Paaren.
+    Bei mehrfachen Schlüsseln gewinnt der erste Eintrag. Gibt die Anzahl zurück.
+    """
+    table = {}
+    for word, translation in entries:
+        key, value = normalize_key(word or ""), " ".join((translation or "").split())
+        if key and value and "\t" not in key:
+            table.setdefault(key.encode('utf-8'), value.encode('utf-8'))
+    keys = sorted(table)
+    offsets, position = [], 0
+    for key in keys:
+        offsets.append(position)
+        position += len(key) + 1 + len(table[key])
+    offsets.append(position)
+    if position > 0xFFFFFFFF:
+        raise ValueError("Wörterbuch zu groß für das SPTD-Format (max. 4 GB).")
+
+    directory = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(DICT_MAGIC, DICT_VERSION, len(keys)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        for key in keys:
+            f.write(key + b"\t" + table[key])
+    # Atomar ersetzen, damit laufende Apps nie eine halbe Datei einblenden
+    os.replace(tmp_path, out_path)
+    return len(keys)
+
+
+def read_tsv(path):
+    """Liest Wort<TAB>Übersetzung (weitere Spalten und #-Kommentare werden ignoriert)."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for fields in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+            if len(fields) >= 2 and not fields[0].startswith('#'):
+                yield fields[0], fields[1]
+
+
+def read_vocabulary(db_path, src_code, trg_code):
+    """Liest die Vokabeln einer Sprachrichtung aus einer vokabeln.db."""
+    from vocab_db import LANG_CODES
+    names = {code: name for name, code in LANG_CODES.items()}
+    conn = sqlite3.connect(db_path)
+    try:
+        yield from conn.execute(
+            "SELECT source_word, target_word FROM vocabulary WHERE source_lang = ? AND target_lang = ?",
+            (names.get(src_code, src_code), names.get(trg_code, trg_code)))
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline-Wörterbücher (.sptd) erzeugen und abfragen.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_build = sub.add_parser('build', help="Wörterbuch aus TSV oder Vokabel-Datenbank erzeugen")
+    p_build.add_argument('source', help="Quellsprache als Code (z.B. en)")
+    p_build.add_argument('target', help="Zielsprache als Code (z.B. de)")
+    p_build.add_argument('tsv', nargs='*', help="TSV-Dateien (Wort<TAB>Übersetzung)")
+    p_build.add_argument('--from-db', help="Vokabeln aus dieser SQLite-Datenbank übernehmen")
+    p_build.add_argument('--dir', default=DICT_DIR, help=f"Zielverzeichnis (Standard: {DICT_DIR})")
+    p_lookup = sub.add_parser('lookup', help="Wort nachschlagen")
+    p_lookup.add_argument('source')
+    p_lookup.add_argument('target')
+    p_lookup.add_argument('words', nargs='+')
+    p_lookup.add_argument('--dir', default=DICT_DIR)
+    args = parser.parse_args(argv)
+
+    path = dict_path(args.source, args.target, args.dir)
+    if args.command == 'build':
+        if not args.tsv and not args.from_db:
+            parser.error("TSV-Datei(en) oder --from-db angeben.")
+
+        def entries():
+            for tsv in args.tsv:
+                yield from read_tsv(tsv)
+            if args.from_db:
+                yield from read_vocabulary(args.from_db, args.source, args.target)
+
+        start = time.perf_counter()
+        count = build(entries(), path)
+        print(f"{count} Einträge nach {path} geschrieben ({time.perf_counter() - start:.2f}s)")
+    else:
+        dictionary = OfflineDictionary(path)
+        try:
+            for word in args.words:
+                print(f"{word}\t{dictionary.lookup(word) or '-'}")
+        finally:
+            dictionary.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# Laufzeit-Messung (Hot-Path-Profiling) für SpT9
+#===
+#
+# Misst bei Bedarf die Dauer von DB-Abfragen, Übersetzungen, TTS-Aufträgen
+# und allen Tk-Callbacks (Buttons, Hotkeys, after()) und hält je Messpunkt
+# die letzten WINDOW Werte für p50/p95/p99 im Speicher.
+#
+# Ausgeschaltet kostet die Messung nichts: register() merkt sich nur, welche
+# Methoden gemessen werden sollen. Erst enable() ersetzt sie durch Wrapper
+# (und tkinter.CallWrapper.__call__ für die Tk-Callbacks), disable() stellt
+# die Originale wieder her. Beides geht auch zur Laufzeit (Hotkey).
+# Achtung: Eine beim Aufbau gebundene Methode (command=self.check_answer)
+# hält das Original fest und wird dann nur als Tk-Callback gemessen; gemessene
+# Methoden deshalb zur Ereigniszeit aufrufen (command=lambda: self.check_answer()).
+#
+# count(name) zählt Ereignisse (z.B. "Übersetzung DB Treffer"), solange die
+# Messung aktiv ist. Mit set_sink() gehen alle Werte zusätzlich an einen
+# MetricsSink (metrics_sink.py), der sie in eine Datei exportiert.
+#
+# Zusätzlich lässt sich cProfile ein- und ausschalten (GUI-Thread); beim
+# Ausschalten wird eine .prof-Datei geschrieben (auswertbar mit pstats/snakeviz).
+#
+# Aktivierung beim Start: --perf oder Umgebungsvariable SPT_PERF=1
+#
+# AUTOR: Rainer Liegard
+##########
+import functools
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+PERF_FLAG = "--perf"
+PERF_ENV = "SPT_PERF"
+# Anzahl der letzten Messwerte je Messpunkt (für die Perzentile)
+WINDOW = 1024
+# Verzeichnis der cProfile-Dateien
+PROFILE_DIR = "profile"
+# Zeilen der Profiler-Zusammenfassung auf der Konsole
+PROFILE_TOP = 20
+
+_registered = []   # [(Klasse, Methodennamen, Präfix, Namensfunktion)]
+_patches = []      # [(Klasse, Attribut, Original)] solange aktiv
+_metrics = {}
+_counters = {}
+_sink = None
+_lock = threading.Lock()
+_enabled = False
+_profiler = None
+
+
+def requested(argv=None):
+    """Prüft Kommandozeile/Umgebung auf --perf bzw. SPT_PERF und entfernt die Option aus argv."""
+    argv = sys.argv if argv is None else argv
+    if PERF_FLAG in argv:
+        argv.remove(PERF_FLAG)
+        return True
+    return os.environ.get(PERF_ENV, "") not in ("", "0")
+
+
+class Metric:
+    """Messwerte eines Messpunkts (thread-sicher)."""
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self._recent = deque(maxlen=WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self._recent.append(seconds)
+            if seconds > self.maximum:
+                self.maximum = seconds
+
+    def percentiles(self, *ps):
+        """Perzentile (0-100) der letzten WINDOW Werte in Sekunden."""
+        with self._lock:
+            values = sorted(self._recent)
+        if not values:
+            return [None for _ in ps]
+        return [values[min(len(values) - 1, int(len(values) * p / 100))] for p in ps]
+
+
+def record(name, seconds):
+    """Trägt einen Messwert ein (legt den Messpunkt bei Bedarf an)."""
+    metric = _metrics.get(name)
+    if metric is None:
+        with _lock:
+            metric = _metrics.setdefault(name, Metric(name))
+    metric.record(seconds)
+    if _sink is not None:
+        _sink.timing(name, seconds)
+
+
+def count(name, n=1):
+    """Zählt ein Ereignis (nur bei aktiver Messung)."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+    if _sink is not None:
+        _sink.count(name, n)
+
+
+def set_sink(sink):
+    """Leitet alle Messwerte zusätzlich an sink (timing/count) weiter; None schaltet ab."""
+    global _sink
+    _sink = sink
+
+
+def _wrap(func, name):
+    """Misst func; name ist ein fester Text oder eine Funktion der Aufruf-Argumente."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(name(args) if callable(name) else name, time.perf_counter() - start)
+    return wrapper
+
+
+def register(cls, methods, prefix, name=None):
+    """Merkt Methoden von cls zum Messen vor (wirkt erst mit enable()).
+    name(args) kann den Messpunkt je Aufruf bestimmen (z.B. nach Provider)."""
+    _registered.append((cls, tuple(methods), prefix, name))
+    if _enabled:
+        _patch(cls, methods, prefix, name)
+
+
+def _patch(cls, methods, prefix, name):
+    for method in methods:
+        original = cls.__dict__[method]
+        label = name or f"{prefix} {method}"
+        setattr(cls, method, _wrap(original, label))
+        _patches.append((cls, method, original))
+
+
+def _callback_name(func):
+    """Lesbarer Name eines Tk-Callbacks, z.B. VocabularyTrainer.check_answer."""
+    name = getattr(func, '__qualname__', None) or getattr(func, '__name__', None) or repr(func)
+    return "Tk " + name.replace(".<locals>", "")
+
+
+def _patch_tk():
+    import tkinter
+    original = tkinter.CallWrapper.__call__
+
+    def __call__(self, *args):
+        start = time.perf_counter()
+        try:
+            return original(self, *args)
+        finally:
+            record(_callback_name(self.func), time.perf_counter() - start)
+    tkinter.CallWrapper.__call__ = __call__
+    _patches.append((tkinter.CallWrapper, '__call__', original))
+
+
+def enable():
+    """Schaltet die Messung ein (ersetzt die registrierten Methoden durch Wrapper)."""
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    for cls, methods, prefix, name in _registered:
+        _patch(cls, methods, prefix, name)
+    if 'tkinter' in sys.modules:
+        _patch_tk()
+
+
+def disable():
+    """Schaltet die Messung aus und stellt die Original-Methoden wieder her (Messwerte bleiben)."""
+    global _enabled
+    _enabled = False
+    while _patches:
+        cls, attr, original = _patches.pop()
+        setattr(cls, attr, original)
+
+
+def enabled():
+    return _enabled
+
+
+def reset():
+    """Verwirft alle Messwerte."""
+    with _lock:
+        _metrics.clear()
+        _counters.clear()
+
+
+def counters():
+    with _lock:
+        return sorted(_counters.items())
+
+
+def snapshot():
+    """Zeilen (Name, Anzahl, Ø, p50, p95, p99, max) in ms, nach Gesamtzeit absteigend."""
+    with _lock:
+        metrics = list(_metrics.values())
+    rows = []
+    for metric in sorted(metrics, key=lambda m: m.total, reverse=True):
+        p50, p95, p99 = metric.percentiles(50, 95, 99)
+        if p50 is None:
+            continue
+        rows.append((metric.name, metric.count, metric.total / metric.count * 1000,
+                     p50 * 1000, p95 * 1000, p99 * 1000, metric.maximum * 1000))
+    return rows
+
+
+def report():
+    """Tabelle aller Messpunkte als Text (für die Konsole beim Beenden)."""
+    rows = snapshot()
+    if not rows and not _counters:
+        return "Laufzeit-Messung: keine Messwerte."
+    lines = ["--- Laufzeit-Messung (ms) ---",
+             f"{'Messpunkt':<48}{'Anzahl':>8}{'Ø':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+    for name, count, mean, p50, p95, p99, maximum in rows:
+        lines.append(f"{name[:47]:<48}{count:>8}{mean:>9.2f}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{maximum:>9.2f}")
+    for name, total in counters():
+        lines.append(f"{name[:47]:<48}{total:>8}")
+    return "\n".join(lines)
+
+
+#--- cProfile (nur der aufrufende Thread, in SpT9 der GUI-Thread)
+def profiling():
+    return _profiler is not None
+
+
+def start_profile():
+    """Startet cProfile im aktuellen Thread."""
+    global _profiler
+    if _profiler is not None:
+        return
+    import cProfile
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+
+def stop_profile(directory=PROFILE_DIR):
+    """Stoppt cProfile, schreibt eine .prof-Datei und gibt eine Kurzfassung aus. Gibt den Pfad zurück."""
+    global _profiler
+    if _profiler is None:
+        return None
+    profiler, _profiler = _profiler, None
+    profiler.disable()
+    import pstats
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, time.strftime("spt9-%Y%m%d-%H%M%S.prof"))
+    profiler.dump_stats(path)
+    print(f"Profil gespeichert: {path}")
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_TOP)
+    return path
@@ -0,0 +1,182 @@
+# Wiederholungsplanung (Spaced Repetition) für den Vokabeltrainer (SpT9)
+#===
+#
+# Statt Vokabeln gleichverteilt zufällig abzufragen, bekommt jede Karte einen
+# Lernstand nach dem SM-2-Verfahren (Wiederholungen, Leichtigkeit/Ease,
+# Intervall) und einen Fälligkeitszeitpunkt (due_at).
+#
+# Pro Sprachpaar liegt im Speicher ein Min-Heap (due_at, seq, vokabel_id).
+# Die nächste Karte ist immer die am frühesten fällige – Entnehmen und
+# Einreihen kosten O(log n), auch bei 100k+ Karten. Veraltete Heap-Einträge
+# (nach Bearbeiten/Löschen/neuer Bewertung) werden über ein Token pro Karte
+# erkannt und beim Entnehmen verworfen (Lazy Deletion).
+#
+# Auf der Platte liegt der Lernstand in der Tabelle lernfortschritt (mit
+# Index auf due_at), jede Antwort wird in answer_log protokolliert.
+#
+# AUTOR: Rainer Liegard
+##########
+import heapq
+import itertools
+import random
+import time
+
+# SM-2 Bewertungen (0-5): richtig = 5, falsch = 1
+QUALITY_CORRECT = 5
+QUALITY_WRONG = 1
+# Startwert und Untergrenze der Leichtigkeit (Ease-Faktor)
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# Falsch beantwortete Karten kommen nach 10 Minuten erneut
+RELEARN_DELAY = 10 * 60
+# Übersprungene (nicht beantwortete) Karten werden um 2 Minuten nach hinten verschoben
+SKIP_DELAY = 2 * 60
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class CardState:
+    """Lernstand einer Karte (entspricht einer Zeile in lernfortschritt)."""
+    __slots__ = ('repetitions', 'ease', 'interval_days', 'due_at', 'lapses')
+
+    def __init__(self, repetitions=0, ease=DEFAULT_EASE, interval_days=0.0, due_at=0.0, lapses=0):
+        self.repetitions = repetitions
+        self.ease = ease
+        self.interval_days = interval_days
+        self.due_at = due_at
+        self.lapses = lapses
+
+
+def sm2(state, quality, now):
+    """Berechnet den neuen Lernstand nach SM-2 und gibt ihn als neues CardState zurück."""
+    repetitions, interval_days, lapses = state.repetitions, state.interval_days, state.lapses
+    if quality >= 3:
+        if repetitions == 0:
+            interval_days = 1
+        elif repetitions == 1:
+            interval_days = 6
+        else:
+            interval_days = round(interval_days * state.ease, 2)
+        repetitions += 1
+        due_at = now + interval_days * SECONDS_PER_DAY
+    else:
+        repetitions = 0
+        interval_days = 0
+        lapses += 1
+        due_at = now + RELEARN_DELAY
+    ease = state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    return CardState(repetitions, max(MIN_EASE, ease), interval_days, due_at, lapses)
+
+
+class ReviewScheduler:
+    """Fälligkeits-Warteschlange je Sprachpaar auf Basis des PairIndex.
+
+    Die Heaps werden erst beim ersten Zugriff auf ein Paar aufgebaut (O(n)),
+    danach kosten next_card/answer/postpone nur noch O(log n).
+    """
+    def __init__(self, index):
+        self.index = index
+        self._states = {}    # vokabel_id -> CardState (nur Karten mit Lernstand)
+        self._heaps = {}     # (source_lang, target_lang) -> [(due_at, seq, vokabel_id), ...]
+        self._tokens = {}    # vokabel_id -> seq des gültigen Heap-Eintrags
+        self._counter = itertools.count()
+
+    def load(self, progress_rows):
+        """Übernimmt den gespeicherten Lernstand (Zeilen aus lernfortschritt)."""
+        self._states = {
+            vokabel_id: CardState(repetitions, ease, interval_days, due_at, lapses)
+            for vokabel_id, repetitions, ease, interval_days, due_at, lapses in progress_rows
+        }
+        self._heaps.clear()
+        self._tokens.clear()
+
+    def state(self, vokabel_id):
+        """Lernstand einer Karte (neue Karten: Standardwerte, sofort fällig)."""
+        return self._states.get(vokabel_id) or CardState()
+
+    def _push(self, pair, vokabel_id, due_at):
+        seq = next(self._counter)
+        self._tokens[vokabel_id] = seq
+        heapq.heappush(self._heaps[pair], (due_at, seq, vokabel_id))
+
+    def _heap_for(self, pair):
+        """Liefert den Heap eines Paares und baut ihn beim ersten Zugriff auf."""
+        heap = self._heaps.get(pair)
+        if heap is None:
+            ids = self.index.ids_for_pair(*pair)
+            # Neue Karten (due_at = 0) in zufälliger Reihenfolge einreihen
+            random.shuffle(ids)
+            heap = []
+            for vokabel_id in ids:
+                seq = next(self._counter)
+                self._tokens[vokabel_id] = seq
+                heap.append((self.state(vokabel_id).due_at, seq, vokabel_id))
+            heapq.heapify(heap)
+            self._heaps[pair] = heap
+        return heap
+
+    def preload(self, src_lang, trg_lang):
+        """Baut den Heap eines Paares vorab auf (z.B. beim Start im Hintergrund)."""
+        self._heap_for((src_lang, trg_lang))
+
+    #--- Synchronisation mit dem PairIndex (Hinzufügen/Bearbeiten/Löschen)
+    def add(self, vokabel_id, src_lang, trg_lang):
+        """Reiht eine neue oder in ein anderes Paar verschobene Karte ein."""
+        pair = (src_lang, trg_lang)
+        self._tokens.pop(vokabel_id, None)
+        if pair in self._heaps:
+            self._push(pair, vokabel_id, self.state(vokabel_id).due_at)
+
+    def remove(self, vokabel_id):
+        """Entfernt eine Karte (der Heap-Eintrag wird beim Entnehmen verworfen)."""
+        self._tokens.pop(vokabel_id, None)
+        self._states.pop(vokabel_id, None)
+
+    #--- Abfrage
+    def next_card(self, src_lang, trg_lang):
+        """Entnimmt die am frühesten fällige Karte des Paares (oder None).
+
+        Die Karte bleibt bis answer() oder postpone() außerhalb der Warteschlange.
+        """
+        heap = self._heap_for((src_lang, trg_lang))
+        while heap:
+            due_at, seq, vokabel_id = heapq.heappop(heap)
+            if self._tokens.get(vokabel_id) == seq:
+                del self._tokens[vokabel_id]
+                return vokabel_id
+        return None
+
+    def upcoming(self, src_lang, trg_lang, count):
+        """IDs der nächsten count fälligen Karten, ohne sie zu entnehmen (O(count log n))."""
+        heap = self._heap_for((src_lang, trg_lang))
+        entries = []
+        while heap and len(entries) < count:
+            entry = heapq.heappop(heap)
+            # Veraltete Einträge werden dabei gleich verworfen
+            if self._tokens.get(entry[2]) == entry[1]:
+                entries.append(entry)
+        for entry in entries:
+            heapq.heappush(heap, entry)
+        return [vokabel_id for _, _, vokabel_id in entries]
+
+    def answer(self, vokabel_id, correct, now=None):
+        """Bewertet eine Antwort, reiht die Karte neu ein und gibt (CardState, quality) zurück."""
+        now = time.time() if now is None else now
+        quality = QUALITY_CORRECT if correct else QUALITY_WRONG
+        new_state = sm2(self.state(vokabel_id), quality, now)
+        self._states[vokabel_id] = new_state
+        self._requeue(vokabel_id, new_state.due_at)
+        return new_state, quality
+
+    def postpone(self, vokabel_id, now=None):
+        """Reiht eine unbeantwortet übersprungene Karte kurz nach hinten ein."""
+        now = time.time() if now is None else now
+        self._requeue(vokabel_id, max(self.state(vokabel_id).due_at, now) + SKIP_DELAY)
+
+    def _requeue(self, vokabel_id, due_at):
+        # Nur einreihen, wenn die Karte noch existiert (evtl. im Manager gelöscht)
+        entry = self.index.get(vokabel_id)
+        if entry is None:
+            return
+        pair = (entry[0], entry[2])
+        self._heap_for(pair)
+        self._push(pair, vokabel_id, due_at)
@@ -0,0 +1,159 @@
+# Startzeit-Bericht für SpT9 und KI.M8 (ähnlich python -X importtime)
+#===
+#
+# Aktivierung: Kommandozeilen-Option --startup-report[=datei.json] oder
+# Umgebungsvariable SPT_STARTUP_REPORT=1 (bzw. =datei.json).
+#
+# enable() hängt einen Finder vorne in sys.meta_path ein, der für jedes
+# importierte Modul die Ladezeit misst – "self" (nur das Modul) und
+# "kumuliert" (inkl. der von ihm importierten Module), wie -X importtime.
+# mark(name) setzt Meilensteine (Imports fertig, DB bereit, Fenster sichtbar).
+# report() gibt eine Tabelle aus und schreibt optional JSON, damit
+# Verschlechterungen zwischen Versionen verglichen werden können.
+#
+# Beispiel:
+# python SpT9.py --startup-report=startup.json
+#
+# AUTOR: Rainer Liegard
+##########
+import json
+import os
+import sys
+import threading
+import time
+
+# Zeitpunkt, ab dem gemessen wird (Import dieses Moduls)
+_START = time.perf_counter()
+REPORT_FLAG = "--startup-report"
+REPORT_ENV = "SPT_STARTUP_REPORT"
+# Anzahl der langsamsten Module im Bericht
+TOP_IMPORTS = 25
+
+_enabled = False
+_output = None
+_marks = []      # [(name, Sekunden seit Start)]
+_imports = {}    # Modulname -> [self, kumuliert, Thread-Name]
+_local = threading.local()
+_lock = threading.Lock()
+
+
+def requested(argv=None):
+    """Prüft Kommandozeile/Umgebung. Gibt (aktiv, JSON-Pfad oder None) zurück und entfernt die Option aus argv."""
+    argv = sys.argv if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == REPORT_FLAG or arg.startswith(REPORT_FLAG + "="):
+            del argv[i]
+            return True, arg.partition("=")[2] or None
+    env = os.environ.get(REPORT_ENV)
+    if env:
+        return True, env if env.endswith(".json") else None
+    return False, None
+
+
+class _TimingLoader:
+    """Umhüllt den Loader eines Moduls und misst exec_module."""
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            with _lock:
+                _imports[self._name] = [cumulative - children, cumulative, threading.current_thread().name]
+
+
+class _TimingFinder:
+    """Meta-Path-Finder, der die Specs der anderen Finder mit _TimingLoader versieht."""
+    def find_spec(self, name, path=None, target=None):
+        if getattr(_local, 'finding', False):
+            return None
+        _local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            _local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimingLoader(spec.loader, name)
+        return spec
+
+
+def enable(output=None):
+    """Startet die Messung (so früh wie möglich aufrufen, vor den schweren Imports)."""
+    global _enabled, _output
+    if _enabled:
+        return
+    _enabled = True
+    _output = output
+    sys.meta_path.insert(0, _TimingFinder())
+
+
+def enabled():
+    return _enabled
+
+
+def mark(name):
+    """Setzt einen Meilenstein (nur wenn der Bericht aktiv ist)."""
+    if _enabled:
+        with _lock:
+            _marks.append((name, time.perf_counter() - _START))
+
+
+def report(title="Startzeit-Bericht", top=TOP_IMPORTS):
+    """Gibt die Meilensteine und die langsamsten Imports aus; schreibt JSON, falls angegeben."""
+    if not _enabled:
+        return None
+    with _lock:
+        marks = list(_marks)
+        imports = {name: list(values) for name, values in _imports.items()}
+    slowest = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    lines = [f"--- {title} ---", "Meilensteine (ms seit Start):"]
+    previous = 0.0
+    for name, at in marks:
+        lines.append(f"  {at * 1000:9.1f}  (+{(at - previous) * 1000:7.1f})  {name}")
+        previous = at
+    lines.append(f"Langsamste Imports (von {len(imports)} Modulen, ms):")
+    lines.append(f"  {'self':>8}  {'kumuliert':>9}  Modul [Thread]")
+    for name, (self_time, cumulative, thread) in slowest:
+        lines.append(f"  {self_time * 1000:8.1f}  {cumulative * 1000:9.1f}  {name} [{thread}]")
+    text = "\n".join(lines)
+    print(text)
+    if _output:
+        data = {
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'created': time.time(),
+            'marks': [{'name': name, 'ms': round(at * 1000, 2)} for name, at in marks],
+            'imports': [{'module': name, 'self_ms': round(v[0] * 1000, 3), 'cumulative_ms': round(v[1] * 1000, 3),
+                         'thread': v[2]} for name, v in sorted(imports.items())],
+        }
+        try:
+            with open(_output, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+            print(f"Bericht gespeichert: {_output}")
+        except OSError as e:
+            print(f"Warnung: Konnte den Startzeit-Bericht nicht speichern: {e}")
+    return text
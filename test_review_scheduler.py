@@ -0,0 +1,146 @@
+# Tests für die Wiederholungsplanung (review_scheduler)
+#===
+#
+# SM-2: Intervall- und Ease-Verlauf für richtige und falsche Antworten.
+# ReviewScheduler: Reihenfolge nach Fälligkeit und Lazy Deletion – veraltete
+# Heap-Einträge (nach remove/postpone/answer/add) dürfen nie geliefert werden.
+#
+# Ausführen: python -m pytest -q
+#
+# AUTOR: Rainer Liegard
+##########
+import pytest
+
+from review_scheduler import (CardState, ReviewScheduler, sm2, DEFAULT_EASE, MIN_EASE, QUALITY_CORRECT,
+                              QUALITY_WRONG, RELEARN_DELAY, SKIP_DELAY, SECONDS_PER_DAY)
+from vocab_db import PairIndex
+
+PAIR = ("Englisch", "Deutsch")
+DAY = SECONDS_PER_DAY
+
+
+#--- SM-2
+def test_sm2_correct_answers_grow_interval_and_ease():
+    state = CardState()
+    state = sm2(state, QUALITY_CORRECT, now=0)
+    assert (state.repetitions, state.interval_days, state.due_at) == (1, 1, 1 * DAY)
+    assert state.ease == pytest.approx(DEFAULT_EASE + 0.1)
+    state = sm2(state, QUALITY_CORRECT, now=1 * DAY)
+    assert (state.repetitions, state.interval_days, state.due_at) == (2, 6, 7 * DAY)
+    assert state.ease == pytest.approx(2.7)
+    # Ab der dritten Wiederholung: Intervall * Ease (Ease vor der Antwort)
+    state = sm2(state, QUALITY_CORRECT, now=7 * DAY)
+    assert state.repetitions == 3
+    assert state.interval_days == pytest.approx(16.2)
+    assert state.due_at == pytest.approx(7 * DAY + 16.2 * DAY)
+    assert state.ease == pytest.approx(2.8)
+
+
+def test_sm2_wrong_answer_resets_and_lowers_ease():
+    state = CardState(repetitions=3, ease=2.8, interval_days=16.2, due_at=0, lapses=0)
+    state = sm2(state, QUALITY_WRONG, now=100)
+    assert (state.repetitions, state.interval_days, state.lapses) == (0, 0, 1)
+    assert state.due_at == 100 + RELEARN_DELAY
+    assert state.ease == pytest.approx(2.8 + 0.1 - 4 * (0.08 + 4 * 0.02))
+    # Danach beginnt die Folge wieder bei 1 Tag
+    state = sm2(state, QUALITY_CORRECT, now=200)
+    assert (state.repetitions, state.interval_days) == (1, 1)
+
+
+def test_sm2_ease_never_drops_below_minimum():
+    state = CardState()
+    for _ in range(20):
+        state = sm2(state, QUALITY_WRONG, now=0)
+    assert state.ease == MIN_EASE
+    assert state.lapses == 20
+
+
+def test_sm2_does_not_modify_the_given_state():
+    state = CardState()
+    sm2(state, QUALITY_CORRECT, now=0)
+    assert (state.repetitions, state.ease, state.interval_days) == (0, DEFAULT_EASE, 0.0)
+
+
+#--- ReviewScheduler
+@pytest.fixture
+def scheduler():
+    """Drei Karten eines Paares, fällig in der Reihenfolge 2, 3, 1."""
+    index = PairIndex()
+    index.build([(1, PAIR[0], "one", PAIR[1], "eins"),
+                 (2, PAIR[0], "two", PAIR[1], "zwei"),
+                 (3, PAIR[0], "three", PAIR[1], "drei")])
+    scheduler = ReviewScheduler(index)
+    scheduler.load([(1, 1, DEFAULT_EASE, 1.0, 300.0, 0),
+                    (2, 1, DEFAULT_EASE, 1.0, 100.0, 0),
+                    (3, 1, DEFAULT_EASE, 1.0, 200.0, 0)])
+    return scheduler
+
+
+def drain(scheduler):
+    """Alle Karten in der Reihenfolge, in der next_card sie liefert."""
+    ids = []
+    while (vokabel_id := scheduler.next_card(*PAIR)) is not None:
+        ids.append(vokabel_id)
+    return ids
+
+
+def test_cards_come_in_due_order(scheduler):
+    assert scheduler.upcoming(*PAIR, 2) == [2, 3]
+    assert drain(scheduler) == [2, 3, 1]
+    assert scheduler.next_card(*PAIR) is None
+
+
+def test_removed_card_is_never_returned(scheduler):
+    scheduler.preload(*PAIR)
+    scheduler.remove(2)
+    scheduler.index.remove(2)
+    assert scheduler.upcoming(*PAIR, 3) == [3, 1]
+    assert drain(scheduler) == [3, 1]
+
+
+def test_answer_for_deleted_card_is_not_requeued(scheduler):
+    assert scheduler.next_card(*PAIR) == 2
+    scheduler.index.remove(2)
+    scheduler.remove(2)
+    scheduler.answer(2, True, now=0)
+    assert drain(scheduler) == [3, 1]
+
+
+def test_postponed_card_moves_behind_later_cards(scheduler):
+    assert scheduler.next_card(*PAIR) == 2
+    scheduler.postpone(2, now=1000)
+    assert drain(scheduler) == [3, 1, 2]
+
+
+def test_postpone_uses_due_date_when_it_is_later(scheduler):
+    assert scheduler.next_card(*PAIR) == 2
+    scheduler.postpone(2, now=0)
+    # Neu eingereiht bei due_at 100 + SKIP_DELAY, also zwischen Karte 3 (200) und 1 (300)
+    assert 200 < 100 + SKIP_DELAY < 300
+    assert drain(scheduler) == [3, 2, 1]
+
+
+def test_requeued_card_leaves_only_one_valid_entry(scheduler):
+    assert scheduler.next_card(*PAIR) == 2
+    state, quality = scheduler.answer(2, True, now=0)
+    assert quality == QUALITY_CORRECT
+    assert state.due_at == pytest.approx(6 * DAY)
+    # Bearbeiten im Manager reiht die Karte erneut ein: der ältere Eintrag ist damit veraltet
+    scheduler.add(2, *PAIR)
+    assert drain(scheduler) == [3, 1, 2]
+
+
+def test_wrong_answer_brings_card_back_soon(scheduler):
+    assert scheduler.next_card(*PAIR) == 2
+    scheduler.answer(2, False, now=0)
+    assert scheduler.state(2).due_at == RELEARN_DELAY
+    assert scheduler.state(2).lapses == 1
+    assert drain(scheduler) == [3, 1, 2]
+
+
+def test_new_cards_are_due_immediately():
+    index = PairIndex()
+    index.build([(1, PAIR[0], "one", PAIR[1], "eins"), (2, PAIR[0], "two", PAIR[1], "zwei")])
+    scheduler = ReviewScheduler(index)
+    scheduler.load([(1, 2, DEFAULT_EASE, 6.0, 10 * DAY, 0)])
+    assert drain(scheduler) == [2, 1]
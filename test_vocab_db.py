@@ -0,0 +1,122 @@
+# Tests für die Schema-Migrationen von vocab_db
+#===
+#
+# Die Migrationen schreiben bestehende vokabeln.db der Benutzer um. Geprüft
+# wird deshalb der Weg von einer Datenbank des alten Trainers (nur Tabelle
+# vocabulary, user_version 0) bis zur aktuellen Version.
+#
+# Ausführen: python -m pytest -q
+#
+# AUTOR: Rainer Liegard
+##########
+import sqlite3
+
+import pytest
+
+import vocab_db
+from vocab_db import VocabRepository, MIGRATIONS
+
+# Schema und Inhalt einer vokabeln.db, wie sie der Trainer vor den Migrationen anlegte
+OLD_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vocabulary (
+        id INTEGER PRIMARY KEY,
+        source_word TEXT NOT NULL,
+        source_lang TEXT NOT NULL,
+        target_lang TEXT NOT NULL,
+        target_word TEXT NOT NULL,
+        source TEXT NOT NULL,
+        UNIQUE (source_word, source_lang, target_lang)
+    )
+"""
+OLD_ROWS = [
+    ("house", "Englisch", "Deutsch", "haus", "DB"),
+    ("haus", "Deutsch", "Englisch", "house", "DB"),
+    ("casa", "Italienisch", "Deutsch", "haus", "Online"),
+]
+
+
+@pytest.fixture
+def old_db(tmp_path):
+    """Pfad einer Datenbank mit user_version 0 und drei Vokabeln."""
+    path = str(tmp_path / "vokabeln.db")
+    conn = sqlite3.connect(path)
+    conn.execute(OLD_SCHEMA)
+    conn.executemany("INSERT INTO vocabulary (source_word, source_lang, target_lang, target_word, source) "
+                     "VALUES (?, ?, ?, ?, ?)", OLD_ROWS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _names(repo, kind):
+    return {row[0] for row in repo.conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+
+
+def test_migrates_old_database_to_current_version(old_db):
+    repo = VocabRepository(old_db)
+    try:
+        assert repo.schema_version() == 0
+        repo.initialize(initial_data=[("tree", "Englisch", "Deutsch", "baum")])
+        assert repo.schema_version() == len(MIGRATIONS) == 6
+        assert {"vocabulary", "lernfortschritt", "answer_log", "translation_jobs",
+                "translation_cache"} <= _names(repo, "table")
+        assert {"idx_vocabulary_pair", "idx_vocabulary_manager", "idx_lernfortschritt_due",
+                "idx_answer_log_vokabel"} <= _names(repo, "index")
+        columns = [row[1] for row in repo.conn.execute("PRAGMA table_info(translation_jobs)")]
+        assert "source" in columns
+        # Bestehende Vokabeln bleiben erhalten, initial_data nur für leere Datenbanken
+        rows = repo.conn.execute("SELECT source_word, source_lang, target_lang, target_word, source "
+                                 "FROM vocabulary ORDER BY id").fetchall()
+        assert rows == OLD_ROWS
+    finally:
+        repo.close()
+
+
+def test_migrated_database_is_usable(old_db):
+    repo = VocabRepository(old_db)
+    try:
+        repo.initialize()
+        assert repo.get_translation("house", "Englisch", "Deutsch") == "haus"
+        assert repo.fetch_pair("Italienisch", "Deutsch") == [("casa", "haus")]
+        # Lernstand und Protokoll (Migration 3) hängen per CASCADE an der Vokabel
+        vocab_id = repo.conn.execute("SELECT id FROM vocabulary WHERE source_word = 'house'").fetchone()[0]
+        repo.log_answer(vocab_id, 1000.0, True, 5)
+        repo.delete(vocab_id)
+        assert repo.conn.execute("SELECT COUNT(*) FROM answer_log").fetchone()[0] == 0
+    finally:
+        repo.close()
+
+
+def test_second_run_changes_nothing(old_db):
+    repo = VocabRepository(old_db)
+    try:
+        repo.initialize()
+        assert repo.migrate() == len(MIGRATIONS)
+        assert repo.count() == len(OLD_ROWS)
+    finally:
+        repo.close()
+
+
+def test_failed_migration_is_rolled_back(old_db, monkeypatch):
+    monkeypatch.setattr(vocab_db, "MIGRATIONS", MIGRATIONS + [
+        ("CREATE TABLE halb_fertig (id INTEGER)", "SELECT * FROM gibt_es_nicht"),
+    ])
+    repo = VocabRepository(old_db)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            repo.migrate()
+        # Alle vorherigen Migrationen sind festgeschrieben, die fehlerhafte gar nicht
+        assert repo.schema_version() == len(MIGRATIONS)
+        assert "halb_fertig" not in _names(repo, "table")
+    finally:
+        repo.close()
+
+
+def test_new_database_gets_initial_data(tmp_path):
+    repo = VocabRepository(str(tmp_path / "neu.db"))
+    try:
+        repo.initialize(initial_data=[("Tree", "Englisch", "Deutsch", "Baum")])
+        assert repo.schema_version() == len(MIGRATIONS)
+        assert repo.get_translation("tree", "Englisch", "Deutsch") == "baum"
+    finally:
+        repo.close()
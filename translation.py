@@ -0,0 +1,768 @@
+# Übersetzungsdienste für den Vokabeltrainer (SpT9) und die Wissens-KI (KI.M8)
+#===
+#
+# Provider: Jeder Übersetzungsdienst implementiert TranslationProvider
+# (translate/translate_batch mit Sprachcodes wie 'en', 'de' oder 'auto').
+#  - GoogletransProvider     googletrans (bisher fest in SpT9)
+#  - DeepTranslatorProvider  deep_translator.GoogleTranslator (bisher fest in KI.M8)
+#  - OfflineDictionaryProvider  lokale, memory-mapped Wörterbücher (offline_dict),
+#                               für Rechner ohne Netzwerk
+# FallbackChain fragt die verfügbaren Provider der Reihe nach und misst die
+# Latenz jedes Providers (ProviderStats). Die Reihenfolge legt
+# PROVIDER_ORDER bzw. die Umgebungsvariable SPT_TRANSLATION_PROVIDERS fest
+# (z.B. "offline,googletrans").
+#
+# TranslationCache: Ergebnis-Cache vor der FallbackChain (Tabelle
+# translation_cache mit Ablaufzeit + LRU im Prozess). Auch Fehlschläge werden
+# gemerkt (negativer Cache) – mit einer Sperrzeit, die sich bei jedem weiteren
+# Fehlschlag verdoppelt. Wiederholte Anfragen kosten so kein Online-Kontingent.
+#
+# TranslationWorkerPool: Online-Übersetzungen laufen nicht mehr auf dem
+# Tk-Thread, sondern in einer begrenzten Anzahl von Worker-Threads, die eine
+# Warteschlange (queue.Queue) abarbeiten. Jede Anfrage kann abgebrochen werden,
+# das Ergebnis wird über dispatch (z.B. master.after) im GUI-Thread an den
+# Callback übergeben.
+#
+# batch_translate: Füllt eine neue Zielsprache für den ganzen Wortschatz auf
+# einmal (z.B. alle Wörter ohne spanische Übersetzung). Die fehlenden Wörter
+# werden dedupliziert in der Tabelle translation_jobs vorgemerkt, in Stapeln
+# von BATCH_SIZE Wörtern (ein Aufruf des Übersetzers pro Stapel) mit
+# höchstens CONCURRENCY gleichzeitigen Anfragen übersetzt und zwischen-
+# gespeichert. Am Ende werden alle Ergebnisse in EINER Transaktion in
+# vocabulary übernommen (source = 'Online' bzw. 'Wörterbuch' je Provider). Bricht der Lauf ab (Absturz,
+# Strg+C), setzt ein erneuter Aufruf bei den offenen Aufträgen fort.
+# Wörter, die MAX_ATTEMPTS-mal gescheitert sind, werden nicht mehr versucht;
+# am Ende werden sie gezählt und aufgelistet, --retry-failed versucht sie erneut.
+#
+# Kommandozeile:
+# python translation.py --target-lang Spanisch [--retry-failed]
+#
+# AUTOR: Rainer Liegard
+##########
+import argparse
+import importlib.util
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+import perf_monitor
+from vocab_db import VocabRepository, DB_NAME, LANG_CODES
+
+# Anzahl gleichzeitiger Online-Abfragen
+TRANSLATION_WORKERS = 3
+# Maximale Anzahl wartender Anfragen (danach lehnt submit() ab)
+MAX_PENDING_REQUESTS = 32
+# Stapel-Übersetzung: Wörter pro Anfrage, gleichzeitige Anfragen, Versuche pro Wort
+BATCH_SIZE = 50
+CONCURRENCY = 4
+MAX_ATTEMPTS = 3
+# So viele aufgegebene Wörter zeigt die Kommandozeile am Ende als Beispiel
+EXHAUSTED_SAMPLE = 10
+ONLINE_SOURCE = 'Online'
+OFFLINE_SOURCE = 'Wörterbuch'
+# Standard-Reihenfolge der Provider (offline zuerst: schnell und ohne Netz)
+PROVIDER_ORDER = ('offline', 'googletrans', 'deep_translator')
+# Anzahl der letzten Messwerte je Provider für Median/p95
+LATENCY_WINDOW = 256
+# Übersetzungs-Cache: Gültigkeit von Treffern, Einträge im Prozess-LRU
+CACHE_TTL = 30 * 86400
+CACHE_LRU_SIZE = 4096
+# Sperrzeit nach Fehlschlägen (Sekunden): (Start, Maximum), verdoppelt sich bei jedem weiteren
+# Fehlschlag. miss = kein Provider kennt das Wort, self = "Übersetzung" ist das Wort selbst,
+# unsupported = Sprache vom Dienst abgelehnt, error = Netzwerk-/Dienstfehler
+NEGATIVE_BACKOFF = {
+    'miss': (3600, 7 * 86400),
+    'self': (3600, 7 * 86400),
+    'unsupported': (86400, 30 * 86400),
+    'error': (60, 3600),
+}
+# Abgelaufene Einträge bleiben so lange erhalten, damit die Sperrzeit weiter wachsen kann
+CACHE_PURGE_GRACE = 30 * 86400
+
+
+#--- Provider
+def _installed(module_name):
+    """Prüft ohne Import, ob ein optionales Paket installiert ist."""
+    if importlib.util.find_spec(module_name) is None:
+        print(f"Hinweis: {module_name} nicht installiert.")
+        return False
+    return True
+
+
+class TranslationProvider:
+    """Basisklasse eines Übersetzungsdienstes.
+
+    Sprachen werden als Codes übergeben ('en', 'de', ...; Quelle auch 'auto').
+    translate() gibt die Übersetzung oder None (nicht gefunden) zurück und
+    darf bei Netzwerkfehlern Exceptions auslösen.
+    """
+    name = "basis"
+    # Wert für die Spalte vocabulary.source
+    source = ONLINE_SOURCE
+
+    def available(self):
+        """True, wenn der Dienst benutzt werden kann (Bibliothek/Datei vorhanden)."""
+        return True
+
+    def translate(self, text, src_code, trg_code):
+        raise NotImplementedError
+
+    def translate_batch(self, texts, src_code, trg_code):
+        """Übersetzt mehrere Texte (Standard: einzeln). Fehlende Treffer sind None."""
+        return [self.translate(text, src_code, trg_code) for text in texts]
+
+    def warm_up(self):
+        """Lädt Bibliotheken/Dateien vorab (z.B. während des Startbildschirms)."""
+
+    def close(self):
+        pass
+
+
+class GoogletransProvider(TranslationProvider):
+    """googletrans (inoffizielle Google-API). Ein Translator pro Thread."""
+    name = "googletrans"
+
+    def __init__(self):
+        self._local = threading.local()
+        self._available = None
+
+    def available(self):
+        # Nur prüfen, ob das Paket installiert ist – importiert wird erst bei der ersten Übersetzung
+        if self._available is None:
+            self._available = _installed('googletrans')
+        return self._available
+
+    def warm_up(self):
+        import googletrans  # noqa: F401
+
+    def _translator(self):
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            from googletrans import Translator
+            translator = self._local.translator = Translator()
+        return translator
+
+    def translate(self, text, src_code, trg_code):
+        return self._translator().translate(text, src=src_code, dest=trg_code).text or None
+
+    def translate_batch(self, texts, src_code, trg_code):
+        # googletrans übersetzt Listen mit einem Aufruf
+        results = self._translator().translate(list(texts), src=src_code, dest=trg_code)
+        return [r.text or None for r in results]
+
+
+class DeepTranslatorProvider(TranslationProvider):
+    """deep_translator.GoogleTranslator."""
+    name = "deep_translator"
+
+    def __init__(self):
+        self._available = None
+
+    def available(self):
+        if self._available is None:
+            self._available = _installed('deep_translator')
+        return self._available
+
+    def warm_up(self):
+        import deep_translator  # noqa: F401
+
+    def translate(self, text, src_code, trg_code):
+        from deep_translator import GoogleTranslator
+        return GoogleTranslator(source=src_code, target=trg_code).translate(text) or None
+
+    def translate_batch(self, texts, src_code, trg_code):
+        from deep_translator import GoogleTranslator
+        return [t or None for t in GoogleTranslator(source=src_code, target=trg_code).translate_batch(list(texts))]
+
+
+class OfflineDictionaryProvider(TranslationProvider):
+    """Lokale .sptd-Wörterbücher (offline_dict), werden bei Bedarf per mmap geöffnet."""
+    name = "offline"
+    source = OFFLINE_SOURCE
+
+    def __init__(self, directory=None):
+        import offline_dict
+        self._offline_dict = offline_dict
+        self.directory = directory or offline_dict.DICT_DIR
+        self._dicts = {}
+        self._auto = {}      # Zielsprache -> Wörterbücher aller Quellsprachen
+        self._lock = threading.Lock()
+
+    def available(self):
+        return os.path.isdir(self.directory) and any(
+            name.endswith(self._offline_dict.DICT_EXT) for name in os.listdir(self.directory))
+
+    def _dictionary(self, src_code, trg_code):
+        key = (src_code, trg_code)
+        if key not in self._dicts:
+            with self._lock:
+                if key not in self._dicts:
+                    path = self._offline_dict.dict_path(src_code, trg_code, self.directory)
+                    self._dicts[key] = self._offline_dict.OfflineDictionary(path) if os.path.exists(path) else None
+        return self._dicts[key]
+
+    def warm_up(self):
+        # Alle vorhandenen Wörterbücher einblenden (mmap, ohne Einlesen)
+        ext = self._offline_dict.DICT_EXT
+        for name in os.listdir(self.directory):
+            if name.endswith(ext) and '-' in name:
+                src_code, trg_code = name[:-len(ext)].split('-', 1)
+                self._dictionary(src_code, trg_code)
+
+    def _candidates(self, src_code, trg_code):
+        if src_code != 'auto':
+            return [self._dictionary(src_code, trg_code)]
+        # Quellsprache unbekannt: alle Wörterbücher mit passender Zielsprache
+        if trg_code not in self._auto:
+            suffix = f"-{trg_code}{self._offline_dict.DICT_EXT}"
+            self._auto[trg_code] = [self._dictionary(name[:-len(suffix)], trg_code)
+                                    for name in sorted(os.listdir(self.directory)) if name.endswith(suffix)]
+        return self._auto[trg_code]
+
+    def translate(self, text, src_code, trg_code):
+        for dictionary in self._candidates(src_code, trg_code):
+            if dictionary is not None:
+                translation = dictionary.lookup(text)
+                if translation is not None:
+                    return translation
+        return None
+
+    def close(self):
+        with self._lock:
+            for dictionary in self._dicts.values():
+                if dictionary is not None:
+                    dictionary.close()
+            self._dicts.clear()
+            self._auto.clear()
+
+
+PROVIDERS = {
+    'offline': OfflineDictionaryProvider,
+    'googletrans': GoogletransProvider,
+    'deep_translator': DeepTranslatorProvider,
+}
+
+
+class ProviderStats:
+    """Latenz und Trefferquote eines Providers (thread-sicher)."""
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self._recent = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, outcome):
+        with self._lock:
+            self.calls += 1
+            self.total_seconds += seconds
+            self._recent.append(seconds)
+            if outcome == 'hit':
+                self.hits += 1
+            elif outcome == 'miss':
+                self.misses += 1
+            else:
+                self.errors += 1
+
+    def percentile(self, p):
+        """Perzentil (0-100) der letzten LATENCY_WINDOW Aufrufe in Sekunden."""
+        with self._lock:
+            values = sorted(self._recent)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+    def __str__(self):
+        if not self.calls:
+            return f"{self.name}: keine Aufrufe"
+        return (f"{self.name}: {self.calls} Aufrufe ({self.hits} Treffer, {self.misses} ohne Ergebnis, "
+                f"{self.errors} Fehler), Ø {self.total_seconds / self.calls * 1000:.2f} ms, "
+                f"p50 {self.percentile(50) * 1000:.2f} ms, p95 {self.percentile(95) * 1000:.2f} ms")
+
+
+class TranslationBackoff(Exception):
+    """Der Dienst ist für diese Anfrage nach einem Fehler vorübergehend gesperrt (negativer Cache)."""
+
+
+def _failure_outcome(error):
+    """Ordnet einen Provider-Fehler einer Sperrzeit zu (abgelehnte Sprache oder sonstiger Fehler)."""
+    # googletrans: ValueError('invalid destination language'), deep_translator: LanguageNotSupportedException
+    if isinstance(error, ValueError) or "NotSupported" in type(error).__name__:
+        return 'unsupported'
+    return 'error'
+
+
+class TranslationCache:
+    """Cache für Übersetzungsergebnisse: LRU im Prozess vor der Tabelle translation_cache.
+
+    Einträge: (translation, provider, outcome, failures, expires_at); outcome 'hit' oder
+    ein Schlüssel aus NEGATIVE_BACKOFF. Thread-sicher (die DB-Verbindung ist pro Thread).
+    """
+    def __init__(self, repo, ttl=CACHE_TTL, lru_size=CACHE_LRU_SIZE):
+        self.repo = repo
+        self.ttl = ttl
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text, src_code, trg_code):
+        return src_code, trg_code, " ".join(text.split()).lower()
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                return entry
+        entry = self.repo.get_cached_translation(*key)
+        if entry is not None:
+            self._remember(key, tuple(entry))
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def get(self, text, src_code, trg_code, now=None):
+        """Gültiger Eintrag oder None (abgelaufen/unbekannt)."""
+        now = time.time() if now is None else now
+        entry = self._lookup(self.key(text, src_code, trg_code))
+        if entry is None or entry[4] < now:
+            self.misses += 1
+            perf_monitor.count("Übersetzungs-Cache Fehlschlag")
+            return None
+        if entry[2] == 'hit':
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        perf_monitor.count("Übersetzungs-Cache Treffer")
+        return entry
+
+    def put(self, text, src_code, trg_code, translation, provider_name, now=None):
+        """Merkt eine gefundene Übersetzung für ttl Sekunden."""
+        now = time.time() if now is None else now
+        key = self.key(text, src_code, trg_code)
+        entry = (translation, provider_name, 'hit', 0, now + self.ttl)
+        self.repo.put_cached_translation(*key, *entry)
+        self._remember(key, entry)
+
+    def put_negative(self, text, src_code, trg_code, outcome, now=None):
+        """Merkt einen Fehlschlag; die Sperrzeit verdoppelt sich mit jedem weiteren. Gibt sie zurück."""
+        now = time.time() if now is None else now
+        key = self.key(text, src_code, trg_code)
+        previous = self._lookup(key)
+        failures = previous[3] + 1 if previous is not None and previous[2] != 'hit' else 1
+        base, maximum = NEGATIVE_BACKOFF[outcome]
+        delay = min(base * 2 ** (failures - 1), maximum)
+        entry = (None, None, outcome, failures, now + delay)
+        self.repo.put_cached_translation(*key, *entry)
+        self._remember(key, entry)
+        return delay
+
+    def purge(self, now=None):
+        """Entfernt lange abgelaufene Einträge aus der Tabelle."""
+        now = time.time() if now is None else now
+        return self.repo.purge_translation_cache(now - CACHE_PURGE_GRACE)
+
+    def __str__(self):
+        total = self.hits + self.negative_hits + self.misses
+        if not total:
+            return "Cache: keine Abfragen"
+        return (f"Cache: {total} Abfragen, {self.hits} Treffer, {self.negative_hits} gemerkte Fehlschläge, "
+                f"{self.misses} an die Dienste weitergereicht")
+
+
+class FallbackChain:
+    """Fragt die verfügbaren Provider der Reihe nach, bis einer ein Ergebnis liefert.
+    Mit cache (TranslationCache) werden Ergebnisse und Fehlschläge von resolve() gemerkt."""
+    def __init__(self, providers, cache=None):
+        self.providers = [p for p in providers if p.available()]
+        self.stats = {p.name: ProviderStats(p.name) for p in self.providers}
+        self.cache = cache
+
+    def available(self):
+        return bool(self.providers)
+
+    def _call(self, provider, method, *args):
+        start = time.perf_counter()
+        try:
+            result = method(*args)
+        except Exception as e:
+            self.stats[provider.name].record(time.perf_counter() - start, 'error')
+            print(f"Übersetzungsfehler ({provider.name}): {e}")
+            raise
+        hit = any(result) if isinstance(result, list) else result is not None
+        self.stats[provider.name].record(time.perf_counter() - start, 'hit' if hit else 'miss')
+        return result
+
+    def _resolve(self, text, src_code, trg_code):
+        error = None
+        for provider in self.providers:
+            try:
+                translation = self._call(provider, provider.translate, text, src_code, trg_code)
+            except Exception as e:
+                error = e
+                continue
+            if translation is not None:
+                return translation, provider
+        if error is not None:
+            raise error
+        return None, None
+
+    def resolve(self, text, src_code, trg_code):
+        """Gibt (Übersetzung, Provider) zurück oder (None, None).
+        Lösen alle Provider Fehler aus, wird der letzte Fehler weitergereicht. Mit Cache gilt
+        eine "Übersetzung", die dem Text selbst entspricht, als Fehlschlag; solange ein Fehler
+        gemerkt ist, wird TranslationBackoff ausgelöst, ohne die Dienste zu fragen."""
+        if self.cache is None:
+            return self._resolve(text, src_code, trg_code)
+        entry = self.cache.get(text, src_code, trg_code)
+        if entry is not None:
+            translation, provider_name, outcome, _, expires_at = entry
+            if outcome == 'error':
+                raise TranslationBackoff(f"Übersetzungsdienst nach Fehler pausiert "
+                                         f"(neuer Versuch in {max(0, expires_at - time.time()):.0f} s)")
+            if outcome != 'hit':
+                return None, None
+            provider = next((p for p in self.providers if p.name == provider_name), None)
+            if provider is not None:
+                return translation, provider
+        try:
+            translation, provider = self._resolve(text, src_code, trg_code)
+        except Exception as e:
+            self.cache.put_negative(text, src_code, trg_code, _failure_outcome(e))
+            raise
+        if translation is None:
+            self.cache.put_negative(text, src_code, trg_code, 'miss')
+        elif " ".join(translation.split()).lower() == " ".join(text.split()).lower():
+            self.cache.put_negative(text, src_code, trg_code, 'self')
+            return None, None
+        else:
+            self.cache.put(text, src_code, trg_code, translation, provider.name)
+        return translation, provider
+
+    def resolve_batch(self, texts, src_code, trg_code):
+        """Liste von (Übersetzung, Provider) – fehlende Wörter gehen an den nächsten Provider."""
+        results = [(None, None)] * len(texts)
+        open_positions = list(range(len(texts)))
+        error = None
+        for provider in self.providers:
+            if not open_positions:
+                break
+            try:
+                translations = self._call(provider, provider.translate_batch,
+                                          [texts[i] for i in open_positions], src_code, trg_code)
+            except Exception as e:
+                error = e
+                continue
+            still_open = []
+            for i, translation in zip(open_positions, translations):
+                if translation is None:
+                    still_open.append(i)
+                else:
+                    results[i] = (translation, provider)
+            open_positions = still_open
+        if error is not None and len(open_positions) == len(texts):
+            raise error
+        return results
+
+    def warm_up(self):
+        """Bereitet alle Provider vor und räumt den Cache auf; Fehler werden nur gemeldet."""
+        for provider in self.providers:
+            try:
+                provider.warm_up()
+            except Exception as e:
+                print(f"Warnung: Übersetzungs-Provider '{provider.name}' konnte nicht vorbereitet werden: {e}")
+        if self.cache is not None:
+            try:
+                self.cache.purge()
+            except Exception as e:
+                print(f"Warnung: Übersetzungs-Cache konnte nicht aufgeräumt werden: {e}")
+
+    def report(self):
+        """Latenz-Übersicht aller Provider (eine Zeile pro Provider) und ggf. des Caches."""
+        lines = [str(stats) for stats in self.stats.values()]
+        if self.cache is not None:
+            lines.append(str(self.cache))
+        return "\n".join(lines)
+
+    def close(self):
+        for provider in self.providers:
+            provider.close()
+
+
+def default_chain(order=None, cache=None):
+    """Baut die FallbackChain aus PROVIDER_ORDER (oder SPT_TRANSLATION_PROVIDERS)."""
+    if order is None:
+        env = os.environ.get('SPT_TRANSLATION_PROVIDERS')
+        order = [name.strip() for name in env.split(',')] if env else PROVIDER_ORDER
+    providers = []
+    for name in order:
+        if name not in PROVIDERS:
+            print(f"Warnung: Unbekannter Übersetzungs-Provider '{name}' wird ignoriert.")
+            continue
+        providers.append(PROVIDERS[name]())
+    return FallbackChain(providers, cache)
+
+
+class TranslationRequest:
+    """Handle einer Übersetzungsanfrage (kann per cancel() abgebrochen werden)."""
+    def __init__(self, word, src_lang, trg_lang, callback):
+        self.word = word
+        self.src_lang = src_lang
+        self.trg_lang = trg_lang
+        self.callback = callback
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Bricht die Anfrage ab. Läuft sie bereits, wird ihr Ergebnis nicht mehr angezeigt."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+
+class TranslationWorkerPool:
+    """Begrenzter Pool von Worker-Threads für Online-Übersetzungen.
+
+    lookup(word, src_lang, trg_lang) läuft im Worker-Thread, dispatch(fn) muss fn
+    im GUI-Thread ausführen (z.B. lambda fn: master.after(0, fn)).
+    callback(request, result) wird im GUI-Thread für jede Anfrage aufgerufen, deren lookup gelaufen
+    ist – auch wenn sie inzwischen abgebrochen wurde, denn lookup kann bereits gespeichert haben
+    (z.B. eine neue Vokabel). Der Callback prüft request.cancelled, bevor er die Anzeige ändert.
+    Vor dem Start abgebrochene Anfragen erhalten keinen Callback.
+    """
+    def __init__(self, lookup, dispatch, workers=TRANSLATION_WORKERS, max_pending=MAX_PENDING_REQUESTS):
+        self.lookup = lookup
+        self.dispatch = dispatch
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._threads = []
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def _ensure_workers(self):
+        # Threads werden erst bei der ersten Anfrage gestartet
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker, name=f"translation-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(self, word, src_lang, trg_lang, callback):
+        """Reiht eine Anfrage ein. Gibt das TranslationRequest zurück oder None, wenn die Warteschlange voll ist."""
+        if self._shutdown:
+            return None
+        request = TranslationRequest(word, src_lang, trg_lang, callback)
+        with self._lock:
+            self._ensure_workers()
+            try:
+                self._queue.put_nowait(request)
+            except queue.Full:
+                return None
+            self._in_flight.add(request)
+        return request
+
+    def pending(self):
+        """Anzahl der wartenden oder laufenden Anfragen."""
+        with self._lock:
+            return len(self._in_flight)
+
+    def cancel_all(self):
+        """Bricht alle offenen Anfragen ab."""
+        with self._lock:
+            requests = list(self._in_flight)
+        for request in requests:
+            request.cancel()
+
+    def _worker(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            started = False
+            result = None
+            try:
+                if not request.cancelled:
+                    started = True
+                    result = self.lookup(request.word, request.src_lang, request.trg_lang)
+            except Exception as e:
+                print(f"Fehler im Übersetzungs-Worker: {e}")
+                result = (None, f"Fehler: {e}", None)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(request)
+            if started and not self._shutdown:
+                self.dispatch(lambda request=request, result=result: request.callback(request, result))
+
+    def shutdown(self):
+        """Beendet die Worker (offene Anfragen werden verworfen)."""
+        self._shutdown = True
+        self.cancel_all()
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+
+
+#--- Stapel-Übersetzung
+class BatchResult:
+    """Ergebnis einer Stapel-Übersetzung."""
+    def __init__(self):
+        self.total = 0
+        self.translated = 0
+        self.failed = 0
+        self.inserted = 0
+        # Wörter nach MAX_ATTEMPTS Fehlschlägen (auch aus früheren Läufen)
+        self.exhausted = 0
+        self.retried = 0
+        self.cancelled = False
+
+    def __str__(self):
+        return (f"{self.translated}/{self.total} übersetzt, {self.failed} fehlgeschlagen, "
+                f"{self.exhausted} aufgegeben, {self.inserted} neue Vokabeln")
+
+
+def _chunks(jobs, batch_size):
+    """Teilt die Aufträge in Stapel mit gleicher Quellsprache."""
+    for src_lang, group in itertools.groupby(jobs, key=lambda job: job[0]):
+        words = [word for _, word in group]
+        for i in range(0, len(words), batch_size):
+            yield src_lang, words[i:i + batch_size]
+
+
+def batch_translate(repo, trg_lang, chain=None, batch_size=BATCH_SIZE,
+                    concurrency=CONCURRENCY, progress=None, cancel_event=None, apply=True,
+                    retry_failed=False):
+    """Übersetzt alle Wörter, denen eine Übersetzung nach trg_lang fehlt.
+
+    chain ist eine FallbackChain (Standard: default_chain()); die Spalte
+    source erhält den Wert des liefernden Providers. Zwischenergebnisse werden nach jedem Stapel in
+    translation_jobs gespeichert; progress(result) wird danach aufgerufen.
+    Mit apply=False bleiben die Ergebnisse vorgemerkt (z.B. zur Kontrolle).
+    Wörter mit MAX_ATTEMPTS Fehlschlägen werden übersprungen und in result.exhausted
+    gezählt; retry_failed=True gibt sie vorher für einen neuen Versuch frei.
+    """
+    if trg_lang not in LANG_CODES:
+        raise ValueError(f"Unbekannte Zielsprache: '{trg_lang}'")
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    chain = chain or default_chain()
+    if not chain.available():
+        raise RuntimeError("Kein Übersetzungs-Provider verfügbar.")
+    result = BatchResult()
+    repo.stage_translation_jobs(trg_lang)
+    if retry_failed:
+        result.retried = repo.reset_exhausted_jobs(trg_lang, MAX_ATTEMPTS)
+    jobs = [job for job in repo.fetch_open_jobs(trg_lang, MAX_ATTEMPTS) if job[0] in LANG_CODES]
+    result.total, result.translated = repo.count_translation_jobs(trg_lang)
+    batches = iter(_chunks(jobs, batch_size))
+
+    # Höchstens concurrency Stapel gleichzeitig unterwegs; geschrieben wird nur
+    # von diesem Thread (eine kurze Transaktion pro Stapel).
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch-translate") as executor:
+        running = {}
+
+        def fill():
+            while len(running) < concurrency and not (cancel_event and cancel_event.is_set()):
+                batch = next(batches, None)
+                if batch is None:
+                    return
+                running[executor.submit(chain.resolve_batch, batch[1],
+                                        LANG_CODES[batch[0]], LANG_CODES[trg_lang])] = batch
+
+        fill()
+        while running:
+            future = next(as_completed(running))
+            src_lang, words = running.pop(future)
+            try:
+                translations = future.result()
+                if len(translations) != len(words):
+                    raise ValueError(f"{len(translations)} Übersetzungen für {len(words)} Wörter")
+            except Exception as e:
+                print(f"Fehler bei der Stapel-Übersetzung ({src_lang}, {len(words)} Wörter): {e}")
+                repo.save_job_results(trg_lang, (), [(src_lang, word) for word in words], str(e))
+                result.failed += len(words)
+            else:
+                rows, failures = [], []
+                for word, (translation, provider) in zip(words, translations):
+                    translation = (translation or "").strip().lower()
+                    # Wörter, die sich selbst "übersetzen", gelten als nicht gefunden
+                    if translation and translation != word:
+                        rows.append((src_lang, word, translation, provider.source))
+                    else:
+                        failures.append((src_lang, word))
+                repo.save_job_results(trg_lang, rows, failures, "Keine Übersetzung")
+                result.translated += len(rows)
+                result.failed += len(failures)
+            if progress:
+                progress(result)
+            fill()
+
+    result.cancelled = bool(cancel_event and cancel_event.is_set())
+    result.exhausted = repo.count_exhausted_jobs(trg_lang, MAX_ATTEMPTS)
+    if apply and not result.cancelled:
+        result.inserted = repo.apply_translation_jobs(trg_lang, ONLINE_SOURCE)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fehlende Übersetzungen für eine Zielsprache stapelweise online ergänzen.")
+    parser.add_argument('--target-lang', required=True, choices=sorted(LANG_CODES), help="Zielsprache (z.B. Spanisch)")
+    parser.add_argument('--db', default=DB_NAME, help=f"SQLite-Datenbank (Standard: {DB_NAME})")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Wörter pro Anfrage")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help="Gleichzeitige Anfragen")
+    parser.add_argument('--no-apply', action='store_true',
+                        help="Ergebnisse nur vormerken, nicht in die Vokabeln übernehmen")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help=f"Wörter, die {MAX_ATTEMPTS}-mal gescheitert sind, erneut versuchen")
+
+    parser.add_argument('--providers', help=f"Provider-Reihenfolge, z.B. offline,googletrans "
+                                             f"(Standard: {','.join(PROVIDER_ORDER)})")
+    args = parser.parse_args(argv)
+
+    chain = default_chain(args.providers.split(',') if args.providers else None)
+    repo = VocabRepository(args.db)
+    repo.initialize()
+    start = time.perf_counter()
+    try:
+        result = batch_translate(
+            repo, args.target_lang, chain, batch_size=args.batch_size, concurrency=args.concurrency,
+            progress=lambda r: print(f"\r{r.translated}/{r.total} übersetzt, {r.failed} fehlgeschlagen", end=''),
+            apply=not args.no_apply, retry_failed=args.retry_failed)
+        exhausted = repo.fetch_exhausted_jobs(args.target_lang, MAX_ATTEMPTS, EXHAUSTED_SAMPLE)
+    except KeyboardInterrupt:
+        print("\nAbgebrochen – der nächste Aufruf setzt an dieser Stelle fort.")
+        return 1
+    finally:
+        repo.close()
+        chain.close()
+    print(f"\r{result} ({time.perf_counter() - start:.2f}s)")
+    if result.retried:
+        print(f"{result.retried} zuvor aufgegebene Wörter erneut versucht.")
+    if result.exhausted:
+        print(f"{result.exhausted} Wörter nach {MAX_ATTEMPTS} Versuchen aufgegeben, z.B.:")
+        for src_lang, word, error in exhausted:
+            print(f"  {word} ({src_lang}): {error or 'unbekannter Fehler'}")
+        print("Erneut versuchen mit --retry-failed.")
+    print(chain.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,515 @@
+# Sprachausgabe (TTS) als langlebiger Dienst für den Vokabeltrainer (SpT9)
+#===
+#
+# Bisher wurde bei jedem Klick auf "Vorlesen" ein neuer Thread gestartet,
+# pyttsx3.init() aufgerufen, alle Stimmen durchsucht und die Engine wieder
+# gestoppt – mehrere hundert Millisekunden pro Wort.
+#
+# TTSService besitzt EINEN Worker-Thread mit EINER Engine für die gesamte
+# Laufzeit. Aufträge (Text, Sprachcode) kommen über eine Warteschlange;
+# ein neuer Auftrag macht alle älteren ungültig: wartende werden übersprungen,
+# eine laufende Ausgabe wird abgebrochen. Nach jedem Auftrag wird
+# on_done(job, error) über dispatch (z.B. master.after) im GUI-Thread
+# aufgerufen.
+#
+# Audio-Cache: Jede Aussprache wird beim ersten Mal per save_to_file als
+# WAV-Datei unter AUDIO_CACHE_DIR gespeichert (Schlüssel = SHA-256 über
+# Text, Sprache, Stimme und Geschwindigkeit) und danach direkt von der Platte
+# abgespielt. Überschreitet der Cache AUDIO_CACHE_MAX_BYTES, werden die am
+# längsten nicht benutzten Dateien gelöscht (LRU über die Änderungszeit).
+# prewarm() rendert die nächsten Karten im Hintergrund vor (niedrigere
+# Priorität als Sprachaufträge).
+#
+# VoiceRegistry: Die Zuordnung Sprachcode -> Stimmen (nach Güte sortiert,
+# mit Ausweichstimmen) wird einmal aus den Stimmen der Engine berechnet und
+# in VOICE_REGISTRY_FILE gespeichert. Spätere Starts lesen nur die Datei,
+# ohne die (bei espeak-ng über 100) Stimmen erneut aufzuzählen. Lässt sich
+# eine gespeicherte Stimme nicht mehr setzen, wird die nächste versucht und
+# die Registry bei Bedarf neu aufgebaut.
+#
+# AUTOR: Rainer Liegard
+##########
+import hashlib
+import importlib.util
+import itertools
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+
+from vocab_db import LANG_CODES
+
+# pyttsx3 wird erst im TTS-Worker importiert (beim ersten Vorlesen/Vorrendern),
+# beim Start wird nur geprüft, ob es installiert ist.
+TTS_AVAILABLE = importlib.util.find_spec('pyttsx3') is not None
+if not TTS_AVAILABLE:
+    print("Warnung: pyttsx3 ist nicht installiert. Echte TTS ist deaktiviert. Bitte 'pip install pyttsx3' ausführen.")
+
+# Sprechgeschwindigkeit (Wörter pro Minute)
+TTS_RATE = 150
+# Audio-Cache (Verzeichnis neben den Skripten, Obergrenze in Bytes)
+AUDIO_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_cache")
+AUDIO_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# Nach dem Aufräumen bleibt der Cache bei diesem Anteil der Obergrenze
+AUDIO_CACHE_LOW_WATER = 0.9
+AUDIO_EXT = ".wav"
+# Gespeicherte Stimmen-Zuordnung (Version erhöhen, wenn sich das Ranking ändert)
+VOICE_REGISTRY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "voice_registry.json")
+VOICE_REGISTRY_VERSION = 1
+# Sprachnamen, wie sie in Stimmen-Namen vorkommen (z.B. "Microsoft Hedda Desktop - German")
+VOICE_LANGUAGE_NAMES = {
+    'de': ('german', 'deutsch'),
+    'en': ('english',),
+    'fr': ('french', 'français', 'francais'),
+    'it': ('italian', 'italiano'),
+    'es': ('spanish', 'español', 'espanol'),
+}
+# Prioritäten der Warteschlange (kleiner = zuerst)
+PRIORITY_STOP = 0
+PRIORITY_SPEAK = 1
+PRIORITY_PREWARM = 2
+
+
+class AudioCache:
+    """Inhaltsadressierter Datei-Cache für gerenderte Aussprachen mit LRU-Größenbegrenzung."""
+    def __init__(self, directory=AUDIO_CACHE_DIR, max_bytes=AUDIO_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._sizes = None   # Pfad -> Größe (beim ersten Zugriff eingelesen)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text, lang_code, voice, rate):
+        data = "\0".join([text, lang_code or "", voice or "default", str(rate)])
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        # Zwei Zeichen als Unterverzeichnis, damit kein Ordner zu groß wird
+        return os.path.join(self.directory, key[:2], key + AUDIO_EXT)
+
+    def _scan(self):
+        if self._sizes is not None:
+            return
+        self._sizes, self._total = {}, 0
+        if not os.path.isdir(self.directory):
+            return
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(AUDIO_EXT):
+                    size = entry.stat().st_size
+                    self._sizes[entry.path] = size
+                    self._total += size
+
+    def get(self, key):
+        """Pfad der gecachten Datei oder None. Ein Treffer zählt als Benutzung (LRU)."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, render):
+        """Erzeugt die Datei mit render(tmp_path) und nimmt sie in den Cache auf."""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp{AUDIO_EXT}"
+        try:
+            render(tmp_path)
+            if not os.path.exists(tmp_path) or os.path.getsize(tmp_path) == 0:
+                raise OSError("Die TTS-Engine hat keine Audiodatei erzeugt.")
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self._scan()
+            size = os.path.getsize(path)
+            self._total += size - self._sizes.get(path, 0)
+            self._sizes[path] = size
+            if self._total > self.max_bytes:
+                self._evict()
+        return path
+
+    def _evict(self):
+        """Löscht die am längsten nicht benutzten Dateien bis unter die Niedrigmarke."""
+        target = self.max_bytes * AUDIO_CACHE_LOW_WATER
+        by_age = []
+        for path in self._sizes:
+            try:
+                by_age.append((os.path.getmtime(path), path))
+            except OSError:
+                by_age.append((0, path))
+        by_age.sort()
+        for _, path in by_age:
+            if self._total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError as e:
+                if os.path.exists(path):
+                    print(f"Warnung: Konnte Audio-Cache-Datei nicht löschen: {e}")
+                    continue
+            self._total -= self._sizes.pop(path)
+
+    def size(self):
+        """Gesamtgröße des Caches in Bytes."""
+        with self._lock:
+            self._scan()
+            return self._total
+
+
+def _voice_languages(languages):
+    """Normalisiert die Sprachangaben einer Stimme ('en_US', b'\\x05en-gb') zu ['en-us', 'en-gb']."""
+    result = []
+    for language in languages or ():
+        if isinstance(language, bytes):
+            # espeak liefert ein Prioritäts-Byte vor dem Code
+            language = language.lstrip(bytes(range(32))).decode('latin-1')
+        result.append(str(language).strip().lower().replace('_', '-'))
+    return result
+
+
+def _tokens(text):
+    return set(''.join(c if c.isalnum() else ' ' for c in text.lower()).split())
+
+
+def rank_voices(voices, lang_code):
+    """Stimmen-IDs für einen Sprachcode, beste zuerst.
+
+    voices: [{'id': ..., 'name': ..., 'languages': [...]}]. Bewertung:
+    2 = Sprachangabe der Stimme passt, 1 = Code/Sprachname als eigenes Wort in
+    ID oder Name. Die frühere Teilstring-Suche entfällt ('de' passte z.B. auf
+    "Desktop", 'it' auf "United States").
+    """
+    lang_code = lang_code.lower()
+    names = VOICE_LANGUAGE_NAMES.get(lang_code, ())
+    scored = []
+    for position, voice in enumerate(voices):
+        tokens = _tokens(f"{voice['id']} {voice['name']}")
+        if any(lang == lang_code or lang.startswith(lang_code + '-') for lang in voice['languages']):
+            score = 2
+        elif lang_code in tokens or any(name in tokens for name in names):
+            score = 1
+        else:
+            continue
+        scored.append((-score, position, voice['id']))
+    scored.sort()
+    return [voice_id for _, _, voice_id in scored]
+
+
+class VoiceRegistry:
+    """Sprachcode -> nach Güte sortierte Stimmen-IDs, gespeichert als JSON."""
+    def __init__(self, path=VOICE_REGISTRY_FILE, lang_codes=None):
+        self.path = path
+        self.lang_codes = sorted(set(lang_codes or LANG_CODES.values()))
+        self.voices = None   # [{'id', 'name', 'languages'}]
+        self.ranked = {}     # Sprachcode -> [Stimmen-ID, ...]
+
+    def load(self):
+        """Liest die gespeicherte Registry. Gibt False zurück, wenn sie fehlt oder nicht passt."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != VOICE_REGISTRY_VERSION or data.get('platform') != sys.platform:
+            return False
+        self.voices = data['voices']
+        self.ranked = data['ranked']
+        return True
+
+    def build(self, engine_voices):
+        """Baut die Registry aus engine.getProperty('voices') und speichert sie."""
+        self.voices = [{'id': v.id, 'name': v.name or "", 'languages': _voice_languages(getattr(v, 'languages', ()))}
+                       for v in engine_voices]
+        self.ranked = {code: rank_voices(self.voices, code) for code in self.lang_codes}
+        self.save()
+
+    def save(self):
+        data = {'version': VOICE_REGISTRY_VERSION, 'platform': sys.platform,
+                'voices': self.voices, 'ranked': self.ranked}
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warnung: Konnte die Stimmen-Registry nicht speichern: {e}")
+
+    def candidates(self, lang_code):
+        """Stimmen-IDs für einen Sprachcode (beste zuerst); unbekannte Codes werden nachberechnet."""
+        if lang_code not in self.ranked:
+            self.ranked[lang_code] = rank_voices(self.voices or [], lang_code)
+        return self.ranked[lang_code]
+
+
+class AudioPlayer:
+    """Spielt WAV-Dateien ab (winsound unter Windows, sonst afplay/paplay/aplay)."""
+    def __init__(self):
+        self._process = None
+        self._lock = threading.Lock()
+        self.command = None
+        if sys.platform != 'win32':
+            for command in ('afplay', 'paplay', 'aplay'):
+                if shutil.which(command):
+                    self.command = command
+                    break
+
+    def available(self):
+        return sys.platform == 'win32' or self.command is not None
+
+    def play(self, path):
+        """Spielt die Datei ab und blockiert bis zum Ende (oder bis stop())."""
+        if sys.platform == 'win32':
+            import winsound
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_NODEFAULT)
+            return
+        args = [self.command, path] if self.command != 'aplay' else [self.command, '-q', path]
+        process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with self._lock:
+            self._process = process
+        try:
+            process.wait()
+        finally:
+            with self._lock:
+                self._process = None
+
+    def stop(self):
+        """Bricht eine laufende Wiedergabe ab (aus jedem Thread aufrufbar)."""
+        if sys.platform == 'win32':
+            import winsound
+            winsound.PlaySound(None, 0)
+            return
+        with self._lock:
+            if self._process is not None:
+                self._process.terminate()
+
+
+class TTSJob:
+    """Ein Sprach- oder Vorab-Render-Auftrag."""
+    def __init__(self, text, lang_code, on_done, generation, prewarm=False):
+        self.text = text
+        self.lang_code = lang_code
+        self.on_done = on_done
+        self.generation = generation
+        self.prewarm = prewarm
+        self.cancelled = False
+
+
+class TTSService:
+    """Ein Worker-Thread mit einer pyttsx3-Engine für die gesamte Laufzeit.
+
+    pyttsx3-Engines sind an den Thread gebunden, der sie erzeugt – deshalb
+    wird die Engine erst im Worker initialisiert und nur dort benutzt.
+    Ohne cache (oder ohne Abspielprogramm) wird direkt über die Engine gesprochen.
+    """
+    def __init__(self, dispatch, rate=TTS_RATE, cache=None, player=None, registry=None):
+        self.dispatch = dispatch
+        self.rate = rate
+        self.registry = registry or VoiceRegistry()
+        self.cache = cache
+        self.player = player or AudioPlayer()
+        if self.cache is not None and not self.player.available():
+            print("Hinweis: Kein Abspielprogramm gefunden (afplay/paplay/aplay). Audio-Cache ist deaktiviert.")
+            self.cache = None
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._generation = 0
+        self._prewarm_generation = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._engine = None
+        self._voices = {}        # Sprachcode -> gesetzte Stimmen-ID (memoisiert)
+        self._default_voice = None
+        self._current_voice = None
+        self._current = None     # laufender Sprachauftrag
+        self._rendering = None   # Text für _render (save_to_file)
+        self._shutdown = False
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="tts", daemon=True)
+            self._thread.start()
+
+    def _put(self, priority, job):
+        self._queue.put((priority, next(self._seq), job))
+
+    def speak(self, text, lang_code, on_done=None):
+        """Reiht einen Auftrag ein und macht alle älteren ungültig. Gibt den TTSJob zurück."""
+        if self._shutdown:
+            return None
+        with self._lock:
+            self._generation += 1
+            job = TTSJob(text, lang_code, on_done, self._generation)
+            self._ensure_worker()
+        self._put(PRIORITY_SPEAK, job)
+        return job
+
+    def prewarm(self, items):
+        """Rendert [(Text, Sprachcode), ...] im Hintergrund in den Audio-Cache.
+        Ein neuer Aufruf ersetzt noch nicht erledigte ältere Vorab-Aufträge."""
+        if self._shutdown or self.cache is None:
+            return
+        with self._lock:
+            self._prewarm_generation += 1
+            generation = self._prewarm_generation
+            self._ensure_worker()
+        for text, lang_code in items:
+            self._put(PRIORITY_PREWARM, TTSJob(text, lang_code, None, generation, prewarm=True))
+
+    def cancel(self):
+        """Bricht die laufende und alle wartenden Ausgaben ab."""
+        with self._lock:
+            self._generation += 1
+            current = self._current
+        if current is not None:
+            current.cancelled = True
+            self.player.stop()
+
+    def warm_up(self):
+        """Initialisiert Engine und Stimmen-Registry vorab im Worker (z.B. beim Start)."""
+        if self._shutdown:
+            return
+        with self._lock:
+            self._ensure_worker()
+        # generation=None: wird von neueren Aufträgen nicht ungültig
+        self._put(PRIORITY_PREWARM, TTSJob(None, None, None, None, prewarm=True))
+
+    def _stale(self, job):
+        if job.generation is None:
+            return False
+        if job.prewarm:
+            return job.generation != self._prewarm_generation
+        return job.generation != self._generation
+
+    #--- Worker-Thread
+    def _init_engine(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty('rate', self.rate)
+        # Callback pro gesprochenem Wort: veraltete Ausgaben abbrechen
+        engine.connect('started-word', self._on_word)
+        self._default_voice = engine.getProperty('voice')
+        # Stimmen nur aufzählen, wenn keine passende gespeicherte Registry existiert
+        if not self.registry.load():
+            self.registry.build(engine.getProperty('voices'))
+        return engine
+
+    def _set_voice(self, voice):
+        if voice != self._current_voice:
+            self._engine.setProperty('voice', voice)
+            self._current_voice = voice
+
+    def _use_voice(self, lang_code):
+        """Setzt die beste Stimme für den Sprachcode und gibt ihre ID zurück (oder None)."""
+        if not lang_code:
+            return None
+        voice = self._voices.get(lang_code)
+        if voice is not None:
+            self._set_voice(voice)
+            return voice
+        for rebuilt in (False, True):
+            for voice in self.registry.candidates(lang_code):
+                try:
+                    self._set_voice(voice)
+                except Exception as e:
+                    print(f"Hinweis: Stimme '{voice}' nicht verfügbar ({e}), versuche die nächste.")
+                    continue
+                self._voices[lang_code] = voice
+                return voice
+            # Gespeicherte Stimmen passen nicht mehr (z.B. Stimme deinstalliert): neu aufzählen
+            if rebuilt or not self.registry.candidates(lang_code):
+                break
+            self.registry.build(self._engine.getProperty('voices'))
+        # Keine passende Stimme: Standardstimme statt der Stimme der vorherigen Sprache
+        if self._default_voice:
+            self._set_voice(self._default_voice)
+        return None
+
+    def _on_word(self, name, location, length):
+        job = self._current
+        # Beim Rendern nicht abbrechen – sonst landet eine halbe Datei im Cache
+        if job is not None and self._rendering is None and self._stale(job):
+            job.cancelled = True
+            self._engine.stop()
+
+    def _render(self, path):
+        self._engine.save_to_file(self._rendering, path)
+        self._engine.runAndWait()
+
+    def _cached_file(self, job, voice):
+        """Liefert die Audiodatei des Auftrags (rendert sie beim ersten Mal)."""
+        key = AudioCache.key(job.text, job.lang_code, voice, self.rate)
+        path = self.cache.get(key)
+        if path is None:
+            self._rendering = job.text
+            try:
+                path = self.cache.put(key, self._render)
+            finally:
+                self._rendering = None
+        return path
+
+    def _run(self, job):
+        if self._engine is None:
+            self._engine = self._init_engine()
+        if job.text is None:
+            return
+        voice = self._use_voice(job.lang_code)
+        if job.prewarm:
+            self._cached_file(job, voice)
+            return
+        self._current = job
+        try:
+            path = None
+            if self.cache is not None:
+                try:
+                    path = self._cached_file(job, voice)
+                except Exception as e:
+                    print(f"Warnung: Audio-Cache nicht nutzbar, spreche direkt: {e}")
+            if job.cancelled or self._stale(job):
+                job.cancelled = True
+            elif path is not None:
+                self.player.play(path)
+            else:
+                self._engine.say(job.text)
+                self._engine.runAndWait()
+        finally:
+            self._current = None
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                break
+            error = None
+            if self._stale(job):
+                job.cancelled = True
+            else:
+                try:
+                    self._run(job)
+                except Exception as e:
+                    print(f"Fehler im TTS-Thread: {e}")
+                    error = e
+            if job.on_done and not self._shutdown:
+                self.dispatch(lambda job=job, error=error: job.on_done(job, error))
+        if self._engine is not None:
+            try:
+                self._engine.stop()
+            except Exception as e:
+                print(f"Warnung: Konnte die TTS-Engine nicht stoppen: {e}")
+
+    def shutdown(self):
+        """Beendet den Worker (laufende Ausgabe wird abgebrochen)."""
+        self._shutdown = True
+        self.cancel()
+        with self._lock:
+            self._prewarm_generation += 1
+        if self._thread is not None:
+            self._put(PRIORITY_STOP, None)
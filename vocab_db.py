@@ -0,0 +1,597 @@
+# Datenbank-Zugriffsschicht für den Vokabeltrainer (SpT9)
+#===
+#
+# Kapselt alle Zugriffe auf die SQLite-Datenbank vokabeln.db in der Klasse
+# VocabRepository. Statt für jeden Tastendruck eine neue Verbindung zu öffnen,
+# hält das Repository pro Thread EINE langlebige Verbindung offen:
+#
+#  - GUI-Thread: eine Verbindung für die gesamte Laufzeit
+#  - Worker-Threads (TTS/Übersetzung): je eine eigene Verbindung (threading.local)
+#
+# Alle SQL-Anweisungen sind als Konstanten hinterlegt. sqlite3 hält pro
+# Verbindung einen Cache vorbereiteter Statements (cached_statements) – bei
+# identischem SQL-Text wird das Statement nicht erneut geparst.
+#
+# Beim Beenden der App (on_closing) schließt close() alle Verbindungen.
+#
+# Schema-Migrationen: Die Liste MIGRATIONS wird über PRAGMA user_version
+# versioniert. Beim Start werden nur die noch fehlenden Schritte auf eine
+# bestehende vokabeln.db angewendet (in-place, ohne Neuaufbau).
+#
+# PairIndex hält alle Vokabeln im Speicher, gruppiert nach Sprachpaar, damit
+# next_word ohne Tabellen-Scan in O(1) ein zufälliges Wort ziehen kann.
+#
+# AUTOR: Rainer Liegard
+##########
+import random
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_NAME = "vokabeln.db"
+# Sprachenliste für Comboboxen
+LANGUAGES = ["Deutsch", "Englisch", "Französisch", "Italienisch", "Spanisch"]
+# Map für Googletrans Codes
+LANG_CODES = {
+    "Englisch": "en", "Deutsch": "de", "Italienisch": "it",
+    "Spanisch": "es", "Französisch": "fr"
+}
+# WAL erlaubt gleichzeitiges Lesen (GUI) und Schreiben (Worker-Threads).
+# Hinweis: Auf Netzlaufwerken ohne Shared-Memory-Unterstützung kann SQLite
+# WAL ablehnen – dann bleibt der bisherige Journal-Modus aktiv.
+USE_WAL = True
+# Größe des Statement-Caches pro Verbindung
+STATEMENT_CACHE_SIZE = 128
+# Wartezeit (Sekunden), falls die Datenbank von einem anderen Thread gesperrt ist
+BUSY_TIMEOUT = 10
+
+#--- SQL-ANWEISUNGEN (Prepared Statements)
+SQL_CREATE_VOCABULARY = """
+    CREATE TABLE IF NOT EXISTS vocabulary (
+        id INTEGER PRIMARY KEY,
+        source_word TEXT NOT NULL,
+        source_lang TEXT NOT NULL,
+        target_lang TEXT NOT NULL,
+        target_word TEXT NOT NULL,
+        source TEXT NOT NULL,
+        UNIQUE (source_word, source_lang, target_lang)
+    )
+"""
+
+#--- SCHEMA-MIGRATIONEN (Version = Position in der Liste, nur anhängen!)
+MIGRATIONS = [
+    # 1: Grundschema (bestehende Datenbanken haben user_version 0)
+    (SQL_CREATE_VOCABULARY,),
+    # 2: Covering-Indizes
+    #    - Übungsliste je Paar: WHERE source_lang = ? AND target_lang = ?
+    #    - Vokabel-Manager:     ORDER BY source_lang, source_word
+    ("""CREATE INDEX IF NOT EXISTS idx_vocabulary_pair
+        ON vocabulary (source_lang, target_lang, source_word, target_word)""",
+     """CREATE INDEX IF NOT EXISTS idx_vocabulary_manager
+        ON vocabulary (source_lang, source_word, target_lang, target_word)"""),
+    # 3: Lernstand (Spaced Repetition) und Antwort-Protokoll
+    ("""CREATE TABLE IF NOT EXISTS lernfortschritt (
+            vokabel_id INTEGER PRIMARY KEY REFERENCES vocabulary(id) ON DELETE CASCADE,
+            wiederholungen INTEGER NOT NULL DEFAULT 0,
+            ease REAL NOT NULL DEFAULT 2.5,
+            interval_days REAL NOT NULL DEFAULT 0,
+            due_at REAL NOT NULL DEFAULT 0,
+            lapses INTEGER NOT NULL DEFAULT 0,
+            last_review REAL
+        )""",
+     "CREATE INDEX IF NOT EXISTS idx_lernfortschritt_due ON lernfortschritt (due_at)",
+     """CREATE TABLE IF NOT EXISTS answer_log (
+            id INTEGER PRIMARY KEY,
+            vokabel_id INTEGER NOT NULL REFERENCES vocabulary(id) ON DELETE CASCADE,
+            answered_at REAL NOT NULL,
+            correct INTEGER NOT NULL,
+            quality INTEGER NOT NULL
+        )""",
+     "CREATE INDEX IF NOT EXISTS idx_answer_log_vokabel ON answer_log (vokabel_id)"),
+    # 4: Zwischenstand der Stapel-Übersetzung (translation.batch_translate, Fortsetzen nach Absturz)
+    ("""CREATE TABLE IF NOT EXISTS translation_jobs (
+            source_lang TEXT NOT NULL,
+            source_word TEXT NOT NULL,
+            target_lang TEXT NOT NULL,
+            target_word TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            PRIMARY KEY (source_lang, source_word, target_lang)
+        ) WITHOUT ROWID""",),
+    # 5: Herkunft (Provider) je übersetztem Auftrag
+    ("ALTER TABLE translation_jobs ADD COLUMN source TEXT",),
+    # 6: Ergebnis-Cache der Übersetzungsdienste (translation.TranslationCache), auch für
+    #    Fehlschläge (outcome != 'hit', translation NULL) mit wachsender Sperrzeit
+    ("""CREATE TABLE IF NOT EXISTS translation_cache (
+            src_code TEXT NOT NULL,
+            trg_code TEXT NOT NULL,
+            text TEXT NOT NULL,
+            translation TEXT,
+            provider TEXT,
+            outcome TEXT NOT NULL,
+            failures INTEGER NOT NULL DEFAULT 0,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (src_code, trg_code, text)
+        ) WITHOUT ROWID""",),
+]
+
+SQL_HAS_ANY = "SELECT 1 FROM vocabulary LIMIT 1"
+# Sekundäre Indizes (Migration 2) – werden beim Massen-Laden abgebaut und danach
+# in einem Durchgang neu erstellt, statt bei jeder Zeile mitgepflegt zu werden
+SECONDARY_INDEXES = ("idx_vocabulary_pair", "idx_vocabulary_manager")
+# Seiten-Cache in KiB während des Massen-Ladens (SQLite-Standard: 2000 KiB)
+BULK_CACHE_KIB = 262144
+SQL_INSERT_IGNORE = """
+    INSERT OR IGNORE INTO vocabulary (source_word, source_lang, target_lang, target_word, source)
+    VALUES (?, ?, ?, ?, ?)
+"""
+SQL_INSERT = """
+    INSERT INTO vocabulary (source_word, source_lang, target_lang, target_word, source)
+    VALUES (?, ?, ?, ?, ?)
+"""
+SQL_GET_TRANSLATION = """
+    SELECT target_word FROM vocabulary
+    WHERE source_lang = ? AND source_word = ? AND target_lang = ?
+"""
+SQL_FETCH_PAIR = """
+    SELECT source_word, target_word FROM vocabulary
+    WHERE source_lang = ? AND target_lang = ?
+"""
+SQL_FETCH_INDEX = """
+    SELECT id, source_lang, source_word, target_lang, target_word FROM vocabulary
+"""
+SQL_FETCH_ALL = """
+    SELECT id, source_lang, source_word, target_lang, target_word FROM vocabulary
+    ORDER BY source_lang, source_word, target_lang
+"""
+# Keyset-Pagination für den Vokabel-Manager: (source_lang, source_word, target_lang)
+# ist eindeutig (UNIQUE-Constraint) und wird von idx_vocabulary_manager abgedeckt.
+SQL_FETCH_FIRST_PAGE = """
+    SELECT id, source_lang, source_word, target_lang, target_word FROM vocabulary
+    ORDER BY source_lang, source_word, target_lang
+    LIMIT ?
+"""
+SQL_FETCH_PAGE = """
+    SELECT id, source_lang, source_word, target_lang, target_word FROM vocabulary
+    WHERE (source_lang, source_word, target_lang) > (?, ?, ?)
+    ORDER BY source_lang, source_word, target_lang
+    LIMIT ?
+"""
+SQL_COUNT = "SELECT COUNT(*) FROM vocabulary"
+SQL_UPDATE = """
+    UPDATE vocabulary SET
+    source_lang = ?,
+    source_word = ?,
+    target_lang = ?,
+    target_word = ?
+    WHERE id = ?
+"""
+SQL_DELETE = "DELETE FROM vocabulary WHERE id = ?"
+SQL_FETCH_PROGRESS = """
+    SELECT vokabel_id, wiederholungen, ease, interval_days, due_at, lapses FROM lernfortschritt
+"""
+SQL_UPSERT_PROGRESS = """
+    INSERT INTO lernfortschritt (vokabel_id, wiederholungen, ease, interval_days, due_at, lapses, last_review)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (vokabel_id) DO UPDATE SET
+    wiederholungen = excluded.wiederholungen,
+    ease = excluded.ease,
+    interval_days = excluded.interval_days,
+    due_at = excluded.due_at,
+    lapses = excluded.lapses,
+    last_review = excluded.last_review
+"""
+SQL_INSERT_ANSWER = """
+    INSERT INTO answer_log (vokabel_id, answered_at, correct, quality) VALUES (?, ?, ?, ?)
+"""
+
+# Stapel-Übersetzung: alle Wörter, denen die Übersetzung in die Zielsprache fehlt
+SQL_STAGE_JOBS = """
+    INSERT OR IGNORE INTO translation_jobs (source_lang, source_word, target_lang)
+    SELECT DISTINCT v.source_lang, v.source_word, ?1 FROM vocabulary v
+    WHERE v.source_lang != ?1 AND NOT EXISTS (
+        SELECT 1 FROM vocabulary t
+        WHERE t.source_lang = v.source_lang AND t.source_word = v.source_word AND t.target_lang = ?1)
+"""
+SQL_FETCH_OPEN_JOBS = """
+    SELECT source_lang, source_word FROM translation_jobs
+    WHERE target_lang = ? AND target_word IS NULL AND attempts < ?
+    ORDER BY source_lang, source_word
+"""
+# Aufträge, die MAX_ATTEMPTS-mal fehlgeschlagen sind (werden nicht mehr versucht)
+SQL_FETCH_EXHAUSTED_JOBS = """
+    SELECT source_lang, source_word, error FROM translation_jobs
+    WHERE target_lang = ? AND target_word IS NULL AND attempts >= ?
+    ORDER BY source_lang, source_word LIMIT ?
+"""
+SQL_COUNT_EXHAUSTED_JOBS = """
+    SELECT COUNT(*) FROM translation_jobs WHERE target_lang = ? AND target_word IS NULL AND attempts >= ?
+"""
+SQL_RESET_EXHAUSTED_JOBS = """
+    UPDATE translation_jobs SET attempts = 0, error = NULL
+    WHERE target_lang = ? AND target_word IS NULL AND attempts >= ?
+"""
+SQL_COUNT_JOBS = """
+    SELECT COUNT(*), COUNT(target_word) FROM translation_jobs WHERE target_lang = ?
+"""
+SQL_SAVE_JOB = """
+    UPDATE translation_jobs SET target_word = ?, source = ?, attempts = attempts + 1, error = NULL
+    WHERE source_lang = ? AND source_word = ? AND target_lang = ?
+"""
+SQL_FAIL_JOB = """
+    UPDATE translation_jobs SET attempts = attempts + 1, error = ?
+    WHERE source_lang = ? AND source_word = ? AND target_lang = ?
+"""
+SQL_APPLY_JOBS = """
+    INSERT OR IGNORE INTO vocabulary (source_word, source_lang, target_lang, target_word, source)
+    SELECT source_word, source_lang, target_lang, target_word, COALESCE(source, ?) FROM translation_jobs
+    WHERE target_lang = ? AND target_word IS NOT NULL
+"""
+SQL_DELETE_DONE_JOBS = """
+    DELETE FROM translation_jobs WHERE target_lang = ? AND target_word IS NOT NULL
+"""
+SQL_GET_CACHED = """
+    SELECT translation, provider, outcome, failures, expires_at FROM translation_cache
+    WHERE src_code = ? AND trg_code = ? AND text = ?
+"""
+SQL_PUT_CACHED = """
+    INSERT OR REPLACE INTO translation_cache
+    (src_code, trg_code, text, translation, provider, outcome, failures, expires_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_PURGE_CACHE = "DELETE FROM translation_cache WHERE expires_at < ?"
+
+
+class VocabRepository:
+    """Repository für die Tabelle vocabulary.
+
+    Jeder Thread erhält beim ersten Zugriff eine eigene, langlebige Verbindung,
+    die bis zum Aufruf von close() wiederverwendet wird.
+    """
+    def __init__(self, db_name=DB_NAME):
+        self.db_name = db_name
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        """Öffnet eine neue Verbindung und setzt die Pragmas."""
+        # check_same_thread=False, damit close() beim Beenden auch Verbindungen
+        # der Worker-Threads schließen darf. Benutzt wird jede Verbindung nur
+        # von ihrem eigenen Thread.
+        conn = sqlite3.connect(self.db_name, timeout=BUSY_TIMEOUT,
+                               cached_statements=STATEMENT_CACHE_SIZE,
+                               check_same_thread=False)
+        if USE_WAL:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @property
+    def conn(self):
+        """Liefert die Verbindung des aktuellen Threads (wird bei Bedarf geöffnet)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            with self._lock:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Das Repository wurde bereits geschlossen.")
+                conn = self._connect()
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def release(self):
+        """Schließt die Verbindung des aktuellen Threads (am Ende eines Worker-Threads aufrufen)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def close(self):
+        """Schließt alle offenen Verbindungen (Shutdown-Hook für on_closing)."""
+        with self._lock:
+            self._closed = True
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                print(f"Warnung: Konnte DB-Verbindung nicht schließen: {e}")
+
+    #--- Schema
+    def schema_version(self):
+        """Aktuelle Schema-Version (PRAGMA user_version)."""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self):
+        """Wendet alle noch fehlenden Migrationen an. Gibt die neue Version zurück."""
+        conn = self.conn
+        version = self.schema_version()
+        for new_version, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            try:
+                conn.execute("BEGIN")
+                for statement in statements:
+                    conn.execute(statement)
+                # PRAGMA erlaubt keine Parameter – new_version ist ein int aus enumerate
+                conn.execute(f"PRAGMA user_version = {new_version}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            version = new_version
+        return version
+
+    def initialize(self, initial_data=()):
+        """Bringt das Schema auf den neuesten Stand und befüllt es beim ersten Start mit initial_data."""
+        conn = self.conn
+        self.migrate()
+        if not conn.execute(SQL_HAS_ANY).fetchone():
+            with conn:
+                conn.executemany(SQL_INSERT_IGNORE, [
+                    (word.lower(), src_lang, trg_lang, trg_word.lower(), 'DB')
+                    for word, src_lang, trg_lang, trg_word in initial_data
+                ])
+
+    #--- Lesen
+    def get_translation(self, word, src_lang, trg_lang):
+        """Gibt die gespeicherte Übersetzung zurück oder None."""
+        row = self.conn.execute(SQL_GET_TRANSLATION, (src_lang, word, trg_lang)).fetchone()
+        return row[0] if row else None
+
+    def fetch_pair(self, src_lang, trg_lang):
+        """Alle (source_word, target_word) eines Sprachpaares."""
+        return self.conn.execute(SQL_FETCH_PAIR, (src_lang, trg_lang)).fetchall()
+
+    def fetch_index_rows(self):
+        """Alle Vokabeln (unsortiert) für den Aufbau des PairIndex."""
+        return self.conn.execute(SQL_FETCH_INDEX).fetchall()
+
+    def fetch_all(self):
+        """Alle Vokabeln für den Vokabel-Manager (sortiert)."""
+        return self.conn.execute(SQL_FETCH_ALL).fetchall()
+
+    def fetch_page(self, after_key=None, limit=500):
+        """Eine Seite des Vokabel-Managers nach dem Schlüssel (source_lang, source_word, target_lang)."""
+        if after_key is None:
+            return self.conn.execute(SQL_FETCH_FIRST_PAGE, (limit,)).fetchall()
+        return self.conn.execute(SQL_FETCH_PAGE, (*after_key, limit)).fetchall()
+
+    def count(self):
+        """Gesamtzahl der Vokabeln."""
+        return self.conn.execute(SQL_COUNT).fetchone()[0]
+
+    def fetch_progress(self):
+        """Gespeicherter Lernstand aller Karten (für den ReviewScheduler)."""
+        return self.conn.execute(SQL_FETCH_PROGRESS).fetchall()
+
+    #--- Schreiben
+    def insert_ignore(self, word, src_lang, trg_lang, trg_word, source):
+        """Fügt eine Vokabel ein, falls sie noch nicht existiert.
+        Gibt die neue ID zurück oder None, wenn die Vokabel schon vorhanden war.
+        """
+        with self.conn:
+            cursor = self.conn.execute(SQL_INSERT_IGNORE, (word, src_lang, trg_lang, trg_word, source))
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def insert_many(self, rows, source):
+        """Fügt viele (source_word, source_lang, target_lang, target_word) in EINER Transaktion ein.
+        Bestehende Vokabeln (UNIQUE-Schlüssel) werden übersprungen. Gibt die Anzahl neuer Zeilen zurück.
+        """
+        conn = self.conn
+        before = conn.total_changes
+        with conn:
+            conn.executemany(SQL_INSERT_IGNORE, [(w, sl, tl, tw, source) for w, sl, tl, tw in rows])
+        return conn.total_changes - before
+
+    @contextmanager
+    def bulk_load(self):
+        """Schneller Pfad für sehr große Importe (Millionen Zeilen) auf der Verbindung dieses Threads.
+
+        Schaltet fsync ab (synchronous=OFF), vergrößert den Seiten-Cache und entfernt die
+        sekundären Indizes; am Ende werden diese in einem Durchgang neu aufgebaut.
+        Bei einem Absturz während des Ladens kann die Datenbank beschädigt werden – nur
+        für Testdaten bzw. neu erzeugte Datenbanken verwenden.
+        """
+        conn = self.conn
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute(f"PRAGMA cache_size=-{BULK_CACHE_KIB}")
+        with conn:
+            for name in SECONDARY_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+        try:
+            yield self
+        finally:
+            with conn:
+                for statement in MIGRATIONS[1]:
+                    conn.execute(statement)
+            conn.execute("PRAGMA cache_size=-2000")
+            conn.execute("PRAGMA synchronous=NORMAL" if USE_WAL else "PRAGMA synchronous=FULL")
+
+    def add(self, word, src_lang, trg_lang, trg_word, source='Manuell'):
+        """Fügt eine Vokabel ein. Löst sqlite3.IntegrityError bei Duplikaten aus."""
+        with self.conn:
+            cursor = self.conn.execute(SQL_INSERT, (word, src_lang, trg_lang, trg_word, source))
+        return cursor.lastrowid
+
+    def update(self, vocab_id, src_lang, word, trg_lang, trg_word):
+        """Aktualisiert eine bestehende Vokabel."""
+        with self.conn:
+            self.conn.execute(SQL_UPDATE, (src_lang, word, trg_lang, trg_word, vocab_id))
+
+    def delete(self, vocab_id):
+        """Löscht eine Vokabel (Lernstand und Protokoll werden per CASCADE mitgelöscht)."""
+        with self.conn:
+            self.conn.execute(SQL_DELETE, (vocab_id,))
+
+    def log_answer(self, vocab_id, answered_at, correct, quality):
+        """Protokolliert eine Antwort in answer_log."""
+        with self.conn:
+            self.conn.execute(SQL_INSERT_ANSWER, (vocab_id, answered_at, int(correct), quality))
+
+    def record_review(self, vocab_id, state, answered_at, correct, quality):
+        """Speichert den neuen Lernstand und protokolliert die Antwort (eine Transaktion)."""
+        with self.conn:
+            self.conn.execute(SQL_UPSERT_PROGRESS, (vocab_id, state.repetitions, state.ease,
+                                                    state.interval_days, state.due_at,
+                                                    state.lapses, answered_at))
+            self.conn.execute(SQL_INSERT_ANSWER, (vocab_id, answered_at, int(correct), quality))
+
+    #--- Stapel-Übersetzung (translation_jobs)
+    def stage_translation_jobs(self, trg_lang):
+        """Legt für jedes Wort ohne Übersetzung nach trg_lang einen Auftrag an (dedupliziert).
+        Bereits vorhandene Aufträge (z.B. eines abgebrochenen Laufs) bleiben erhalten.
+        Gibt die Anzahl neuer Aufträge zurück.
+        """
+        conn = self.conn
+        before = conn.total_changes
+        with conn:
+            conn.execute(SQL_STAGE_JOBS, (trg_lang,))
+        return conn.total_changes - before
+
+    def fetch_open_jobs(self, trg_lang, max_attempts):
+        """Noch nicht übersetzte Aufträge als (source_lang, source_word)."""
+        return self.conn.execute(SQL_FETCH_OPEN_JOBS, (trg_lang, max_attempts)).fetchall()
+
+    def fetch_exhausted_jobs(self, trg_lang, max_attempts, limit):
+        """Aufgegebene Aufträge (max_attempts Fehlschläge) als (source_lang, source_word, error)."""
+        return self.conn.execute(SQL_FETCH_EXHAUSTED_JOBS, (trg_lang, max_attempts, limit)).fetchall()
+
+    def count_exhausted_jobs(self, trg_lang, max_attempts):
+        return self.conn.execute(SQL_COUNT_EXHAUSTED_JOBS, (trg_lang, max_attempts)).fetchone()[0]
+
+    def reset_exhausted_jobs(self, trg_lang, max_attempts):
+        """Gibt aufgegebene Aufträge für einen neuen Versuch frei. Gibt ihre Anzahl zurück."""
+        with self.conn:
+            return self.conn.execute(SQL_RESET_EXHAUSTED_JOBS, (trg_lang, max_attempts)).rowcount
+
+    def count_translation_jobs(self, trg_lang):
+        """(Aufträge gesamt, davon übersetzt) für eine Zielsprache."""
+        return self.conn.execute(SQL_COUNT_JOBS, (trg_lang,)).fetchone()
+
+    def save_job_results(self, trg_lang, results, failures=(), error=None):
+        """Speichert übersetzte Aufträge [(source_lang, source_word, target_word, source)] und
+        markiert fehlgeschlagene [(source_lang, source_word)] (eine Transaktion)."""
+        with self.conn:
+            self.conn.executemany(SQL_SAVE_JOB, [(trg_word, source, src_lang, word, trg_lang)
+                                                 for src_lang, word, trg_word, source in results])
+            self.conn.executemany(SQL_FAIL_JOB, [(error, src_lang, word, trg_lang)
+                                                 for src_lang, word in failures])
+
+    def apply_translation_jobs(self, trg_lang, source):
+        """Übernimmt alle übersetzten Aufträge in EINER Transaktion in vocabulary
+        (source = liefernder Provider, sonst der übergebene Wert). Gibt die Anzahl neuer Vokabeln zurück.
+        """
+        conn = self.conn
+        with conn:
+            inserted = conn.execute(SQL_APPLY_JOBS, (source, trg_lang)).rowcount
+            conn.execute(SQL_DELETE_DONE_JOBS, (trg_lang,))
+        return inserted
+
+    #--- Übersetzungs-Cache
+    def get_cached_translation(self, src_code, trg_code, text):
+        """(translation, provider, outcome, failures, expires_at) oder None."""
+        return self.conn.execute(SQL_GET_CACHED, (src_code, trg_code, text)).fetchone()
+
+    def put_cached_translation(self, src_code, trg_code, text, translation, provider, outcome, failures,
+                               expires_at):
+        with self.conn:
+            self.conn.execute(SQL_PUT_CACHED, (src_code, trg_code, text, translation, provider, outcome,
+                                               failures, expires_at))
+
+    def purge_translation_cache(self, before):
+        """Löscht abgelaufene Cache-Einträge (expires_at < before). Gibt die Anzahl zurück."""
+        with self.conn:
+            return self.conn.execute(SQL_PURGE_CACHE, (before,)).rowcount
+
+
+class PairIndex:
+    """In-Memory-Index aller Vokabeln, gruppiert nach (source_lang, target_lang).
+
+    Pro Sprachpaar wird eine Liste von IDs gehalten. Zufallsziehung, Einfügen und
+    Löschen (Swap-Remove über die gespeicherte Position) laufen in O(1).
+    Die Änderungsmethoden sind thread-sicher, damit auch Worker-Threads
+    (z.B. Online-Übersetzung) den Index aktualisieren dürfen.
+    """
+    def __init__(self):
+        self._pairs = {}      # (source_lang, target_lang) -> [vocab_id, ...]
+        self._entries = {}    # vocab_id -> (source_lang, source_word, target_lang, target_word)
+        self._positions = {}  # vocab_id -> Position in der Liste des Paares
+        self._lock = threading.Lock()
+        self.built = False
+
+    def build(self, rows):
+        """Baut den Index einmalig aus (id, source_lang, source_word, target_lang, target_word) auf."""
+        with self._lock:
+            self._pairs.clear()
+            self._entries.clear()
+            self._positions.clear()
+            for vocab_id, src_lang, word, trg_lang, trg_word in rows:
+                self._add(vocab_id, src_lang, word, trg_lang, trg_word)
+            self.built = True
+
+    def _add(self, vocab_id, src_lang, word, trg_lang, trg_word):
+        ids = self._pairs.setdefault((src_lang, trg_lang), [])
+        self._positions[vocab_id] = len(ids)
+        ids.append(vocab_id)
+        self._entries[vocab_id] = (src_lang, word, trg_lang, trg_word)
+
+    def _remove(self, vocab_id):
+        entry = self._entries.pop(vocab_id, None)
+        if entry is None:
+            return
+        ids = self._pairs[(entry[0], entry[2])]
+        pos = self._positions.pop(vocab_id)
+        last_id = ids.pop()
+        # Letztes Element in die entstandene Lücke verschieben
+        if last_id != vocab_id:
+            ids[pos] = last_id
+            self._positions[last_id] = pos
+
+    def add(self, vocab_id, src_lang, word, trg_lang, trg_word):
+        """Nimmt eine neue Vokabel in den Index auf."""
+        with self._lock:
+            self._remove(vocab_id)
+            self._add(vocab_id, src_lang, word, trg_lang, trg_word)
+
+    def update(self, vocab_id, src_lang, word, trg_lang, trg_word):
+        """Aktualisiert eine Vokabel (auch ein Wechsel des Sprachpaares ist möglich)."""
+        self.add(vocab_id, src_lang, word, trg_lang, trg_word)
+
+    def remove(self, vocab_id):
+        """Entfernt eine Vokabel aus dem Index."""
+        with self._lock:
+            self._remove(vocab_id)
+
+    def get(self, vocab_id):
+        """(source_lang, source_word, target_lang, target_word) einer Vokabel oder None."""
+        return self._entries.get(vocab_id)
+
+    def ids_for_pair(self, src_lang, trg_lang):
+        """Kopie der IDs eines Sprachpaares."""
+        with self._lock:
+            return list(self._pairs.get((src_lang, trg_lang), ()))
+
+    def count(self, src_lang, trg_lang):
+        """Anzahl der Vokabeln eines Sprachpaares."""
+        return len(self._pairs.get((src_lang, trg_lang), ()))
+
+    def random_word(self, src_lang, trg_lang):
+        """Zieht ein zufälliges (source_word, target_word) des Paares oder None."""
+        with self._lock:
+            ids = self._pairs.get((src_lang, trg_lang))
+            if not ids:
+                return None
+            entry = self._entries[random.choice(ids)]
+        return entry[1], entry[3]
+
+    def words_for_pair(self, src_lang, trg_lang):
+        """Alle (source_word, target_word) eines Sprachpaares als Liste."""
+        with self._lock:
+            return [(self._entries[i][1], self._entries[i][3])
+                    for i in self._pairs.get((src_lang, trg_lang), ())]
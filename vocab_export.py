@@ -0,0 +1,257 @@
+# Streaming-Export von Vokabeln und Lernstand (CSV/JSON-Lines/Spalten-Binärformat)
+#===
+#
+# Kopiert die laufende Datenbank zuerst mit der Online-Backup-API von SQLite
+# in einen konsistenten Schnappschuss (sicher, auch wenn die App gerade
+# schreibt) und liest daraus blockweise per fetchmany. Der Speicherbedarf
+# bleibt dadurch unabhängig von der Deckgröße konstant.
+#
+# Formate:
+#  - .csv     Kopfzeile + eine Zeile pro Vokabel
+#  - .jsonl   ein JSON-Objekt pro Vokabel
+#  - .sptc    kompaktes Spaltenformat (zlib-komprimierte Spaltenblöcke),
+#             kann mit vocab_import wieder eingelesen werden
+#
+# Aufbau .sptc:
+#   b"SPTC" + Version (1 Byte)
+#   uint32 Länge + JSON-Kopf {"columns": [{"name": ..., "type": "text"|"int"|"real"}, ...]}
+#   Zeilengruppen: uint32 Zeilenzahl (0 = Ende), dann je Spalte uint32 Länge + zlib-Daten
+#     text: uint32-Längen (0xFFFFFFFF = NULL) + UTF-8-Bytes aneinandergehängt
+#     int:  int64-Werte (INT_NULL = NULL)
+#     real: float64-Werte (NaN = NULL)
+#   Alle Zahlen little-endian.
+#
+# Kommandozeile:
+# python vocab_export.py deck.csv
+# python vocab_export.py backup.sptc --db vokabeln.db
+#
+# AUTOR: Rainer Liegard
+##########
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+
+from vocab_db import VocabRepository, DB_NAME
+
+# Zeilen pro fetchmany-Block bzw. pro Zeilengruppe im Spaltenformat
+CHUNK_SIZE = 10000
+# Seiten pro Schritt der Online-Backup-API
+BACKUP_PAGES = 1024
+COLUMNAR_MAGIC = b"SPTC"
+COLUMNAR_VERSION = 1
+INT_NULL = -(2 ** 63)
+TEXT_NULL = 0xFFFFFFFF
+
+# Exportierte Spalten (Name, Typ) – Vokabel plus Lernstand
+EXPORT_COLUMNS = [
+    ('id', 'int'), ('source_word', 'text'), ('source_lang', 'text'),
+    ('target_lang', 'text'), ('target_word', 'text'), ('source', 'text'),
+    ('wiederholungen', 'int'), ('ease', 'real'), ('interval_days', 'real'),
+    ('due_at', 'real'), ('lapses', 'int'), ('last_review', 'real'),
+]
+SQL_EXPORT = """
+    SELECT v.id, v.source_word, v.source_lang, v.target_lang, v.target_word, v.source,
+           p.wiederholungen, p.ease, p.interval_days, p.due_at, p.lapses, p.last_review
+    FROM vocabulary v LEFT JOIN lernfortschritt p ON p.vokabel_id = v.id
+    ORDER BY v.id
+"""
+
+
+def snapshot(db_path, dest_path, progress=None):
+    """Erstellt mit der Online-Backup-API eine konsistente Kopie der Datenbank."""
+    src = sqlite3.connect(db_path)
+    dst = sqlite3.connect(dest_path)
+    try:
+        src.backup(dst, pages=BACKUP_PAGES,
+                   progress=(lambda status, remaining, total: progress(total - remaining, total)) if progress else None)
+    finally:
+        dst.close()
+        src.close()
+
+
+def iter_chunks(conn, chunk_size=CHUNK_SIZE):
+    """Liefert die Exportzeilen blockweise (Listen von Tupeln)."""
+    cursor = conn.execute(SQL_EXPORT)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+#--- Writer
+class CsvWriter:
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow([name for name, _ in EXPORT_COLUMNS])
+
+    def write_chunk(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        pass
+
+
+class JsonLinesWriter:
+    def __init__(self, f):
+        self.f = f
+        self.names = [name for name, _ in EXPORT_COLUMNS]
+
+    def write_chunk(self, rows):
+        self.f.writelines(json.dumps(dict(zip(self.names, row)), ensure_ascii=False) + "\n" for row in rows)
+
+    def close(self):
+        pass
+
+
+def _to_le(values):
+    """Bytes eines array-Objekts in little-endian."""
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def _encode_column(kind, values):
+    if kind == 'int':
+        return _to_le(array('q', (INT_NULL if v is None else v for v in values)))
+    if kind == 'real':
+        return _to_le(array('d', (math.nan if v is None else v for v in values)))
+    encoded = [None if v is None else str(v).encode('utf-8') for v in values]
+    lengths = array('I', (TEXT_NULL if b is None else len(b) for b in encoded))
+    return _to_le(lengths) + b"".join(b for b in encoded if b)
+
+
+def _decode_column(kind, data, count):
+    if kind == 'int':
+        return [None if v == INT_NULL else v for v in _from_le('q', data)]
+    if kind == 'real':
+        return [None if math.isnan(v) else v for v in _from_le('d', data)]
+    lengths = _from_le('I', data[:4 * count])
+    values, offset = [], 4 * count
+    for length in lengths:
+        if length == TEXT_NULL:
+            values.append(None)
+        else:
+            values.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+    return values
+
+
+class ColumnarWriter:
+    """Schreibt Zeilengruppen spaltenweise (zlib-komprimiert)."""
+    def __init__(self, f, columns=EXPORT_COLUMNS):
+        self.f = f
+        self.columns = columns
+        header = json.dumps({'columns': [{'name': n, 'type': t} for n, t in columns]}).encode('utf-8')
+        f.write(COLUMNAR_MAGIC + bytes([COLUMNAR_VERSION]) + struct.pack('<I', len(header)) + header)
+
+    def write_chunk(self, rows):
+        self.f.write(struct.pack('<I', len(rows)))
+        for i, (_, kind) in enumerate(self.columns):
+            block = zlib.compress(_encode_column(kind, [row[i] for row in rows]), 6)
+            self.f.write(struct.pack('<I', len(block)) + block)
+
+    def close(self):
+        self.f.write(struct.pack('<I', 0))
+
+
+def read_columnar(path):
+    """Liest eine .sptc-Datei zeilenweise als dict (Zeilengruppe für Zeilengruppe)."""
+    with open(path, 'rb') as f:
+        if f.read(4) != COLUMNAR_MAGIC:
+            raise ValueError("Keine SPTC-Datei.")
+        version = f.read(1)[0]
+        if version != COLUMNAR_VERSION:
+            raise ValueError(f"Nicht unterstützte SPTC-Version: {version}")
+        (header_len,) = struct.unpack('<I', f.read(4))
+        columns = [(c['name'], c['type']) for c in json.loads(f.read(header_len))['columns']]
+        while True:
+            (count,) = struct.unpack('<I', f.read(4))
+            if count == 0:
+                break
+            decoded = []
+            for _, kind in columns:
+                (length,) = struct.unpack('<I', f.read(4))
+                decoded.append(_decode_column(kind, zlib.decompress(f.read(length)), count))
+            names = [name for name, _ in columns]
+            for values in zip(*decoded):
+                yield dict(zip(names, values))
+
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.sptc': 'columnar'}
+
+
+def export(db_path, out_path, fmt=None, progress=None, chunk_size=CHUNK_SIZE):
+    """Exportiert Vokabeln und Lernstand. Gibt die Anzahl der Zeilen zurück.
+
+    progress(rows_written) wird nach jedem Block aufgerufen.
+    """
+    fmt = fmt or FORMATS.get(os.path.splitext(out_path)[1].lower())
+    if fmt not in ('csv', 'jsonl', 'columnar'):
+        raise ValueError(f"Unbekanntes Exportformat für '{out_path}' (csv, jsonl oder sptc).")
+    tmp_dir = tempfile.mkdtemp(prefix="spt_export_")
+    snapshot_path = os.path.join(tmp_dir, 'snapshot.db')
+    written = 0
+    try:
+        snapshot(db_path, snapshot_path)
+        # Schnappschuss auf den aktuellen Schema-Stand bringen (lernfortschritt)
+        snap = VocabRepository(snapshot_path)
+        snap.migrate()
+        conn = snap.conn
+        if fmt == 'columnar':
+            f = open(out_path, 'wb')
+            writer = ColumnarWriter(f)
+        else:
+            f = open(out_path, 'w', newline='', encoding='utf-8')
+            writer = CsvWriter(f) if fmt == 'csv' else JsonLinesWriter(f)
+        try:
+            for rows in iter_chunks(conn, chunk_size):
+                writer.write_chunk(rows)
+                written += len(rows)
+                if progress:
+                    progress(written)
+            writer.close()
+        finally:
+            f.close()
+            snap.close()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vokabeln und Lernstand exportieren (CSV/JSON-Lines/SPTC).")
+    parser.add_argument('output', help="Zieldatei (.csv, .jsonl oder .sptc)")
+    parser.add_argument('--db', default=DB_NAME, help=f"SQLite-Datenbank (Standard: {DB_NAME})")
+    parser.add_argument('--format', choices=['csv', 'jsonl', 'columnar'],
+                        help="Format (Standard: anhand der Dateiendung)")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        parser.error(f"Datenbank '{args.db}' nicht gefunden.")
+    start = time.perf_counter()
+    count = export(args.db, args.output, args.format,
+                   progress=lambda n: print(f"\r{n} Zeilen exportiert", end=''))
+    print(f"\r{count} Zeilen nach {args.output} exportiert ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
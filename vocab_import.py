@@ -0,0 +1,258 @@
+# Massen-Import von Vokabeln (CSV/TSV/JSON-Lines/Anki .apkg)
+#===
+#
+# Liest Vokabeldateien zeilenweise (streamend, ohne die ganze Datei in den
+# Speicher zu laden) und schreibt sie in Blöcken von BATCH_SIZE Zeilen per
+# executemany in die Tabelle vocabulary. Jeder Block ist eine Transaktion,
+# bereits vorhandene Vokabeln werden über den UNIQUE-Schlüssel
+# (INSERT OR IGNORE) übersprungen.
+#
+# Unterstützte Formate:
+#  - .csv               Trennzeichen ','
+#  - .tsv / .txt        Trennzeichen Tab (z.B. Anki-Textexport)
+#  - .jsonl / .ndjson   ein JSON-Objekt pro Zeile
+#  - .apkg / .colpkg    Anki-Deck (erstes Feld = Wort, zweites Feld = Übersetzung)
+#  - .sptc              Spaltenformat aus vocab_export
+#
+# CSV/TSV mit Kopfzeile: Spalten source_word, source_lang, target_lang, target_word.
+# Ohne Kopfzeile: 4 Spalten (Wort, Quellsprache, Zielsprache, Übersetzung)
+# oder 2 Spalten (Wort, Übersetzung) + Standardsprachen.
+# Sprachen als Name der App (Englisch), Code (en) oder englischer Name (English);
+# Zeilen mit unbekannter Sprache werden übersprungen.
+#
+# Kommandozeile:
+# python vocab_import.py deck.csv --source-lang Englisch --target-lang Deutsch
+#
+# AUTOR: Rainer Liegard
+##########
+import argparse
+import csv
+import html
+import itertools
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import zipfile
+
+from vocab_db import VocabRepository, DB_NAME, LANGUAGES, LANG_CODES
+
+# Zeilen pro Transaktion
+BATCH_SIZE = 5000
+# Wert für die Spalte 'source' bei importierten Vokabeln
+IMPORT_SOURCE = 'Import'
+COLUMNS = ('source_word', 'source_lang', 'target_lang', 'target_word')
+# Sprachcodes (en, de, ...) sowie deutsche, englische und eigene Namen der Sprachen
+# werden auf die Sprachnamen der App abgebildet (Schlüssel in Kleinbuchstaben)
+LANG_BY_CODE = {code: name for name, code in LANG_CODES.items()}
+LANG_BY_CODE.update({name.lower(): name for name in LANGUAGES})
+LANG_BY_CODE.update({
+    'german': 'Deutsch', 'english': 'Englisch', 'french': 'Französisch', 'italian': 'Italienisch',
+    'spanish': 'Spanisch', 'franzoesisch': 'Französisch', 'français': 'Französisch',
+    'francais': 'Französisch', 'italiano': 'Italienisch', 'español': 'Spanisch', 'espanol': 'Spanisch',
+})
+# HTML-Tags in Anki-Feldern
+HTML_TAG = re.compile(r'<[^>]+>')
+
+
+class ImportResult:
+    """Ergebnis eines Imports."""
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.cancelled = False
+
+    def __str__(self):
+        return (f"{self.read} Zeilen gelesen, {self.inserted} neu, "
+                f"{self.read - self.inserted} übersprungen (Duplikat/ungültig/unbekannte Sprache)")
+
+
+def normalize_lang(value, default=None):
+    """Liefert den Sprachnamen der App ('Englisch') für einen Namen oder Code ('en', 'English').
+    Ohne Angabe gilt default, eine unbekannte Sprache ergibt None (die Zeile wird übersprungen)."""
+    value = (value or "").strip()
+    if not value:
+        return default
+    return LANG_BY_CODE.get(value.lower())
+
+
+def _row(word, src_lang, trg_lang, trg_word, default_src, default_trg):
+    """Bereinigt eine Zeile (Kleinschreibung wie in der App) oder gibt None zurück."""
+    word = (word or "").strip().lower()
+    trg_word = (trg_word or "").strip().lower()
+    src_lang = normalize_lang(src_lang, default_src)
+    trg_lang = normalize_lang(trg_lang, default_trg)
+    if not all([word, trg_word, src_lang, trg_lang]):
+        return None
+    return word, src_lang, trg_lang, trg_word
+
+
+#--- Leser (Generatoren, die eine Zeile nach der anderen liefern)
+def read_delimited(path, delimiter, default_src=None, default_trg=None):
+    """Liest CSV/TSV zeilenweise."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = None
+        for fields in reader:
+            if not fields or not any(fields):
+                continue
+            if header is None and 'source_word' in [c.strip().lower() for c in fields]:
+                header = {c.strip().lower(): i for i, c in enumerate(fields)}
+                continue
+            if header:
+                get = lambda name: fields[header[name]] if name in header and header[name] < len(fields) else None
+                yield _row(get('source_word'), get('source_lang'), get('target_lang'), get('target_word'),
+                           default_src, default_trg)
+            elif len(fields) >= 4:
+                yield _row(fields[0], fields[1], fields[2], fields[3], default_src, default_trg)
+            elif len(fields) >= 2:
+                yield _row(fields[0], None, None, fields[1], default_src, default_trg)
+            else:
+                yield None
+
+
+def read_jsonl(path, default_src=None, default_trg=None):
+    """Liest JSON-Lines ({"source_word": ..., "target_word": ..., "source_lang": ..., "target_lang": ...})."""
+    with open(path, encoding='utf-8-sig') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                yield None
+                continue
+            yield _row(obj.get('source_word'), obj.get('source_lang'), obj.get('target_lang'),
+                       obj.get('target_word'), default_src, default_trg)
+
+
+def _clean_anki_field(text):
+    """Entfernt HTML-Tags und -Entities aus einem Anki-Feld."""
+    return html.unescape(HTML_TAG.sub(' ', text)).replace('\xa0', ' ').strip()
+
+
+def read_apkg(path, default_src=None, default_trg=None):
+    """Liest die Notizen eines Anki-Decks (.apkg/.colpkg)."""
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        if 'collection.anki21' in names:
+            member = 'collection.anki21'
+        elif 'collection.anki2' in names:
+            member = 'collection.anki2'
+        else:
+            # Neuere Anki-Versionen speichern zstd-komprimiert (collection.anki21b)
+            raise ValueError("Nicht unterstütztes Anki-Format. Bitte in Anki als "
+                             "'Anki-Deckpaket (kompatibel mit älteren Versionen)' exportieren.")
+        tmp_dir = tempfile.mkdtemp(prefix="spt_apkg_")
+        try:
+            collection = os.path.join(tmp_dir, 'collection.sqlite')
+            with archive.open(member) as src, open(collection, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            conn = sqlite3.connect(collection)
+            try:
+                for (flds,) in conn.execute("SELECT flds FROM notes"):
+                    fields = flds.split('\x1f')
+                    if len(fields) < 2:
+                        yield None
+                        continue
+                    yield _row(_clean_anki_field(fields[0]), None, None, _clean_anki_field(fields[1]),
+                               default_src, default_trg)
+            finally:
+                conn.close()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def read_sptc(path, default_src=None, default_trg=None):
+    """Liest eine mit vocab_export erzeugte .sptc-Datei."""
+    # Import erst hier, damit vocab_export nicht beim Start geladen werden muss
+    from vocab_export import read_columnar
+    for obj in read_columnar(path):
+        yield _row(obj.get('source_word'), obj.get('source_lang'), obj.get('target_lang'),
+                   obj.get('target_word'), default_src, default_trg)
+
+
+def read_rows(path, default_src=None, default_trg=None):
+    """Wählt den Leser anhand der Dateiendung."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return read_delimited(path, ',', default_src, default_trg)
+    if ext in ('.tsv', '.txt', '.tab'):
+        return read_delimited(path, '\t', default_src, default_trg)
+    if ext in ('.jsonl', '.ndjson', '.json'):
+        return read_jsonl(path, default_src, default_trg)
+    if ext in ('.apkg', '.colpkg'):
+        return read_apkg(path, default_src, default_trg)
+    if ext == '.sptc':
+        return read_sptc(path, default_src, default_trg)
+    raise ValueError(f"Unbekanntes Dateiformat: '{ext}'")
+
+
+#--- Schreiben
+def import_rows(repo, rows, source=IMPORT_SOURCE, batch_size=BATCH_SIZE, progress=None, cancel_event=None):
+    """Schreibt die Zeilen blockweise (executemany, eine Transaktion pro Block).
+
+    progress(result) wird nach jedem Block aufgerufen, cancel_event (threading.Event)
+    bricht den Import zwischen zwei Blöcken ab.
+    """
+    result = ImportResult()
+    rows = iter(rows)
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            result.cancelled = True
+            break
+        chunk = list(itertools.islice(rows, batch_size))
+        if not chunk:
+            break
+        valid = [row for row in chunk if row is not None]
+        result.read += len(chunk)
+        result.skipped += len(chunk) - len(valid)
+        if valid:
+            result.inserted += repo.insert_many(valid, source)
+        if progress:
+            progress(result)
+    return result
+
+
+def import_file(repo, path, default_src=None, default_trg=None, progress=None, cancel_event=None,
+                batch_size=BATCH_SIZE):
+    """Importiert eine Datei und gibt ein ImportResult zurück."""
+    return import_rows(repo, read_rows(path, default_src, default_trg), IMPORT_SOURCE,
+                       batch_size, progress, cancel_event)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vokabeln aus CSV/TSV/JSON-Lines/Anki importieren.")
+    parser.add_argument('files', nargs='+', help="Zu importierende Dateien")
+    parser.add_argument('--db', default=DB_NAME, help=f"SQLite-Datenbank (Standard: {DB_NAME})")
+    parser.add_argument('--source-lang', help="Quellsprache, falls nicht in der Datei angegeben (z.B. Englisch)")
+    parser.add_argument('--target-lang', help="Zielsprache, falls nicht in der Datei angegeben (z.B. Deutsch)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Zeilen pro Transaktion")
+    args = parser.parse_args(argv)
+    for option, value in (('--source-lang', args.source_lang), ('--target-lang', args.target_lang)):
+        if value and normalize_lang(value) is None:
+            parser.error(f"{option}: unbekannte Sprache '{value}' (erlaubt: {', '.join(LANGUAGES)})")
+
+    repo = VocabRepository(args.db)
+    repo.initialize()
+    try:
+        for path in args.files:
+            start = time.perf_counter()
+            result = import_file(
+                repo, path, normalize_lang(args.source_lang), normalize_lang(args.target_lang),
+                progress=lambda r: print(f"\r{path}: {r.read} Zeilen gelesen, {r.inserted} neu", end=''),
+                batch_size=args.batch_size)
+            print(f"\r{path}: {result} ({time.perf_counter() - start:.2f}s)")
+    finally:
+        repo.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())